@@ -0,0 +1,98 @@
+"""
+Measures first-sync ingest throughput (files/sec) into a fresh SQLite database.
+
+    python benchmarks/sync_ingest.py [TREE_DIR] [--files 10000] [--modes serial,batched,pipeline]
+                                     [--batch-size 200] [--flush-ms 500] [--workers N]
+
+Modes:
+    serial    SyncProcessor.process_file per file, one transaction per file
+    batched   BatchIngestWriter, files prepared inline in the scanning thread
+    pipeline  BatchIngestWriter fed by the parse process pool
+
+Without TREE_DIR a synthetic tree of --files files is generated in a temp directory.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.infrastructure.database.models import Base, PartDB
+from src.application.services.sync.processor import SyncProcessor
+from src.application.services.sync.pipeline import SyncPipeline
+from src.application.services.sync.scanner import DirectoryScanner
+from synthetic_tree import generate
+
+
+def run(mode, tree, work_dir, args):
+    db_path = os.path.join(work_dir, f"{mode}.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    processor = SyncProcessor(session_factory)
+    processor.thumbnails.directory = os.path.join(work_dir, f"{mode}-thumbs")
+    os.makedirs(processor.thumbnails.directory, exist_ok=True)
+
+    workers = args.workers if mode == "pipeline" else 1
+    pipeline = SyncPipeline(processor, parse_workers=workers, batch_size=args.batch_size, flush_ms=args.flush_ms)
+    scanner = DirectoryScanner(processor, pipeline)
+
+    started = time.perf_counter()
+    # As SyncManager does: lookups are preloaded once per cycle
+    processor.begin_cycle()
+    try:
+        if mode == "serial":
+            listing = scanner.list_files(tree)
+            for f in listing:
+                processor.process_file(f.path, "sidra", doc_name=f.doc_name)
+            count = len(listing)
+        else:
+            count = scanner.scan(tree, "sidra", cycle=1)["dispatched"]
+    finally:
+        processor.end_cycle()
+        pipeline.shutdown()
+    elapsed = time.perf_counter() - started
+
+    db = session_factory()
+    try:
+        parts = db.query(PartDB).count()
+    finally:
+        db.close()
+    engine.dispose()
+    return count, parts, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tree", nargs="?")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--modes", default="serial,batched,pipeline")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--flush-ms", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="sync-ingest-")
+    try:
+        tree = args.tree
+        if tree is None:
+            tree = os.path.join(work_dir, "tree")
+            started = time.perf_counter()
+            generate(tree, args.files)
+            print(f"Generated {args.files} files in {time.perf_counter() - started:.1f} s")
+
+        print(f"{'mode':<10} {'files':>7} {'parts':>7} {'sec':>8} {'files/s':>9}")
+        for mode in args.modes.split(","):
+            count, parts, elapsed = run(mode, tree, work_dir, args)
+            print(f"{mode:<10} {count:>7} {parts:>7} {elapsed:>8.2f} {count / elapsed:>9.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
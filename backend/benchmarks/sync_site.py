@@ -0,0 +1,136 @@
+"""
+Sizes a full import for a new site: generates a mihtav/sidra installation and runs
+one SyncManager cycle over it against a temporary SQLite database.
+
+    python benchmarks/sync_site.py [TREE_DIR] [--orders 200] [--per-order 20] [--parts 500]
+                                   [--depth 1] [--holes 1] [--copies 0.1] [--workers N] [--dry-run]
+
+TREE_DIR, if given, must hold mihtav/ and sidra/ directories; otherwise a tree is
+generated from the counts: --depth nests each order's files that many directories
+deep, --holes grows every program (about 50 bytes and one contour per hole), and
+--copies makes that fraction of order files identical copies of library parts.
+--dry-run parses and writes everything in rolled-back transactions.
+
+Reports files/sec, DB time (batch commits), parse time (summed over the parse
+workers, so it can exceed wall time) and peak RSS of this process and of the
+largest parse worker.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.infrastructure.database.models import Base, AttachmentDB, PartDB
+from src.application.services.settings_service import SettingsService
+from src.application.services.sync.processor import SyncProcessor
+from src.application.services.sync.pipeline import SyncPipeline
+from src.application.services.sync.scanner import DirectoryScanner
+from src.application.services.sync.manager import SyncManager
+from synthetic_tree import generate_site
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb():
+    """(this process, largest child process) peak resident set size in MB, or None."""
+    if resource is None:
+        return None, None
+    # ru_maxrss is in kilobytes on Linux, bytes on macOS
+    unit = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / unit,
+            resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / unit)
+
+
+def run(tree, work_dir, args):
+    engine = create_engine(f"sqlite:///{os.path.join(work_dir, 'site.db')}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    settings = SettingsService(session_factory)
+    settings.set_setting("sync_mihtav_path", os.path.join(tree, "mihtav"))
+    settings.set_setting("sync_sidra_path", os.path.join(tree, "sidra"))
+    # 0 walks the whole tree
+    settings.set_setting("sync_walk_depth", str(args.depth))
+    settings.set_setting("sync_watch_enabled", "false")
+
+    processor = SyncProcessor(session_factory)
+    processor.thumbnails.directory = os.path.join(work_dir, "thumbs")
+    os.makedirs(processor.thumbnails.directory, exist_ok=True)
+    pipeline = SyncPipeline(processor, parse_workers=args.workers)
+    manager = SyncManager(DirectoryScanner(processor, pipeline), settings)
+
+    started = time.perf_counter()
+    try:
+        results = manager.run_once(dry_run=args.dry_run)
+    finally:
+        pipeline.shutdown()
+    elapsed = time.perf_counter() - started
+
+    db = session_factory()
+    try:
+        stored = db.query(AttachmentDB).count(), db.query(PartDB).count()
+    finally:
+        db.close()
+    engine.dispose()
+    return results, manager.metrics.snapshot()["last_cycle"], stored, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tree", nargs="?")
+    parser.add_argument("--orders", type=int, default=200)
+    parser.add_argument("--per-order", type=int, default=20)
+    parser.add_argument("--parts", type=int, default=500)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--holes", type=int, default=1)
+    parser.add_argument("--copies", type=float, default=0.1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="sync-site-")
+    try:
+        tree = args.tree
+        if tree is None:
+            tree = os.path.join(work_dir, "tree")
+            started = time.perf_counter()
+            site = generate_site(tree, args.orders, args.per_order, args.parts, args.depth,
+                                 args.holes, args.copies, args.seed)
+            print(f"Generated {site['files']} files ({site['bytes'] / 1024 / 1024:.1f} MB): "
+                  f"{args.orders} orders x {args.per_order} at depth {args.depth}, {args.parts} library parts, "
+                  f"{args.holes} holes per part, {args.copies:.0%} copies, in {time.perf_counter() - started:.1f} s")
+
+        results, cycle, (attachments, parts), elapsed = run(tree, work_dir, args)
+        stages = cycle["stages"]
+        written = cycle["written"]
+        print(f"{'dry run' if args.dry_run else 'import'} with {args.workers} parse workers:")
+        for root, stats in results.items():
+            print(f"  {root}: {stats}")
+        print(f"  files      {cycle['dispatched']} dispatched, {cycle['parsed']} parsed, "
+              f"{cycle['linked']} linked, {written} written, {cycle['failed']} failed")
+        print(f"  wall       {elapsed:.2f} s, {written / elapsed if elapsed else 0:.1f} files/s")
+        print(f"  walk       {stages['walk']['total_ms'] / 1000:.2f} s over {stages['walk']['count']} directories")
+        print(f"  parse      {stages['prepare']['total_ms'] / 1000:.2f} s "
+              f"({stages['prepare']['avg_ms']:.2f} ms/file, summed over workers)")
+        print(f"  db         {stages['write']['total_ms'] / 1000:.2f} s committing {stages['write']['count']} files, "
+              f"sweep {stages['sweep']['total_ms'] / 1000:.2f} s")
+        print(f"  stored     {attachments} attachments, {parts} parts")
+        main_rss, worker_rss = peak_rss_mb()
+        if main_rss is not None:
+            print(f"  peak rss   {main_rss:.0f} MB, largest child process {worker_rss:.0f} MB")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Measures directory walk time on a deep tree with simulated file-share latency.
+
+    python benchmarks/sync_walk.py [--depth 4] [--fanout 4] [--latency-ms 20] [--workers 1,4,8,16,32]
+
+Every os.scandir call sleeps --latency-ms first, like a round-trip to an SMB server.
+Each worker count walks the whole tree with DirectoryScanner.iter_files (unlimited
+depth); 1 worker is the sequential baseline. Reports total time, time to the first
+file (files stream out while the walk continues) and directories per second.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.application.services.sync.processor import SyncProcessor
+from src.application.services.sync.pipeline import SyncPipeline
+from src.application.services.sync.scanner import DirectoryScanner
+from synthetic_tree import generate_deep
+
+
+def with_latency(scandir, seconds):
+    def slow_scandir(path="."):
+        time.sleep(seconds)
+        return scandir(path)
+    return slow_scandir
+
+
+def run(tree, workers):
+    # Listing never touches the database
+    processor = SyncProcessor(None)
+    pipeline = SyncPipeline(processor, walkers=workers)
+    scanner = DirectoryScanner(processor, pipeline, max_depth=None)
+    try:
+        started = time.perf_counter()
+        first = None
+        files = 0
+        for _ in scanner.iter_files(tree):
+            if first is None:
+                first = time.perf_counter() - started
+            files += 1
+        elapsed = time.perf_counter() - started
+    finally:
+        pipeline.shutdown()
+    return files, scanner.metrics.totals["dirs_listed"], first or 0.0, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--per-dir", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--workers", default="1,4,8,16,32")
+    args = parser.parse_args(argv)
+
+    work_dir = tempfile.mkdtemp(prefix="sync-walk-")
+    try:
+        tree = os.path.join(work_dir, "tree")
+        written = generate_deep(tree, args.depth, args.fanout, args.per_dir)
+        print(f"Generated {written} files, depth {args.depth}, fanout {args.fanout}, "
+              f"{args.latency_ms:g} ms per listing")
+
+        os.scandir = with_latency(os.scandir, args.latency_ms / 1000.0)
+        print(f"{'workers':>7} {'files':>7} {'dirs':>6} {'first ms':>9} {'sec':>7} {'dirs/s':>8}")
+        for workers in [int(w) for w in args.workers.split(",")]:
+            files, dirs, first, elapsed = run(tree, workers)
+            print(f"{workers:>7} {files:>7} {dirs:>6} {first * 1000:>9.1f} {elapsed:>7.2f} {dirs / elapsed:>8.1f}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
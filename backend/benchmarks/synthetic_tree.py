@@ -0,0 +1,157 @@
+"""
+Generates a synthetic sync share: GNC files spread over document directories.
+
+    python benchmarks/synthetic_tree.py OUT_DIR [--files 10000] [--per-dir 20] [--seed 1]
+
+Each file is a small cut program (a rectangle and circular holes) with a material
+tag, so it exercises parsing, geometry and thumbnails like a real nesting output.
+generate_site lays out a whole installation: a mihtav tree of orders and a sidra
+part library.
+"""
+import os
+import random
+import argparse
+
+MATERIALS = ["ST37", "AL5754", "SS304", "DC01", "S355"]
+
+PROGRAM = """(*SHEET {width} {height} {thickness} 1 0 0 0)
+(Material:{material})
+(PART NAME:{name})
+N1005 G00 X0 Y0
+N1010 G01 X{w} Y0
+N1015 G01 X{w} Y{h}
+N1020 G01 X0 Y{h}
+N1025 G01 X0 Y0
+"""
+
+HOLE = """N{n} G00 X{x} Y{y}
+N{n2} G02 X{x} Y{y} I{r} J0
+"""
+
+
+def program(name: str, rng: random.Random, holes: int = 1) -> str:
+    """A part program; every further hole adds about 50 bytes and one contour to parse."""
+    w = rng.randint(20, 400)
+    h = rng.randint(20, 400)
+    r = max(2, min(w, h) // 6)
+    text = PROGRAM.format(
+        width=3000, height=1500, thickness=rng.choice([1, 2, 3, 5]),
+        material=rng.choice(MATERIALS), name=name, w=w, h=h
+    )
+    for i in range(holes):
+        # The first hole is centred, the rest are small and scattered
+        radius = r if i == 0 else max(1, r // 4)
+        cx = w // 2 if i == 0 else rng.randint(radius * 2, max(radius * 2, w - radius * 2))
+        cy = h // 2 if i == 0 else rng.randint(radius * 2, max(radius * 2, h - radius * 2))
+        text += HOLE.format(n=1030 + 10 * i, n2=1035 + 10 * i, x=cx - radius, y=cy, r=radius)
+    return text
+
+
+def generate(out_dir: str, files: int = 10000, per_dir: int = 20, seed: int = 1) -> int:
+    """
+    Writes files GNC programs under out_dir: per_dir files in each document
+    directory, plus a handful directly in the root. Returns the number written.
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    loose = min(files, max(1, files // 100))
+    for i in range(loose):
+        name = f"P{i:06d}"
+        with open(os.path.join(out_dir, f"{name}.gnc"), "w") as f:
+            f.write(program(name, rng))
+
+    written = loose
+    doc = 0
+    while written < files:
+        doc_dir = os.path.join(out_dir, f"Order_{doc:05d}")
+        os.makedirs(doc_dir, exist_ok=True)
+        for _ in range(min(per_dir, files - written)):
+            name = f"P{written:06d}"
+            with open(os.path.join(doc_dir, f"{name}.gnc"), "w") as f:
+                f.write(program(name, rng))
+            written += 1
+        doc += 1
+    return written
+
+
+def generate_deep(out_dir: str, depth: int = 4, fanout: int = 4, per_dir: int = 5, seed: int = 1) -> int:
+    """
+    Writes a nested share: every directory down to depth levels below out_dir has
+    fanout sub-directories and per_dir GNC programs. Returns the number of files written.
+    """
+    rng = random.Random(seed)
+    written = 0
+    level = [out_dir]
+    for d in range(depth + 1):
+        next_level = []
+        for directory in level:
+            os.makedirs(directory, exist_ok=True)
+            for _ in range(per_dir):
+                name = f"P{written:06d}"
+                with open(os.path.join(directory, f"{name}.gnc"), "w") as f:
+                    f.write(program(name, rng))
+                written += 1
+            if d < depth:
+                next_level.extend(os.path.join(directory, f"{'Order' if d == 0 else 'Sub'}_{i:02d}") for i in range(fanout))
+        level = next_level
+    return written
+
+
+def generate_site(out_dir: str, orders: int = 100, per_order: int = 20, parts: int = 500,
+                  depth: int = 1, holes: int = 1, copies: float = 0.0, seed: int = 1) -> dict:
+    """
+    Writes a mihtav/sidra installation under out_dir. sidra holds parts library
+    programs; mihtav holds orders of per_order programs each, spread over depth
+    levels of sub-directories (1 puts them directly in the order directory).
+    A copies fraction of the order files are byte-identical copies of library
+    parts, as when a part is cut unchanged. Returns {"mihtav", "sidra", "files", "bytes"}.
+    """
+    rng = random.Random(seed)
+    mihtav = os.path.join(out_dir, "mihtav")
+    sidra = os.path.join(out_dir, "sidra")
+    os.makedirs(mihtav, exist_ok=True)
+    os.makedirs(sidra, exist_ok=True)
+    written = 0
+    size = 0
+
+    def write(path, text):
+        nonlocal written, size
+        with open(path, "w") as f:
+            f.write(text)
+        written += 1
+        size += len(text)
+
+    library = []
+    for i in range(parts):
+        name = f"L{i:06d}"
+        text = program(name, rng, holes)
+        library.append(text)
+        write(os.path.join(sidra, f"{name}.gnc"), text)
+
+    for o in range(orders):
+        directory = os.path.join(mihtav, f"Order_{o:05d}")
+        for level in range(1, max(1, depth)):
+            directory = os.path.join(directory, f"Sub_{level:02d}")
+        os.makedirs(directory, exist_ok=True)
+        for i in range(per_order):
+            name = f"O{o:05d}_{i:03d}"
+            if library and rng.random() < copies:
+                text = rng.choice(library)
+            else:
+                text = program(name, rng, holes)
+            write(os.path.join(directory, f"{name}.gnc"), text)
+    return {"mihtav": mihtav, "sidra": sidra, "files": written, "bytes": size}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("out_dir")
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument("--per-dir", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    print(f"Wrote {generate(args.out_dir, args.files, args.per_dir, args.seed)} files to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Compares SVG and PNG thumbnail rendering: render time and output size.
+
+    python benchmarks/thumbnail_formats.py [FILE_OR_DIR ...] [--size 200] [--repeat 5]
+
+Without arguments, every .gnc file under testing/ and static/uploads/ is used.
+"""
+import os
+import sys
+import time
+import argparse
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.parsers.gnc_parser import GNCParser
+from src.infrastructure.graphics.geometry import compile_part, compile_sheet
+from src.infrastructure.graphics.thumbnail_batch import render_thumbnail
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_DIRS = [os.path.join(ROOT_DIR, "testing"), os.path.join(ROOT_DIR, "static", "uploads")]
+
+
+def find_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, _, files in os.walk(path):
+            for name in files:
+                if name.lower().endswith(".gnc"):
+                    yield os.path.join(root, name)
+
+
+def load_geometries(paths):
+    """Yields (label, geometry) for every sheet and every part in it."""
+    parser = GNCParser()
+    for path in find_files(paths):
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            sheet = parser.parse(f.read(), filename=os.path.basename(path))
+        geometry = compile_sheet(sheet)
+        if geometry:
+            yield os.path.basename(path), geometry
+        for part in sheet.parts:
+            part_geometry = compile_part(part)
+            if part_geometry:
+                yield f"  part {part.id}", part_geometry
+
+
+def measure(geometry, fmt, size, repeat):
+    best = float("inf")
+    data = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        data = render_thumbnail(geometry, fmt, size, size)
+        best = min(best, time.perf_counter() - started)
+    return best, len(data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="*", default=DEFAULT_DIRS)
+    parser.add_argument("--size", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    totals = {"svg": [0.0, 0], "png": [0.0, 0]}
+    print(f"{'geometry':<48} {'segs':>6} {'svg ms':>8} {'svg B':>8} {'png ms':>8} {'png B':>8}")
+    for label, geometry in load_geometries(args.paths):
+        row = [label[:48], sum(len(c) for c in geometry)]
+        for fmt in ("svg", "png"):
+            elapsed, size = measure(geometry, fmt, args.size, args.repeat)
+            totals[fmt][0] += elapsed
+            totals[fmt][1] += size
+            row.extend((elapsed * 1000, size))
+        print(f"{row[0]:<48} {row[1]:>6} {row[2]:>8.2f} {row[3]:>8} {row[4]:>8.2f} {row[5]:>8}")
+
+    print()
+    for fmt, (elapsed, size) in totals.items():
+        print(f"{fmt}: {elapsed * 1000:.1f} ms, {size / 1024:.1f} KB total")
+
+
+if __name__ == "__main__":
+    main()
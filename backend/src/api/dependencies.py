@@ -9,6 +9,10 @@ from src.application.services.journal_service import JournalService
 from src.application.services.production_service import ProductionService
 from src.application.services.gnc_service import GncService
 from src.application.services.settings_service import SettingsService
+from src.application.services.thumbnail_service import (
+    ThumbnailService, ThumbnailAtlasService, DEFAULT_THUMBNAIL_DIR, DEFAULT_ATLAS_DIR
+)
+from src.infrastructure.graphics.thumbnail_cache import ThumbnailCache
 from .database import SessionLocal
 
 def get_db():
@@ -42,3 +46,9 @@ def get_production_service(db: Session = Depends(get_db)) -> ProductionService:
 
 def get_gnc_service() -> GncService:
     return GncService()
+
+def get_thumbnail_service() -> ThumbnailService:
+    return ThumbnailService(ThumbnailCache(DEFAULT_THUMBNAIL_DIR))
+
+def get_atlas_service() -> ThumbnailAtlasService:
+    return ThumbnailAtlasService(get_thumbnail_service(), ThumbnailCache(DEFAULT_ATLAS_DIR, max_bytes=64 * 1024 * 1024))
@@ -3,7 +3,7 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 from contextlib import asynccontextmanager
-from .routers import documents, journal, inventory, production, gnc, settings, audit
+from .routers import documents, journal, inventory, production, gnc, settings, audit, sync
 
 # ... (omitted setup_sync and lifespan for brevity if use replace_file_content)
 # Actually I should include the setup sync and lifespan if they are in between.
@@ -16,11 +16,16 @@ from src.application.services.sync.manager import SyncManager
 from src.application.services.sync.scanner import DirectoryScanner
 from src.application.services.sync.processor import SyncProcessor
 from src.application.services.settings_service import SettingsService
+from src.application.services.gnc_service import tile_renderer
 
 # Dependency Setup for Background Sync
 def setup_sync():
     settings_service = SettingsService(SessionLocal)
-    processor = SyncProcessor(SessionLocal)
+    processor = SyncProcessor(
+        SessionLocal,
+        thumbnail_cache_bytes=settings_service.get_thumbnail_cache_limit_mb() * 1024 * 1024,
+        invalidate_tiles=tile_renderer.invalidate,
+    )
     scanner = DirectoryScanner(processor)
     return SyncManager(scanner, settings_service)
 
@@ -48,6 +53,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Next-page cursor of the list endpoints, see api/pagination.py
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(documents.router, prefix="/api/documents")
@@ -57,6 +64,7 @@ app.include_router(production.router, prefix="/api/jobs")
 app.include_router(gnc.router, prefix="/api/gnc")
 app.include_router(settings.router, prefix="/api")
 app.include_router(audit.router, prefix="/api/audit")
+app.include_router(sync.router, prefix="/api/sync")
 
 app.mount("/", StaticFiles(directory="static", html=True), name="static")
 
@@ -0,0 +1,20 @@
+from typing import Callable
+from fastapi import HTTPException, Response
+from src.domain.pagination import Page, InvalidCursor
+
+# Opaque cursor of the page after the one returned; absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def paginated(response: Response, fetch: Callable[[], Page]) -> list:
+    """
+    Returns the items of fetch()'s page and sends its next cursor in the
+    X-Next-Cursor header, so list endpoints keep returning plain arrays.
+    """
+    try:
+        page = fetch()
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    return page.items
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends
-from typing import List
+from fastapi import APIRouter, Depends, Response
+from typing import List, Optional
 from src.application.services.audit_service import AuditService
 # We'll need a dependency for audit service
 from src.api.dependencies import get_db, SessionLocal
 from src.infrastructure.database.audit_repository import SQLAuditRepository
+from src.api.pagination import paginated
 
 router = APIRouter(tags=["audit"])
 
@@ -12,5 +13,8 @@ def get_audit_service(db = Depends(get_db)):
     return AuditService(repo)
 
 @router.get("/audit-logs")
-def read_audit_logs(skip: int = 0, limit: int = 100, service: AuditService = Depends(get_audit_service)):
-    return service.list_logs(skip, limit)
+def read_audit_logs(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                    service: AuditService = Depends(get_audit_service)):
+    if skip and cursor is None:
+        return service.list_logs(skip, limit)
+    return paginated(response, lambda: service.page_logs(cursor, limit))
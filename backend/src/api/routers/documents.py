@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Body
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Body, Response
 from fastapi.responses import StreamingResponse
-from typing import List
+from typing import List, Optional
 from datetime import date
 from src.application.services.document_service import DocumentService
-from src.domain.models import Document, Tag
+from src.domain.models import Document, DocumentSummary, Tag
 from src.api.dependencies import get_document_service
+from src.api.pagination import paginated
 
 router = APIRouter(tags=["documents"])
 
@@ -22,11 +23,29 @@ def create_order(name: str = Body(..., embed=True), items: List[dict] = Body(...
 
 @router.get("/", response_model=List[Document])
 def read_documents(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     service: DocumentService = Depends(get_document_service)
 ):
-    return service.list_documents(skip=skip, limit=limit)
+    # skip pages by offset for older clients; otherwise page by id and return the next cursor
+    if skip and cursor is None:
+        return service.list_documents(skip=skip, limit=limit)
+    return paginated(response, lambda: service.page_documents(cursor=cursor, limit=limit))
+
+@router.get("/summary", response_model=List[DocumentSummary])
+def read_document_summaries(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    service: DocumentService = Depends(get_document_service)
+):
+    # Declared before /{document_id}, which would otherwise match "summary"
+    if skip and cursor is None:
+        return service.list_document_summaries(skip=skip, limit=limit)
+    return paginated(response, lambda: service.page_document_summaries(cursor=cursor, limit=limit))
 
 @router.get("/{document_id}", response_model=Document)
 def read_document(document_id: int, service: DocumentService = Depends(get_document_service)):
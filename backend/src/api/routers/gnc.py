@@ -1,10 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Body, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, Response
 from typing import List, Optional
 import json
+import os
 from src.application.services.gnc_service import GncService
 from src.application.services.inventory_service import InventoryService
 from src.infrastructure.parsers.gnc_parser import GNCSheet
+from src.infrastructure.graphics.sheet_renderer import TILE_FORMATS
 from src.application.services.production_service import ProductionService
 from src.api.dependencies import get_gnc_service, get_db, get_inventory_service, get_production_service
 from src.domain.models import Part, Task
@@ -26,12 +28,16 @@ async def save_gnc_file(
     sheet: GNCSheet = Body(...),
     filename: str = Body(...),
     overwrite: bool = Body(default=True),
+    mode: str = Body(default="full"),
     service: GncService = Depends(get_gnc_service)
 ):
+    # mode="patch" rewrites only the changed line ranges of an existing file
     try:
-        return service.save_gnc(sheet, filename, overwrite)
+        return service.save_gnc(sheet, filename, overwrite, mode)
     except FileExistsError:
         raise HTTPException(status_code=409, detail="File already exists")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save GNC file: {str(e)}")
 
@@ -40,8 +46,8 @@ async def save_gnc_file(
 async def scan_parts(request: Request):
     sync_manager = getattr(request.app.state, 'sync_manager', None)
     if sync_manager:
-        sync_manager.trigger_sync()
-        return {"status": "started"}
+        job = sync_manager.trigger_sync()
+        return {"status": "started", "job": job.to_dict()}
     return {"status": "error", "message": "Sync manager not initialized"}
 
 @router.get("/library-parts", response_model=List[Part])
@@ -67,3 +73,45 @@ async def get_order_nesting_project(order_id: int, service: ProductionService =
     if project:
         return project
     raise HTTPException(status_code=404, detail="Project not found")
+
+def _task_gnc_path(task_id: int, production: ProductionService) -> str:
+    task = production.get_job(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not task.gnc_file_path or not os.path.exists(task.gnc_file_path):
+        raise HTTPException(status_code=404, detail="GNC file not found")
+    return task.gnc_file_path
+
+@router.get("/tasks/{task_id}/sheet")
+def get_task_sheet(
+    task_id: int,
+    production: ProductionService = Depends(get_production_service),
+    service: GncService = Depends(get_gnc_service)
+):
+    # Tile pyramid description; the viewer requests tiles instead of the parsed sheet
+    path = _task_gnc_path(task_id, production)
+    info = service.describe_sheet(path)
+    info["tile_url"] = f"/api/gnc/tasks/{task_id}/tiles/{{z}}/{{x}}/{{y}}.{{fmt}}"
+    return info
+
+@router.get("/tasks/{task_id}/tiles/{z}/{x}/{y}.{fmt}")
+def get_task_sheet_tile(
+    task_id: int, z: int, x: int, y: int, fmt: str,
+    request: Request,
+    production: ProductionService = Depends(get_production_service),
+    service: GncService = Depends(get_gnc_service)
+):
+    if fmt not in TILE_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown tile format: {fmt}")
+    path = _task_gnc_path(task_id, production)
+
+    etag = f'"{service.sheet_digest(path)}-{z}-{x}-{y}-{fmt}"'
+    headers = {"ETag": etag, "Cache-Control": "private, max-age=3600"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    try:
+        data = service.render_sheet_tile(path, z, x, y, fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return Response(content=data, media_type=TILE_FORMATS[fmt], headers=headers)
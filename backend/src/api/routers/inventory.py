@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, Request
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response
+from fastapi.responses import FileResponse
 from typing import List, Optional
 from src.application.services.inventory_service import InventoryService
 from src.application.services.gnc_service import GncService
 from src.domain.models import Material, Part, StockItem, Reservation, Consumption
-from src.api.dependencies import get_inventory_service, get_gnc_service
+from src.application.services.thumbnail_service import ThumbnailService, ThumbnailAtlasService
+from src.infrastructure.graphics.thumbnail_batch import THUMBNAIL_FORMATS
+from src.api.dependencies import get_inventory_service, get_gnc_service, get_thumbnail_service, get_atlas_service
+from src.api.pagination import paginated
 import os
 
 router = APIRouter(tags=["inventory"])
@@ -28,19 +32,15 @@ def delete_material(material_id: int, service: InventoryService = Depends(get_in
     raise HTTPException(status_code=404, detail="Material not found")
 
 # Parts
-@router.get("/parts/", response_model=List[Part])
-def list_parts(
-    skip: int = 0, 
-    limit: int = 100,
+def part_filters(
     search: Optional[str] = None,
     material_id: Optional[int] = None,
     min_width: Optional[float] = None,
     max_width: Optional[float] = None,
     min_height: Optional[float] = None,
-    max_height: Optional[float] = None,
-    service: InventoryService = Depends(get_inventory_service)
-):
-    filters = {
+    max_height: Optional[float] = None
+) -> dict:
+    return {
         "search": search,
         "material_id": material_id,
         "min_width": min_width,
@@ -48,7 +48,41 @@ def list_parts(
         "min_height": min_height,
         "max_height": max_height
     }
-    return service.list_parts(skip, limit, filters)
+
+@router.get("/parts/", response_model=List[Part])
+def list_parts(
+    response: Response,
+    skip: int = 0, 
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    filters: dict = Depends(part_filters),
+    service: InventoryService = Depends(get_inventory_service)
+):
+    # skip pages by offset for older clients; otherwise page by id and return the next cursor
+    if skip and cursor is None:
+        return service.list_parts(skip, limit, filters)
+    return paginated(response, lambda: service.page_parts(cursor, limit, filters))
+
+@router.get("/parts/atlas")
+def get_parts_atlas(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    format: str = Query("svg"),
+    cell: int = Query(64, ge=16, le=256),
+    filters: dict = Depends(part_filters),
+    service: InventoryService = Depends(get_inventory_service),
+    atlas_service: ThumbnailAtlasService = Depends(get_atlas_service)
+):
+    # Same page as GET /parts/ (offset or cursor), packed into one image plus an offset map per part
+    if format not in THUMBNAIL_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown atlas format: {format}")
+    if skip and cursor is None:
+        parts = service.list_parts(skip, limit, filters)
+    else:
+        parts = paginated(response, lambda: service.page_parts(cursor, limit, filters))
+    return atlas_service.get_atlas(parts, format, cell)
 
 @router.get("/parts/{part_id}", response_model=Part)
 def get_part(part_id: int, service: InventoryService = Depends(get_inventory_service)):
@@ -92,6 +126,26 @@ def get_part_gnc(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error parsing GNC file: {str(e)}")
 
+@router.get("/parts/{part_id}/thumbnail")
+def get_part_thumbnail(
+    part_id: int,
+    format: str = Query("svg"),
+    inventory_service: InventoryService = Depends(get_inventory_service),
+    thumbnail_service: ThumbnailService = Depends(get_thumbnail_service)
+):
+    # PNG is cheaper for the browser to lay out than SVG paths with many nodes
+    if format not in THUMBNAIL_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unknown thumbnail format: {format}")
+    part = inventory_service.get_part(part_id)
+    if not part:
+        raise HTTPException(status_code=404, detail="Part not found")
+
+    path = thumbnail_service.get_thumbnail(part, format)
+    if not path:
+        raise HTTPException(status_code=404, detail="No geometry for this part")
+    return FileResponse(path, media_type=THUMBNAIL_FORMATS[format],
+                        headers={"Cache-Control": "public, max-age=86400"})
+
 # Stock
 @router.get("/stock/", response_model=List[StockItem])
 def list_stock(service: InventoryService = Depends(get_inventory_service)):
@@ -141,6 +195,6 @@ def delete_consumption(consumption_id: int, service: InventoryService = Depends(
 def rescan_library(request: Request):
     sync_manager = getattr(request.app.state, 'sync_manager', None)
     if sync_manager:
-        sync_manager.trigger_sync()
-        return {"status": "started"}
+        job = sync_manager.trigger_sync()
+        return {"status": "started", "job": job.to_dict()}
     return {"status": "error", "message": "Sync manager not initialized"}
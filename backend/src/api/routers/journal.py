@@ -1,14 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response
+from typing import List, Optional
 from src.application.services.journal_service import JournalService
 from src.domain.models import JournalEntry
 from src.api.dependencies import get_journal_service
+from src.api.pagination import paginated
 
 router = APIRouter(tags=["journal"])
 
 @router.get("/", response_model=List[JournalEntry])
-def read_journal(skip: int = 0, limit: int = 100, service: JournalService = Depends(get_journal_service)):
-    return service.list_entries(skip, limit)
+def read_journal(response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                 service: JournalService = Depends(get_journal_service)):
+    # skip pages by offset for older clients; otherwise page newest first and return the next cursor
+    if skip and cursor is None:
+        return service.list_entries(skip, limit)
+    return paginated(response, lambda: service.page_entries(cursor, limit))
 
 @router.post("/", response_model=JournalEntry)
 def create_journal(entry: JournalEntry, service: JournalService = Depends(get_journal_service)):
@@ -79,6 +79,16 @@ def config_check(service: SettingsService = Depends(get_settings_service)):
             }
         }
         
+        # Further department roots from the sync_roots setting
+        for root in service.get_sync_roots():
+            if root["path"] not in (mihtav_path, sidra_path):
+                paths[root["path"]] = {
+                    "configured": True,
+                    "source_type": root["source_type"],
+                    "path": root["path"],
+                    "accessible": os.path.exists(root["path"])
+                }
+
         needs_sync_config = not (paths["mihtav"]["configured"] and paths["sidra"]["configured"])
         
         return {
@@ -0,0 +1,87 @@
+import json
+import asyncio
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+router = APIRouter(tags=["sync"])
+
+def _sync_manager(request: Request):
+    sync_manager = getattr(request.app.state, 'sync_manager', None)
+    if not sync_manager:
+        raise HTTPException(status_code=503, detail="Sync manager not initialized")
+    return sync_manager
+
+# How often the event stream checks for changes, and how long it may stay silent
+EVENT_POLL_SEC = 0.5
+KEEPALIVE_SEC = 15.0
+
+def _status(sync_manager) -> dict:
+    return {"jobs": sync_manager.scheduler.status(), "metrics": sync_manager.metrics.snapshot()}
+
+@router.get("/metrics")
+def get_sync_metrics(request: Request):
+    return _sync_manager(request).metrics.snapshot()
+
+@router.get("/status")
+def get_sync_status(request: Request):
+    """Scheduler state and live counters of the running cycle in one response."""
+    return _status(_sync_manager(request))
+
+@router.get("/checkpoints")
+def get_sync_checkpoints(request: Request):
+    """Root scans that were interrupted and will resume in the next cycle."""
+    return _sync_manager(request).checkpoints()
+
+@router.get("/directories")
+def get_directory_stats(root: str, request: Request, limit: int = 100):
+    """Change statistics and adaptive rescan intervals of the directories under root."""
+    return _sync_manager(request).directory_stats(root, limit)
+
+@router.get("/events")
+async def stream_sync_events(request: Request):
+    """
+    Server-sent events: the /status payload, sent on connect and again whenever
+    the sync metrics change. Reads only in-memory state, never the database.
+    """
+    sync_manager = _sync_manager(request)
+
+    async def events():
+        version = None
+        idle = 0.0
+        while not await request.is_disconnected():
+            current = sync_manager.metrics.version
+            if current != version:
+                version = current
+                idle = 0.0
+                yield f"data: {json.dumps(_status(sync_manager))}\n\n"
+            elif idle >= KEEPALIVE_SEC:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(EVENT_POLL_SEC)
+            idle += EVENT_POLL_SEC
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/jobs")
+def get_sync_jobs(request: Request):
+    """The running sync job, the queue in run order and recently finished jobs."""
+    return _sync_manager(request).scheduler.status()
+
+@router.post("/jobs")
+def trigger_sync_job(request: Request):
+    return _sync_manager(request).trigger_sync().to_dict()
+
+@router.get("/jobs/{job_id}")
+def get_sync_job(job_id: int, request: Request):
+    job = _sync_manager(request).scheduler.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job.to_dict()
+
+@router.post("/jobs/{job_id}/cancel")
+def cancel_sync_job(job_id: int, request: Request):
+    job = _sync_manager(request).scheduler.cancel(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No queued or running sync job with this id")
+    return job.to_dict()
@@ -1,5 +1,7 @@
-from typing import List
+from typing import List, Optional
+from src.domain.pagination import Page
 from src.infrastructure.database.audit_repository import SQLAuditRepository
+from src.infrastructure.database.models import AuditLogDB
 
 class AuditService:
     def __init__(self, repo: SQLAuditRepository):
@@ -7,8 +9,14 @@ class AuditService:
 
     def list_logs(self, skip: int = 0, limit: int = 100) -> List[dict]:
         # Return as dicts for now as the repository uses AuditLogDB
-        logs = self.repo.db.query(self.repo.db.get_model("AuditLogDB")).offset(skip).limit(limit).all()
-        return [log.to_dict() if hasattr(log, "to_dict") else {
+        return [self._to_dict(log) for log in self.repo.list(skip, limit)]
+
+    def page_logs(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        logs, next_cursor = self.repo.page(cursor, limit)
+        return Page([self._to_dict(log) for log in logs], next_cursor)
+
+    def _to_dict(self, log: AuditLogDB) -> dict:
+        return {
             "id": log.id,
             "timestamp": log.timestamp.isoformat() if log.timestamp else None,
             "actor": log.actor,
@@ -17,4 +25,4 @@ class AuditService:
             "entity_id": log.entity_id,
             "previous_value": log.previous_value,
             "new_value": log.new_value
-        } for log in logs]
+        }
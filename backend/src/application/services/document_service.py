@@ -1,7 +1,8 @@
 import os
 from typing import List, Optional
-from src.domain.models import Document, Tag
+from src.domain.models import Document, DocumentSummary, Tag
 from src.domain.interfaces import IDocumentRepository
+from src.domain.pagination import Page
 
 class DocumentService:
     def __init__(self, doc_repo: IDocumentRepository):
@@ -14,6 +15,15 @@ class DocumentService:
     def list_documents(self, skip: int = 0, limit: int = 100) -> List[Document]:
         return self.doc_repo.list(skip=skip, limit=limit)
 
+    def list_document_summaries(self, skip: int = 0, limit: int = 100) -> List[DocumentSummary]:
+        return self.doc_repo.list_summaries(skip=skip, limit=limit)
+
+    def page_documents(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        return self.doc_repo.page(cursor=cursor, limit=limit)
+
+    def page_document_summaries(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        return self.doc_repo.page_summaries(cursor=cursor, limit=limit)
+
     def create_document(self, document: Document) -> Document:
         # business logic: validation, default values, side effects
         return self.doc_repo.add(document)
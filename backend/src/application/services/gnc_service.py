@@ -1,31 +1,95 @@
 from typing import Optional
 from src.infrastructure.parsers.gnc_parser import GNCParser, GNCSheet
+from src.infrastructure.parsers.parse_cache import parse_cache
 from src.infrastructure.graphics.gnc_generator import GNCGenerator
+from src.infrastructure.graphics.gnc_patcher import GNCPatcher
+from src.infrastructure.graphics.geometry import compile_sheet
+from src.infrastructure.graphics.sheet_renderer import SheetTileRenderer
+from src.infrastructure.fs_util import atomic_write
 import os
 
+SAVE_MODES = ("full", "patch")
+
+# backend/src/application/services -> project root
+_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+DEFAULT_TILE_DIR = os.path.join(_ROOT_DIR, "static", "uploads", "tiles")
+
+# Shared so the in-memory level cache survives across requests
+tile_renderer = SheetTileRenderer(DEFAULT_TILE_DIR)
+
 class GncService:
     def __init__(self, output_dir: str = "static/gnc_output"):
         self.parser = GNCParser()
         self.generator = GNCGenerator()
+        self.patcher = GNCPatcher()
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
 
     def parse_gnc(self, content: str, filename: str) -> GNCSheet:
         return self.parser.parse(content, filename=filename)
 
-    def save_gnc(self, sheet: GNCSheet, filename: str, overwrite: bool = True) -> dict:
+    def save_gnc(self, sheet: GNCSheet, filename: str, overwrite: bool = True, mode: str = "full") -> dict:
+        if mode not in SAVE_MODES:
+            raise ValueError(f"Unknown save mode: {mode}")
+
         content = self.generator.generate(sheet)
         output_path = os.path.join(self.output_dir, filename)
-        
+
         if not overwrite and os.path.exists(output_path):
             raise FileExistsError("File already exists")
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
+
+        if mode == "patch" and os.path.exists(output_path):
+            return self._patch_gnc(content, output_path, filename)
+
+        data = content.encode('utf-8')
+        atomic_write(output_path, data)
+        parse_cache.store(output_path, data)
+
         return {
             "success": True,
             "path": output_path,
             "filename": filename,
-            "size": len(content)
+            "size": len(content),
+            "mode": "full"
         }
+
+    def _patch_gnc(self, content: str, output_path: str, filename: str) -> dict:
+        """
+        Diffs the generated program against the cached bytes of the file on disk
+        and splices in only the changed line ranges. Unchanged saves skip the write.
+        """
+        original = parse_cache.get_bytes(output_path)
+        hunks = self.patcher.diff(original, content)
+
+        if hunks:
+            data = self.patcher.apply(original, content, hunks)
+            atomic_write(output_path, data)
+            parse_cache.store(output_path, data)
+        else:
+            data = original
+
+        return {
+            "success": True,
+            "path": output_path,
+            "filename": filename,
+            "size": len(data),
+            "mode": "patch",
+            "changed": bool(hunks),
+            # 1-based, inclusive line ranges in the saved file
+            "changed_ranges": [[j1 + 1, j2] for _, _, j1, j2 in hunks if j2 > j1],
+            "removed_lines": sum(i2 - i1 for i1, i2, _, _ in hunks)
+        }
+
+    def sheet_digest(self, file_path: str) -> str:
+        return parse_cache.get_digest(file_path)
+
+    def describe_sheet(self, file_path: str) -> dict:
+        digest = parse_cache.get_digest(file_path)
+        return tile_renderer.describe(digest, compile_sheet(parse_cache.get_sheet(file_path)))
+
+    def render_sheet_tile(self, file_path: str, z: int, x: int, y: int, fmt: str = "svg") -> bytes:
+        """Returns one tile of the sheet; tiles are cached by content hash, so edits get new tiles."""
+        digest = parse_cache.get_digest(file_path)
+        return tile_renderer.get_tile(
+            digest, lambda: compile_sheet(parse_cache.get_sheet(file_path)), z, x, y, fmt
+        )
@@ -1,6 +1,7 @@
 from typing import List, Optional
 from src.domain.models import Material, Part, StockItem, Reservation, Consumption
 from src.domain.material_interface import IMaterialRepository, IPartRepository, IStockRepository
+from src.domain.pagination import Page
 
 class InventoryService:
     def __init__(self, mat_repo: IMaterialRepository, part_repo: IPartRepository, stock_repo: IStockRepository):
@@ -25,6 +26,9 @@ class InventoryService:
     def list_parts(self, skip: int = 0, limit: int = 100, filters: dict = None) -> List[Part]:
         return self.part_repo.list(skip, limit, filters)
 
+    def page_parts(self, cursor: Optional[str] = None, limit: int = 100, filters: dict = None) -> Page:
+        return self.part_repo.page(cursor, limit, filters)
+
     def get_part(self, id: int) -> Optional[Part]:
         return self.part_repo.get_by_id(id)
 
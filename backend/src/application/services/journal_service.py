@@ -1,6 +1,7 @@
 from typing import List, Optional
 from src.domain.models import JournalEntry
 from src.domain.journal_interface import IJournalRepository
+from src.domain.pagination import Page
 
 class JournalService:
     def __init__(self, journal_repo: IJournalRepository):
@@ -12,6 +13,9 @@ class JournalService:
     def list_entries(self, skip: int = 0, limit: int = 100) -> List[JournalEntry]:
         return self.journal_repo.list(skip, limit)
 
+    def page_entries(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        return self.journal_repo.page(cursor, limit)
+
     def create_entry(self, entry: JournalEntry) -> JournalEntry:
         return self.journal_repo.add(entry)
 
@@ -1,4 +1,5 @@
-from typing import List, Dict
+import json
+from typing import List, Dict, Optional, Tuple
 from sqlalchemy.orm import Session
 from src.infrastructure.database.models import SettingDB, AssigneeDB, FilterPresetDB
 from src.infrastructure.database.repositories import SQLFilterPresetRepository
@@ -42,6 +43,72 @@ class SettingsService:
 
     def set_rescan_interval(self, minutes: int) -> bool:
         return self.set_setting("sync_rescan_interval", str(minutes))
+
+    def get_reconcile_interval(self) -> int:
+        """
+        Returns the full-scan interval in minutes for roots that are watched for
+        filesystem events. Default 1440 (daily).
+        """
+        val = self.get_setting("sync_reconcile_interval")
+        try:
+            return int(val) if val else 1440
+        except ValueError:
+            return 1440
+
+    def is_watch_enabled(self) -> bool:
+        """Whether local sync roots are watched for filesystem events. Default on."""
+        return self.get_setting("sync_watch_enabled").strip().lower() not in ("0", "false", "no", "off")
+
+    def get_walk_depth(self) -> Optional[int]:
+        """
+        Returns how many directory levels below a sync root are scanned. Default 1
+        (the root and its document directories); 0 scans the whole tree (None).
+        """
+        val = self.get_setting("sync_walk_depth")
+        try:
+            depth = int(val) if val else 1
+        except ValueError:
+            return 1
+        return depth if depth > 0 else None
+
+    def is_adaptive_enabled(self) -> bool:
+        """
+        Whether unwatched roots are rescanned adaptively: between full scans, only
+        directories that are due by their own change rate are listed. Default off.
+        """
+        return self.get_setting("sync_adaptive").strip().lower() in ("1", "true", "yes", "on")
+
+    def get_adaptive_intervals(self) -> Tuple[int, int]:
+        """
+        Returns the (shortest, longest) adaptive directory rescan intervals in
+        minutes. Default 5 minutes and 10080 (a week).
+        """
+        bounds = []
+        for key, default in (("sync_adaptive_min_interval", 5), ("sync_adaptive_max_interval", 10080)):
+            val = self.get_setting(key)
+            try:
+                bounds.append(int(val) if val else default)
+            except ValueError:
+                bounds.append(default)
+        return bounds[0], bounds[1]
+
+    def get_thumbnail_cache_limit_mb(self) -> int:
+        """Returns the thumbnail cache size bound in megabytes. Default 256."""
+        val = self.get_setting("thumbnail_cache_limit_mb")
+        try:
+            return int(val) if val else 256
+        except ValueError:
+            return 256
+    def next_sync_cycle(self) -> int:
+        """Increments and returns the persistent sync cycle counter."""
+        val = self.get_setting("sync_cycle")
+        try:
+            cycle = int(val) + 1 if val else 1
+        except ValueError:
+            cycle = 1
+        self.set_setting("sync_cycle", str(cycle))
+        return cycle
+
     def __init__(self, db_factory):
         self.db_factory = db_factory
 
@@ -51,6 +118,43 @@ class SettingsService:
     def get_sidra_path(self) -> str:
         return self.get_setting("sync_sidra_path")
 
+    def get_sync_roots(self) -> List[Dict]:
+        """
+        Returns the directories to sync as dicts with path, source_type and
+        interval (rescan minutes, None for the global interval).
+
+        The mihtav and sidra paths come first when set. The "sync_roots" setting
+        holds a JSON list of further {"path", "source_type", "interval"} objects; an
+        entry for the mihtav or sidra path only sets that root's interval.
+        """
+        roots = [
+            {"path": path, "source_type": source_type, "interval": None}
+            for path, source_type in ((self.get_mihtav_path(), "mihtav"), (self.get_sidra_path(), "sidra"))
+            if path
+        ]
+        val = self.get_setting("sync_roots")
+        try:
+            entries = json.loads(val) if val else []
+        except ValueError as e:
+            print(f"Error reading sync_roots: {e}")
+            entries = []
+        by_path = {root["path"]: root for root in roots}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict) or not entry.get("path"):
+                continue
+            try:
+                interval = int(entry["interval"]) if entry.get("interval") else None
+            except (TypeError, ValueError):
+                interval = None
+            root = by_path.get(entry["path"])
+            if root is None:
+                if not entry.get("source_type"):
+                    continue
+                root = by_path[entry["path"]] = {"path": entry["path"], "source_type": entry["source_type"]}
+                roots.append(root)
+            root["interval"] = interval
+        return roots
+
     def get_setting(self, key: str) -> str:
         db = self.db_factory()
         try:
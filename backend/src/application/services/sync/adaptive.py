@@ -0,0 +1,20 @@
+from typing import Optional
+
+
+class AdaptiveSchedule:
+    """
+    Rescan interval of a directory from its observed changes: a directory that
+    changed is checked again after min_interval seconds, and each scan that finds
+    it unchanged multiplies its interval by backoff, up to max_interval. Active
+    orders are therefore re-listed often while archived ones are left alone.
+    """
+
+    def __init__(self, min_interval: float = 5 * 60, max_interval: float = 7 * 24 * 3600, backoff: float = 2.0):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+
+    def next_interval(self, previous: Optional[float], changed: bool) -> float:
+        if changed or not previous:
+            return self.min_interval
+        return min(self.max_interval, max(self.min_interval, previous * self.backoff))
@@ -0,0 +1,63 @@
+import threading
+from typing import Dict, List, Optional
+from sqlalchemy.orm import Session
+from src.infrastructure.database.manifest_repository import (
+    SQLFileManifestRepository, SQLSyncCheckpointRepository, ManifestEntry
+)
+
+
+class IngestProgress:
+    """
+    Ingest progress of one root, persisted together with the data it describes.
+
+    The writer stores the manifest rows of each batch, and advances the root's scan
+    checkpoint when checkpointed, inside the batch's own transaction. A crash
+    therefore loses at most the batch being committed: the next scan diffs against
+    a manifest that already holds everything stored, and only re-checks the rest.
+    """
+
+    def __init__(self, root: str, cycle: int, entries: Dict[str, ManifestEntry], checkpointed: bool = False,
+                 digests: Optional[Dict[str, str]] = None):
+        self.root = root
+        self.cycle = cycle
+        # Manifest entries as loaded at the start of the scan
+        self.entries = entries
+        # {content_hash: path} of parsed files in every root, extended as this scan dispatches files
+        self.digests = digests if digests is not None else {}
+        self.checkpointed = checkpointed
+        # Directories whose files have all been dispatched, in walk order
+        self.walked: List[str] = []
+        # Directories that failed to list; their files are neither dispatched nor known to be gone
+        self.unlisted: List[str] = []
+        # Paths that have a manifest row, including rows stored during this scan
+        self._stored = set(entries)
+        self._outstanding = set()
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self) -> Optional[str]:
+        """The checkpoint's cursor: the last directory whose files had all been dispatched."""
+        return self.walked[-1] if self.walked else None
+
+    def dispatched(self, path: str):
+        with self._lock:
+            self._outstanding.add(path)
+
+    def failed(self, path: str):
+        with self._lock:
+            self._outstanding.discard(path)
+
+    def stage(self, db: Session, records: List[dict]):
+        """Adds the batch's manifest rows and checkpoint to db's open transaction."""
+        SQLFileManifestRepository(db).stage(self.root, records, self._stored, self.cycle)
+        if self.checkpointed:
+            written = {record["path"] for record in records}
+            with self._lock:
+                in_flight = sorted(self._outstanding - written)
+            SQLSyncCheckpointRepository(db).advance(self.root, len(records), self.directory, in_flight)
+
+    def committed(self, records: List[dict]):
+        written = {record["path"] for record in records}
+        self._stored |= written
+        with self._lock:
+            self._outstanding -= written
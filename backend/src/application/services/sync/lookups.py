@@ -0,0 +1,72 @@
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy.orm import Session
+from src.infrastructure.database.models import DocumentDB, MaterialDB, PartDB
+
+_MISSING = object()
+
+
+class PartRef(NamedTuple):
+    id: int
+    width: Optional[float]
+
+
+class SyncLookups:
+    """
+    Per-cycle id maps for the small, slowly changing tables every synced file is
+    resolved against: materials by name, parts by registration number and
+    documents by (name, type). Each map is preloaded with one query, and rows the
+    sync creates or resizes are recorded as it goes, so resolving a file costs no
+    queries.
+
+    Changes are journaled until the transaction that made them commits; rollback()
+    undoes them, so a failed batch cannot leave ids of rows that do not exist.
+    Rows that other writers add or remove during the cycle are picked up by the
+    next cycle's preload.
+    """
+
+    def __init__(self, materials: Dict[str, int], parts: Dict[str, PartRef],
+                 documents: Dict[Tuple[str, str], int]):
+        self.materials = materials
+        self.parts = parts
+        self.documents = documents
+        self._journal: List[tuple] = []
+
+    @classmethod
+    def load(cls, db: Session) -> "SyncLookups":
+        # Several rows may share a key; the lowest id wins, like query(...).first()
+        materials = dict(db.query(MaterialDB.name, MaterialDB.id).all())
+        parts = {}
+        for reg_num, part_id, width in db.query(
+            PartDB.registration_number, PartDB.id, PartDB.width
+        ).order_by(PartDB.id).all():
+            parts.setdefault(reg_num, PartRef(part_id, width))
+        documents = {}
+        for name, doc_type, doc_id in db.query(
+            DocumentDB.name, DocumentDB.type, DocumentDB.id
+        ).order_by(DocumentDB.id).all():
+            documents.setdefault((name, doc_type), doc_id)
+        return cls(materials, parts, documents)
+
+    def set_material(self, name: str, material_id: int):
+        self._set(self.materials, name, material_id)
+
+    def set_part(self, reg_num: str, part: PartRef):
+        self._set(self.parts, reg_num, part)
+
+    def set_document(self, key: Tuple[str, str], doc_id: int):
+        self._set(self.documents, key, doc_id)
+
+    def commit(self):
+        self._journal.clear()
+
+    def rollback(self):
+        for table, key, previous in reversed(self._journal):
+            if previous is _MISSING:
+                table.pop(key, None)
+            else:
+                table[key] = previous
+        self._journal.clear()
+
+    def _set(self, table: dict, key, value):
+        self._journal.append((table, key, table.get(key, _MISSING)))
+        table[key] = value
@@ -1,11 +1,25 @@
+import os
 import threading
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set
+from src.infrastructure.database.manifest_repository import SQLSyncCheckpointRepository
+from src.infrastructure.database.directory_stats_repository import SQLDirectoryStatsRepository
 from .scanner import DirectoryScanner
 from .processor import SyncProcessor
+from .watcher import InotifyWatcher, FULL_RESCAN, watch_supported
+from .scheduler import SyncScheduler, SyncJob
+from .adaptive import AdaptiveSchedule
 
 logger = logging.getLogger(__name__)
 
+class SyncRoot(NamedTuple):
+    path: str
+    source_type: str
+    # Rescan interval in minutes; None uses the global rescan/reconcile interval
+    interval: Optional[int]
+
 class SyncManager:
     def __init__(self, scanner: DirectoryScanner, settings_service):
         self.scanner = scanner
@@ -13,11 +27,22 @@ class SyncManager:
         self.running = False
         self._stop_event = threading.Event()
         self.thread = None
+        # Shared with the scanner, which updates the counters live
+        self.metrics = scanner.metrics
+        # Every scan runs as a job on the scheduler's single worker
+        self.scheduler = SyncScheduler(self._run_job, on_change=self.metrics.touch)
+        self._cycle = 0
+        self.watcher: Optional[InotifyWatcher] = None
+        # Watched root -> source type
+        self._watched: Dict[str, str] = {}
+        # Root -> time.monotonic() its last full scan finished
+        self._last_scanned: Dict[str, float] = {}
 
     def start(self):
         if self.running: return
         self.running = True
         self._stop_event.clear()
+        self.scheduler.start()
         self.thread = threading.Thread(target=self._run_loop, daemon=True)
         self.thread.start()
         logger.info("Modular SyncManager started")
@@ -26,32 +51,234 @@ class SyncManager:
         self.running = False
         self._stop_event.set()
         if self.thread: self.thread.join()
+        # Cancels the running scan; files in flight are still stored
+        self.scheduler.stop()
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+            self._watched = {}
+        self.scanner.pipeline.shutdown()
         logger.info("Modular SyncManager stopped")
 
     def _run_loop(self):
+        kind = "full"
         while self.running:
+            # Waits for the cycle, so the interval counts from its end
+            job = self.scheduler.submit(kind, "periodic")
+            while not job.finished.wait(timeout=1.0):
+                if self._stop_event.is_set():
+                    return
+
+            # Sleeps until the next root is due; periodic cycles only scan due roots.
+            # In adaptive mode, due directories are listed in between, every shortest interval
+            wait_sec = self._seconds_until_due(self._roots())
+            kind = "full"
+            if self.settings_service.is_adaptive_enabled():
+                tick_sec = self._apply_adaptive_intervals() * 60
+                if tick_sec < wait_sec:
+                    wait_sec, kind = tick_sec, "adaptive"
+            if self._stop_event.wait(timeout=wait_sec): break
+
+    def trigger_sync(self) -> SyncJob:
+        """
+        Requests a sync cycle ahead of periodic work. While a cycle runs, repeated
+        triggers coalesce into a single follow-up cycle.
+        """
+        return self.scheduler.submit("full", "manual")
+
+    def run_once(self, dry_run: bool = False) -> dict:
+        """
+        Runs one full cycle over every root on the calling thread, for tools that use
+        the sync pipeline without starting the manager (imports, benchmarks). With
+        dry_run nothing is stored: files are parsed and written in transactions that
+        are rolled back, and the cycle counter, manifest and watches are left alone.
+        """
+        self.scanner.dry_run = dry_run
+        try:
+            return self._sync_cycle(self._stop_event)
+        finally:
+            self.scanner.dry_run = False
+
+    def checkpoints(self) -> List[dict]:
+        """Checkpoints of root scans that have not finished, e.g. cut short by a restart."""
+        db = self.scanner.processor.db_session_factory()
+        try:
+            return SQLSyncCheckpointRepository(db).list()
+        finally:
+            db.close()
+
+    def _roots(self) -> List[SyncRoot]:
+        return [SyncRoot(**root) for root in self.settings_service.get_sync_roots()]
+
+    def directory_stats(self, root: str, limit: int = 100) -> List[dict]:
+        """Change statistics of the directories under root, soonest due first."""
+        db = self.scanner.processor.db_session_factory()
+        try:
+            return SQLDirectoryStatsRepository(db).list(root, limit)
+        finally:
+            db.close()
+
+    def _apply_adaptive_intervals(self) -> int:
+        """Sets the scanner's adaptive bounds from the settings; returns the shortest interval in minutes."""
+        shortest, longest = self.settings_service.get_adaptive_intervals()
+        self.scanner.schedule = AdaptiveSchedule(shortest * 60, longest * 60)
+        return shortest
+
+    def _interval_sec(self, root: SyncRoot) -> float:
+        if root.interval:
+            return root.interval * 60
+        # A full scan of a watched root only reconciles what events missed, and in
+        # adaptive mode what the adaptive passes missed, so it runs far less often
+        if root.path in self._watched or self.settings_service.is_adaptive_enabled():
+            return self.settings_service.get_reconcile_interval() * 60
+        return self.settings_service.get_rescan_interval() * 60
+
+    def _is_due(self, root: SyncRoot, now: float) -> bool:
+        last = self._last_scanned.get(root.path)
+        # A second of slack, so a root is not skipped for waking up a moment early
+        return last is None or now - last >= self._interval_sec(root) - 1
+
+    def _seconds_until_due(self, roots: List[SyncRoot]) -> float:
+        if not roots:
+            return self.settings_service.get_rescan_interval() * 60
+        now = time.monotonic()
+        return max(1.0, min(
+            self._last_scanned.get(root.path, now - self._interval_sec(root)) + self._interval_sec(root) - now
+            for root in roots
+        ))
+
+    def _run_job(self, job: SyncJob) -> dict:
+        if job.kind == "directories":
+            source_type = self._watched.get(job.root)
+            if source_type is None:
+                return {}
+            stats = self.scanner.scan_directories(job.root, source_type, job.directories, self._cycle, job.cancel_event)
+            self.metrics.record_scan(job.root, stats)
+            return {job.root: stats}
+        if job.kind == "adaptive":
+            return self._adaptive_pass(job.cancel_event)
+        return self._sync_cycle(job.cancel_event, only_due=job.reason == "periodic")
+
+    def _adaptive_pass(self, stop_event: threading.Event) -> dict:
+        """
+        Lists only the due directories of each unwatched root (watched roots are
+        kept fresh by events). Deletions there are tombstoned right away; stamping
+        and the full sweep are left to the root's next full scan.
+        """
+        results = {}
+        self._apply_adaptive_intervals()
+        for root in self._roots():
+            if stop_event.is_set():
+                break
+            if root.path in self._watched or not os.path.isdir(root.path):
+                continue
             try:
-                self._sync_cycle()
+                directories = self.scanner.due_directories(root.path)
+                stats = self.scanner.scan_directories(root.path, root.source_type, directories, self._cycle, stop_event)
+                stats["directories"] = len(directories)
             except Exception as e:
-                logger.error(f"Error in sync cycle: {e}")
-            
-            # Fetch interval in minutes, convert to seconds
-            interval_min = self.settings_service.get_rescan_interval()
-            interval_sec = interval_min * 60
-            
-            if self._stop_event.wait(timeout=interval_sec): break
-
-    def trigger_sync(self):
-        """Triggers an immediate sync cycle in a background thread."""
-        threading.Thread(target=self._sync_cycle, daemon=True).start()
-
-    def _sync_cycle(self):
-        # Logic to get paths from settings and call scanner.scan
-        # For now, mock paths or integrate with settings_service
-        mihtav_path = self.settings_service.get_mihtav_path()
-        sidra_path = self.settings_service.get_sidra_path()
+                logger.error(f"Adaptive pass over {root.path} failed: {e}")
+                stats = {"error": str(e)}
+            self.metrics.record_scan(root.path, stats)
+            results[root.path] = stats
+        return results
+
+    def _sync_cycle(self, stop_event: threading.Event, only_due: bool = False) -> dict:
+        """
+        Scans the roots concurrently, each on its own thread; their files share the
+        parse pool and writes take turns. A root that fails does not stop the others.
+        With only_due, roots whose interval has not elapsed are left out.
+        """
+        results = {}
+        roots = self._roots()
+        dry_run = self.scanner.dry_run
+        self.scanner.max_depth = self.settings_service.get_walk_depth()
+        self._apply_adaptive_intervals()
+        if not dry_run:
+            self._refresh_watches(roots)
+        if only_due:
+            now = time.monotonic()
+            roots = [root for root in roots if self._is_due(root, now)]
+        if not roots:
+            return results
+        if dry_run:
+            # Nothing is stamped with it, so the persistent counter is not advanced
+            cycle = self._cycle + 1
+        else:
+            cycle = self.settings_service.next_sync_cycle()
+            self._cycle = cycle
+        self.metrics.begin_cycle(cycle)
+        processor = self.scanner.processor
         
-        if mihtav_path:
-            self.scanner.scan(mihtav_path, "mihtav")
-        if sidra_path:
-            self.scanner.scan(sidra_path, "sidra")
+        try:
+            processor.begin_cycle()
+            with ThreadPoolExecutor(len(roots), thread_name_prefix="sync-root") as pool:
+                futures = {root.path: pool.submit(self._scan_root, root, cycle, stop_event) for root in roots}
+            for path, future in futures.items():
+                results[path] = future.result()
+
+            if not dry_run:
+                try:
+                    processor.evict_thumbnails()
+                except Exception as e:
+                    logger.error(f"Thumbnail eviction failed: {e}")
+        finally:
+            processor.end_cycle()
+            self.metrics.end_cycle()
+        return results
+
+    def _scan_root(self, root: SyncRoot, cycle: int, stop_event: threading.Event) -> dict:
+        self.metrics.start_root(root.path, root.source_type)
+        try:
+            stats = self.scanner.scan(root.path, root.source_type, cycle, stop_event)
+            self.metrics.record_scan(root.path, stats)
+        except Exception as e:
+            logger.error(f"Scan of {root.path} failed: {e}")
+            self.metrics.record_scan(root.path, None, str(e))
+            stats = {"error": str(e)}
+        # A failed root is retried at its next interval, not in a tight loop
+        if not stop_event.is_set() and not self.scanner.dry_run:
+            self._last_scanned[root.path] = time.monotonic()
+        return stats
+
+    def _refresh_watches(self, roots: List[SyncRoot]):
+        """Watches local roots for filesystem events; the rest stay on periodic scans."""
+        if not self.settings_service.is_watch_enabled():
+            roots = []
+        wanted = {root.path: root.source_type for root in roots if watch_supported(root.path)}
+        if self.watcher is not None and self.watcher.max_depth != self.scanner.max_depth:
+            # The scan depth changed; watch the new set of directories from scratch
+            self.watcher.stop()
+            self.watcher = None
+            self._watched = {}
+        if wanted and self.watcher is None:
+            try:
+                self.watcher = InotifyWatcher(self._on_fs_change, max_depth=self.scanner.max_depth)
+                self.watcher.start()
+            except OSError as e:
+                logger.warning(f"Filesystem watching unavailable, using periodic scans: {e}")
+                self.watcher = None
+        if self.watcher is None:
+            self._watched = {}
+            return
+
+        for root in set(self._watched) - set(wanted):
+            self.watcher.unwatch(root)
+        watched = {}
+        for root, source_type in wanted.items():
+            if self.watcher.watch(root):
+                watched[root] = source_type
+        self._watched = watched
+        for root in roots:
+            if root.path not in watched:
+                logger.info(f"{root.path} is not watched (network or unsupported filesystem); relying on periodic scans")
+
+    def _on_fs_change(self, root: str, directories: Optional[Set[str]]):
+        """Queues a sync of what a debounced burst of filesystem events touched."""
+        if root not in self._watched or not self.running:
+            return
+        if directories is FULL_RESCAN:
+            self.scheduler.submit("full", "watch")
+        else:
+            self.scheduler.submit("directories", "watch", root, directories)
+
@@ -0,0 +1,162 @@
+import time
+import threading
+from datetime import datetime
+from typing import Optional
+
+# Incremented live by the scanner, pipeline and writer while a scan runs
+COUNTERS = ("dirs_listed", "files_seen", "skipped", "dispatched", "parsed", "linked", "written",
+            "failed", "bytes_read", "tombstoned")
+# walk: directory listing, diff: manifest load and compare, prepare: read/parse/render
+# of one file in a worker, write: one batch commit, sweep: manifest stamping and tombstones
+STAGES = ("walk", "diff", "prepare", "write", "sweep")
+
+
+def _progress(counts: dict) -> dict:
+    done = counts["written"] + counts["failed"]
+    return {
+        "done": done,
+        "total": counts["dispatched"],
+        "percent": round(100.0 * done / counts["dispatched"], 1) if counts["dispatched"] else None
+    }
+
+
+def _stage_view(stage: dict) -> dict:
+    count = stage["count"]
+    return {
+        "count": count,
+        "total_ms": round(stage["total"] * 1000, 1),
+        "avg_ms": round(stage["total"] * 1000 / count, 2) if count else 0.0,
+        "max_ms": round(stage["max"] * 1000, 1)
+    }
+
+
+class SyncMetrics:
+    """
+    Thread-safe counters for the sync subsystem, read by the API.
+    Every change bumps version, so pollers can tell cheaply whether anything moved.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.version = 0
+        self.cycles = 0
+        self.totals = {name: 0 for name in COUNTERS}
+        self.stages = {name: {"count": 0, "total": 0.0, "max": 0.0} for name in STAGES}
+        self.last_cycle: Optional[dict] = None
+        self._current: Optional[dict] = None
+        self._started = 0.0
+
+    def begin_cycle(self, cycle: int):
+        with self._lock:
+            self._started = time.perf_counter()
+            self._current = {
+                "cycle": cycle,
+                "started_at": datetime.now().isoformat(timespec="seconds"),
+                "roots": {},
+                "stages": {name: {"count": 0, "total": 0.0, "max": 0.0} for name in STAGES},
+                **{name: 0 for name in COUNTERS}
+            }
+            self.version += 1
+
+    def add(self, root: Optional[str] = None, **counts: int):
+        """Adds to the named counters of the running cycle (and of root within it) and the totals."""
+        with self._lock:
+            slot = self._root(root)
+            for name, value in counts.items():
+                self.totals[name] += value
+                if self._current is not None:
+                    self._current[name] += value
+                if slot is not None:
+                    slot[name] += value
+            self.version += 1
+
+    def scoped(self, root: str) -> "RootMetrics":
+        return RootMetrics(self, root)
+
+    def stage(self, name: str, seconds: float, count: int = 1):
+        """Records that count items took seconds in a pipeline stage."""
+        with self._lock:
+            targets = [self.stages[name]]
+            if self._current is not None:
+                targets.append(self._current["stages"][name])
+            for stage in targets:
+                stage["count"] += count
+                stage["total"] += seconds
+                stage["max"] = max(stage["max"], seconds)
+            self.version += 1
+
+    def start_root(self, root: str, source_type: str):
+        """Marks root as being scanned in the running cycle."""
+        with self._lock:
+            slot = self._root(root)
+            if slot is not None:
+                slot.update(source_type=source_type, state="running")
+            self.version += 1
+
+    def record_scan(self, root: str, stats: Optional[dict], error: Optional[str] = None):
+        """Stores the outcome of scanning root: its stats, or the error that stopped it."""
+        with self._lock:
+            slot = self._root(root)
+            if slot is not None:
+                slot.update(state="failed" if error else "done", result=dict(stats) if stats else None, error=error)
+            self.version += 1
+
+    def _root(self, root: Optional[str]) -> Optional[dict]:
+        if root is None or self._current is None:
+            return None
+        roots = self._current["roots"]
+        if root not in roots:
+            roots[root] = {"state": "running", "result": None, "error": None, **{name: 0 for name in COUNTERS}}
+        return roots[root]
+
+    def touch(self):
+        """Marks a change outside the counters (e.g. a job was queued)."""
+        with self._lock:
+            self.version += 1
+
+    def end_cycle(self):
+        with self._lock:
+            if self._current is None:
+                return
+            self._current["duration_sec"] = round(time.perf_counter() - self._started, 3)
+            self.last_cycle = self._view(self._current)
+            self._current = None
+            self.cycles += 1
+            self.version += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "version": self.version,
+                "cycles": self.cycles,
+                "running": self._current is not None,
+                "current": self._view(self._current) if self._current is not None else None,
+                "totals": dict(self.totals),
+                "stages": {name: _stage_view(stage) for name, stage in self.stages.items()},
+                "last_cycle": dict(self.last_cycle) if self.last_cycle else None
+            }
+
+    def _view(self, cycle: dict) -> dict:
+        view = {key: value for key, value in cycle.items() if key not in ("stages", "roots")}
+        view["roots"] = {root: dict(slot, progress=_progress(slot)) for root, slot in cycle["roots"].items()}
+        view["stages"] = {name: _stage_view(stage) for name, stage in cycle["stages"].items()}
+        elapsed = cycle.get("duration_sec", time.perf_counter() - self._started)
+        progress = _progress(cycle)
+        view["elapsed_sec"] = round(elapsed, 3)
+        view["files_per_sec"] = round(progress["done"] / elapsed, 1) if elapsed > 0 else 0.0
+        view["progress"] = progress
+        return view
+
+
+class RootMetrics:
+    """The add/stage interface of SyncMetrics, also counting into one root's slot of the cycle."""
+
+    def __init__(self, metrics: SyncMetrics, root: str):
+        self.metrics = metrics
+        self.root = root
+
+    def add(self, **counts: int):
+        self.metrics.add(root=self.root, **counts)
+
+    def stage(self, name: str, seconds: float, count: int = 1):
+        self.metrics.stage(name, seconds, count)
@@ -0,0 +1,183 @@
+import os
+import queue
+import multiprocessing
+import shutil
+import tempfile
+import itertools
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from .processor import SyncProcessor, PreparedFile, prepare_file
+from .writer import BatchIngestWriter, IngestItem, DONE
+from .metrics import SyncMetrics
+from .checkpoint import IngestProgress
+
+logger = logging.getLogger(__name__)
+
+
+class IngestResult(NamedTuple):
+    records: List[dict]
+    failed: int
+    dispatched: int
+
+
+class SyncPipeline:
+    """
+    Staged ingestion for directory sync:
+
+        walk (thread pool) -> prepare (process pool) -> write (one thread)
+
+    Directory listings run on a small thread pool because they mostly wait on the
+    file share. Reading, hashing, parsing and thumbnail rendering are CPU-bound and
+    run in worker processes. A single BatchIngestWriter owns the database and commits
+    in batches, so SQLite never sees concurrent writers. Identical copies of files
+    already parsed (IngestItem.linked) skip the worker processes altogether.
+
+    The stages are joined by bounded buffers: at most max_inflight files are being
+    prepared, and at most queue_size prepared files wait for the writer. A slow
+    writer therefore stalls parsing instead of piling results up in memory.
+
+    Several roots may be ingested at once from different threads. They share the
+    pools, and their writers take turns committing, one batch at a time.
+    """
+
+    def __init__(self, processor: SyncProcessor, walkers: int = 8, parse_workers: Optional[int] = None,
+                 max_inflight: int = 64, queue_size: int = 64, batch_size: int = 200,
+                 flush_ms: int = 500, inline_threshold: int = 8):
+        self.processor = processor
+        self.walkers = max(1, walkers)
+        self.parse_workers = parse_workers if parse_workers is not None else (os.cpu_count() or 1)
+        self.max_inflight = max(1, max_inflight)
+        self.queue_size = max(1, queue_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_ms = flush_ms
+        # Starting worker processes costs more than parsing a handful of files
+        self.inline_threshold = inline_threshold
+        self._walk_pool: Optional[ThreadPoolExecutor] = None
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        # Held while a batch or a scan's manifest sweep is committed
+        self.write_lock = threading.Lock()
+
+    def walk(self, fn: Callable, items: Iterable) -> Iterator:
+        """Maps fn over items on the walker pool, yielding results in input order."""
+        return self.walk_executor().map(fn, items)
+
+    def walk_executor(self) -> ThreadPoolExecutor:
+        """The thread pool directory listings run on, started on first use."""
+        with self._lock:
+            if self._walk_pool is None:
+                self._walk_pool = ThreadPoolExecutor(self.walkers, thread_name_prefix="sync-walk")
+            return self._walk_pool
+
+    def ingest(self, items: Iterable[IngestItem], source_type: str,
+               stop_event: Optional[threading.Event] = None,
+               metrics: Optional[SyncMetrics] = None,
+               progress: Optional[IngestProgress] = None, dry_run: bool = False) -> IngestResult:
+        """
+        Prepares and writes items, which may be a stream still being produced by a
+        directory walk. Returns the manifest records of the files that were
+        stored, the number that failed, and the number that entered the pipeline.
+        When stop_event is set no new files are started; files already being prepared
+        are still written, and the rest are left for the next cycle. With progress,
+        every batch also commits its manifest rows (see IngestProgress). With
+        dry_run the batches are rolled back instead of committed, and thumbnails
+        are rendered into a scratch directory that is removed afterwards.
+        """
+        buffer = queue.Queue(maxsize=self.queue_size)
+        writer = BatchIngestWriter(self.processor, source_type, self.batch_size, self.flush_ms, metrics,
+                                   self.write_lock, progress, dry_run)
+        thread = threading.Thread(target=writer.run, args=(buffer,), name="sync-writer", daemon=True)
+        thread.start()
+
+        thumbnail_dir = tempfile.mkdtemp(prefix="sync-dry-run-") if dry_run else self.processor.thumbnails.directory
+        dispatched = 0
+        try:
+            for item, prepared in self._prepare(items, stop_event, thumbnail_dir):
+                dispatched += 1
+                if metrics is not None:
+                    if item.linked:
+                        metrics.add(linked=1)
+                    else:
+                        metrics.stage("prepare", prepared.seconds)
+                        if prepared.digest is not None:
+                            metrics.add(parsed=1, bytes_read=item.size)
+                # Blocks while the writer is behind
+                buffer.put((item, prepared))
+        finally:
+            buffer.put(DONE)
+            thread.join()
+            if dry_run:
+                shutil.rmtree(thumbnail_dir, ignore_errors=True)
+        return IngestResult(writer.records, writer.failed, dispatched)
+
+    def shutdown(self):
+        """Stops the worker pools after the work they already accepted has finished."""
+        with self._lock:
+            walk_pool, self._walk_pool = self._walk_pool, None
+            parse_pool, self._parse_pool = self._parse_pool, None
+        if walk_pool:
+            walk_pool.shutdown(wait=True)
+        if parse_pool:
+            parse_pool.shutdown(wait=True)
+
+    def _prepare(self, items: Iterable[IngestItem], stop_event,
+                 thumbnail_dir: str) -> Iterator[Tuple[IngestItem, PreparedFile]]:
+        items = iter(items)
+        head = list(itertools.islice(items, self.inline_threshold))
+        pending = itertools.chain(head, items)
+        if self.parse_workers <= 1 or len(head) < self.inline_threshold:
+            for item in pending:
+                if stop_event is not None and stop_event.is_set():
+                    return
+                yield item, _linked(item) if item.linked else prepare_file(item.path, thumbnail_dir)
+            return
+
+        inflight = deque()
+        while True:
+            stopping = stop_event is not None and stop_event.is_set()
+            while not stopping and len(inflight) < self.max_inflight:
+                item = next(pending, None)
+                if item is None:
+                    break
+                if item.linked:
+                    inflight.append((item, None, None))
+                    continue
+                # Looked up per file: a broken pool is replaced by _result
+                pool = self._get_parse_pool()
+                inflight.append((item, pool, pool.submit(prepare_file, item.path, thumbnail_dir)))
+            if not inflight:
+                return
+            # Results are taken in submission order so ingestion stays deterministic
+            item, pool, future = inflight.popleft()
+            yield item, _linked(item) if future is None else self._result(item, pool, future)
+
+    def _result(self, item: IngestItem, pool: ProcessPoolExecutor, future) -> PreparedFile:
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            logger.error(f"Parse worker pool broke while preparing {item.path}: {e}")
+            with self._lock:
+                if self._parse_pool is pool:
+                    self._parse_pool = None
+            return PreparedFile(item.path, None, None, None, None, str(e))
+        except Exception as e:
+            return PreparedFile(item.path, None, None, None, None, str(e))
+
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._parse_pool is None:
+                # Spawned, not forked: the pool starts inside a server with live threads
+                # (scheduler, walkers, writers, watcher) whose locks a fork would copy
+                self._parse_pool = ProcessPoolExecutor(
+                    self.parse_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._parse_pool
+
+
+def _linked(item: IngestItem) -> PreparedFile:
+    """An identical copy needs no parse: its content was already parsed as item.variant_of."""
+    return PreparedFile(item.path, item.content_hash, None, None, None, None)
@@ -1,6 +1,11 @@
 import os
+import json
+import time
+import hashlib
 import logging
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 from datetime import date
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
 from src.domain.interfaces import IDocumentRepository
 from src.domain.models import Document, DocumentType, DocumentStatus
@@ -9,14 +14,309 @@ from src.domain.models import Document, DocumentType, DocumentStatus
 logger = logging.getLogger(__name__)
 
 from src.infrastructure.parsers.gnc_parser import GNCParser
+from src.infrastructure.parsers.parse_cache import parse_cache
 from src.infrastructure.graphics.svg_generator import SVGGenerator
+from src.infrastructure.graphics.geometry import compile_sheet, geometry_bounds, geometry_hash
+from src.infrastructure.graphics.thumbnail_cache import ThumbnailCache
 from src.infrastructure.database.models import DocumentDB, AttachmentDB, MaterialDB, PartDB, TaskDB
+from src.infrastructure.database.manifest_repository import chunked
+from .lookups import SyncLookups, PartRef
+
+
+class SheetInfo(NamedTuple):
+    """The parts of a parsed sheet the DB writer needs; small enough to cross process boundaries."""
+    material: Optional[str]
+    width: Optional[float]
+    height: Optional[float]
+    parts: int
+    contours: int
+    thickness: Optional[float]
+    cut_count: Optional[int]
+    program_width: Optional[float]
+    program_height: Optional[float]
+
+    @classmethod
+    def from_sheet(cls, sheet) -> "SheetInfo":
+        return cls(
+            material=sheet.material,
+            width=sheet.width,
+            height=sheet.height,
+            parts=sheet.total_parts or len(sheet.parts),
+            contours=sheet.total_contours,
+            thickness=sheet.thickness,
+            cut_count=sheet.cut_count,
+            program_width=sheet.program_width,
+            program_height=sheet.program_height
+        )
+
+
+class PreparedFile(NamedTuple):
+    """Result of the CPU-bound half of ingesting a file (see prepare_file)."""
+    path: str
+    digest: Optional[str]
+    sheet: Optional[SheetInfo]
+    geometry_hash: Optional[str]
+    bounds: Optional[Tuple[float, float, float, float]]
+    error: Optional[str]
+    # Time spent preparing, for the prepare stage latency
+    seconds: float = 0.0
+
+
+class StaleRenditions(NamedTuple):
+    """
+    Cached renditions of a re-ingested file's previous content. Dropped with
+    SyncProcessor.drop_stale only once the new content is committed, so a
+    rolled-back batch leaves the database pointing at files that still exist.
+    """
+    path: str
+    content_hash: str
+    # Thumbnails (by geometry hash) no part uses once the new content is stored
+    thumbnails: List[str]
+
+
+def document_identity(filename: str, source_type: str, doc_name: Optional[str] = None) -> Tuple[str, str]:
+    """(name, type) of the document a synced file is attached to."""
+    doc_type = "order" if source_type == "mihtav" else "part"
+    if not doc_name:
+        doc_name = filename.replace(".gnc", "").replace(".GNC", "")
+    return doc_name, doc_type
+
+
+def part_identity(filename: str) -> Tuple[str, str]:
+    """(registration number, version) of the library part a file describes."""
+    # Professional implementation of registration number and version logic
+    reg_num = filename.replace(".gnc", "").replace(".GNC", "")
+    version = "A"
+    if "_" in reg_num and "801" not in reg_num:
+        parts = reg_num.split("_")
+        reg_num = parts[0]
+        version = parts[-1]
+    return reg_num, version
+
+
+def sheet_dimensions(sheet: SheetInfo, bounds=None) -> Tuple[float, float]:
+    # Dimension extraction, falling back to the cut geometry's extent
+    width = sheet.width or 0.0
+    height = sheet.height or 0.0
+    if not width and bounds:
+        width = bounds[2] - bounds[0]
+        height = bounds[3] - bounds[1]
+    return width, height
+
+
+def sheet_stats(sheet: SheetInfo) -> str:
+    return json.dumps({
+        "parts": sheet.parts,
+        "contours": sheet.contours,
+        "thickness": sheet.thickness,
+        "cut_count": sheet.cut_count,
+        "program_width": sheet.program_width,
+        "program_height": sheet.program_height
+    })
+
+
+def new_document_row(name: str, doc_type: str, source_type: str) -> dict:
+    """Column values of a document created for a synced file."""
+    return {
+        "name": name,
+        "type": doc_type,
+        "status": "unregistered",
+        "registration_date": date.today(),
+        "description": f"Auto-imported from {source_type}"
+    }
+
+
+class LibraryFile(NamedTuple):
+    """An ingested file as its part library and task rows are built from it."""
+    path: str
+    name: str
+    document_id: Optional[int]
+    material_id: Optional[int]
+    sheet: Optional[SheetInfo] = None
+    geometry_hash: Optional[str] = None
+    bounds: Optional[Tuple[float, float, float, float]] = None
+
+
+def upsert_parts(db: Session, files: List[LibraryFile], lookups: Optional[SyncLookups], refresh: bool = False):
+    """
+    Creates or updates the library part of each file's sheet, keyed by registration
+    number; later files update the rows of earlier ones. Existing parts take the
+    file's path, stats and geometry hash, and its dimensions when they had none;
+    refresh=True also overwrites dimensions and material, for edited files.
+    Shared by SyncProcessor and BatchIngestWriter, with one query per table either way.
+    """
+    reg_nums = sorted({part_identity(f.name)[0] for f in files})
+    existing = {}
+    if lookups is not None:
+        for reg_num in reg_nums:
+            part = lookups.parts.get(reg_num)
+            if part is not None:
+                existing[reg_num] = {"id": part.id, "width": part.width}
+    else:
+        for chunk in chunked(reg_nums):
+            rows = db.query(PartDB.id, PartDB.registration_number, PartDB.width).filter(
+                PartDB.registration_number.in_(chunk)
+            ).order_by(PartDB.id).all()
+            for part_id, reg_num, width in rows:
+                existing.setdefault(reg_num, {"id": part_id, "width": width})
+
+    inserts = {}
+    updates = {}
+    for f in files:
+        reg_num, version = part_identity(f.name)
+        width, height = sheet_dimensions(f.sheet, f.bounds)
+        row = inserts.get(reg_num) or updates.get(reg_num)
+        if row is None:
+            if reg_num in existing:
+                row = updates[reg_num] = dict(existing[reg_num])
+            else:
+                inserts[reg_num] = {
+                    "name": f.name, "registration_number": reg_num, "version": version,
+                    "material_id": f.material_id, "gnc_file_path": f.path, "width": width,
+                    "height": height, "stats": sheet_stats(f.sheet), "geometry_hash": f.geometry_hash
+                }
+                continue
+        row["gnc_file_path"] = f.path
+        if refresh or not row.get("width"):
+            row["width"] = width
+            row["height"] = height
+        if refresh and f.material_id:
+            row["material_id"] = f.material_id
+        row["stats"] = sheet_stats(f.sheet)
+        if f.geometry_hash:
+            row["geometry_hash"] = f.geometry_hash
+
+    if inserts:
+        rows = db.execute(insert(PartDB).returning(PartDB.id, PartDB.registration_number, PartDB.width),
+                          list(inserts.values()))
+        for part_id, reg_num, width in rows:
+            if lookups is not None:
+                lookups.set_part(reg_num, PartRef(part_id, width))
+    if updates:
+        db.execute(update(PartDB), list(updates.values()))
+        if lookups is not None:
+            for reg_num, row in updates.items():
+                lookups.set_part(reg_num, PartRef(row["id"], row["width"]))
+
+
+def upsert_tasks(db: Session, files: List[LibraryFile]):
+    """
+    Gives each file a task on its document: the task already on the file, else one
+    detached when the file was tombstoned (a returning file gets it back), else a
+    new planned task. The file's material replaces the task's when it has one.
+    """
+    existing = {}
+    for chunk in chunked([f.path for f in files]):
+        rows = db.query(TaskDB.id, TaskDB.document_id, TaskDB.gnc_file_path, TaskDB.material_id).filter(
+            TaskDB.gnc_file_path.in_(chunk)
+        ).order_by(TaskDB.id).all()
+        for task_id, doc_id, path, material_id in rows:
+            existing.setdefault((doc_id, path), (task_id, material_id))
+    detached = _detached_tasks(db, {(f.document_id, f.name) for f in files
+                                    if (f.document_id, f.path) not in existing})
+
+    inserts = []
+    updates = []
+    for f in files:
+        task = existing.get((f.document_id, f.path))
+        if task is None:
+            free = detached.get((f.document_id, f.name))
+            if free:
+                task_id, previous_material = free.pop(0)
+                updates.append({"id": task_id, "gnc_file_path": f.path,
+                                "material_id": f.material_id or previous_material})
+            else:
+                inserts.append({
+                    "document_id": f.document_id, "name": f.name, "gnc_file_path": f.path,
+                    "status": "planned", "material_id": f.material_id
+                })
+        elif f.material_id and task[1] != f.material_id:
+            updates.append({"id": task[0], "material_id": f.material_id})
+    if inserts:
+        db.execute(insert(TaskDB), inserts)
+    if updates:
+        db.execute(update(TaskDB), updates)
+
+
+def _detached_tasks(db: Session, keys: set) -> Dict[Tuple[int, str], List[Tuple[int, Optional[int]]]]:
+    """{(document id, name): [(task id, material id)]} of tasks whose file was tombstoned, oldest first."""
+    detached = {}
+    for chunk in chunked(sorted({name for _, name in keys})):
+        rows = db.query(TaskDB.id, TaskDB.document_id, TaskDB.name, TaskDB.material_id).filter(
+            TaskDB.gnc_file_path.is_(None), TaskDB.name.in_(chunk)
+        ).order_by(TaskDB.id).all()
+        for task_id, doc_id, name, material_id in rows:
+            if (doc_id, name) in keys:
+                detached.setdefault((doc_id, name), []).append((task_id, material_id))
+    return detached
+
+
+def content_hash(file_path: str, chunk_size: int = 1024 * 1024) -> Optional[str]:
+    """
+    SHA-1 of a file's content, read in chunks so large programs are never held in
+    memory whole; matches PreparedFile.digest. None if the file cannot be read.
+    """
+    digest = hashlib.sha1()
+    try:
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+    except OSError as e:
+        logger.error(f"Failed to hash {file_path}: {e}")
+        return None
+    return digest.hexdigest()
+
+
+def prepare_file(file_path: str, thumbnail_dir: str) -> PreparedFile:
+    """
+    Reads, hashes and parses one GNC file and renders its thumbnail.
+    Touches no database, so it can run in a worker process.
+    """
+    started = time.perf_counter()
+    prepared = _prepare_file(file_path, thumbnail_dir)
+    return prepared._replace(seconds=time.perf_counter() - started)
+
+
+def _prepare_file(file_path: str, thumbnail_dir: str) -> PreparedFile:
+    try:
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        return PreparedFile(file_path, None, None, None, None, f"Failed to read: {e}")
+    digest = hashlib.sha1(raw).hexdigest()
+
+    filename = os.path.basename(file_path)
+    try:
+        sheet = GNCParser().parse(raw.decode('utf-8', errors='ignore'), filename=filename)
+    except Exception as e:
+        # The file is still attached, just without part data
+        logger.error(f"Failed to parse {filename}: {e}")
+        return PreparedFile(file_path, digest, None, None, None, None)
+
+    g_hash = None
+    bounds = None
+    try:
+        geometry = compile_sheet(sheet)
+        g_hash = geometry_hash(geometry)
+        bounds = geometry_bounds(geometry)
+        thumbnails = ThumbnailCache(thumbnail_dir)
+        if g_hash and not thumbnails.exists(g_hash):
+            thumbnails.store(g_hash, SVGGenerator().render_svg(geometry))
+    except Exception as e:
+        logger.error(f"Failed to render thumbnail for {filename}: {e}")
+    return PreparedFile(file_path, digest, SheetInfo.from_sheet(sheet), g_hash, bounds, None)
+
 
 class SyncProcessor:
-    def __init__(self, db_session_factory):
+    def __init__(
+        self,
+        db_session_factory,
+        thumbnail_cache_bytes: int = 256 * 1024 * 1024,
+        invalidate_tiles: Optional[Callable[[str], None]] = None,
+    ):
         self.db_session_factory = db_session_factory
-        self.parser = GNCParser()
-        self.svg_gen = SVGGenerator()
+        # Drops the sheet tiles cached for a content hash; the API wires in its tile renderer
+        self.invalidate_tiles = invalidate_tiles
         
         # Path for thumbnails
         # Path for thumbnails
@@ -34,118 +334,220 @@ class SyncProcessor:
             path = os.path.dirname(path)
         base_dir = path
         self.thumbnail_dir = os.path.join(base_dir, "static", "uploads", "thumbnails")
-        os.makedirs(self.thumbnail_dir, exist_ok=True)
+        self.thumbnails = ThumbnailCache(self.thumbnail_dir, thumbnail_cache_bytes)
+        # Set between begin_cycle and end_cycle
+        self.lookups: Optional[SyncLookups] = None
 
-    def process_file(self, file_path: str, source_type: str, doc_name: str = None):
+    def begin_cycle(self):
+        """Preloads the material, part and document maps files are resolved against this cycle."""
         db = self.db_session_factory()
         try:
-            filename = os.path.basename(file_path)
-            
-            # 1. Check if Attachment exists
-            existing_att = db.query(AttachmentDB).filter(AttachmentDB.file_path == file_path).first()
-            if existing_att: return
-
-            # 2. Determine Document Type & Status
-            doc_type = "order" if source_type == "mihtav" else "part"
-            if not doc_name:
-                doc_name = filename.replace(".gnc", "").replace(".GNC", "")
-            
-            # 3. Parse GNC
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                sheet = self.parser.parse(content, filename=filename)
-            except Exception as e:
-                logger.error(f"Failed to parse {filename}: {e}")
-                sheet = None
-
-            # 4. Get/Create Document
-            doc = db.query(DocumentDB).filter(DocumentDB.name == doc_name, DocumentDB.type == doc_type).first()
-            if not doc:
-                doc = DocumentDB(
-                    name=doc_name,
-                    type=doc_type,
-                    status="unregistered",
-                    registration_date=date.today(),
-                    description=f"Auto-imported from {source_type}"
-                )
-                db.add(doc)
-                db.commit()
-                db.refresh(doc)
-
-            # 5. Create Attachment
-            att = AttachmentDB(
-                document_id=doc.id,
-                file_path=file_path,
-                filename=filename,
-                media_type="application/x-gnc"
-            )
-            db.add(att)
-            db.commit()
+            self.lookups = SyncLookups.load(db)
+        finally:
+            db.close()
 
-            # 6. Extract & Update Part/Task library
-            if sheet:
-                self._update_part_library(db, sheet, filename, file_path)
-                self._process_tasks(db, doc, sheet, file_path, filename)
-            
+    def end_cycle(self):
+        self.lookups = None
+
+    def process_file(self, file_path: str, source_type: str, doc_name: str = None,
+                     previous_hash: Optional[str] = None) -> Optional[str]:
+        """
+        Ingests one GNC file. Returns the SHA-1 of its content for the file manifest,
+        or None if the file could not be read or stored.
+        previous_hash is the content hash the manifest last recorded for the file; an
+        already attached file whose content differs from it is re-ingested in place.
+        """
+        prepared = prepare_file(file_path, self.thumbnails.directory)
+        if prepared.error:
+            logger.error(f"Sync error for {file_path}: {prepared.error}")
+            return None
+
+        lookups = self.lookups
+        db = self.db_session_factory()
+        try:
+            stale = self.apply(db, prepared, source_type, doc_name, previous_hash)
+            db.commit()
+            if lookups is not None:
+                lookups.commit()
         except Exception as e:
             logger.error(f"Sync error for {file_path}: {e}")
             db.rollback()
+            if lookups is not None:
+                lookups.rollback()
+            return None
         finally:
             db.close()
+        if stale is not None:
+            self.drop_stale([stale])
+        return prepared.digest
 
-    def _update_part_library(self, db: Session, sheet, filename: str, file_path: str):
-        # Professional implementation of registration number and version logic
-        reg_num = filename.replace(".gnc", "").replace(".GNC", "")
-        version = "A"
-        if "_" in reg_num and "801" not in reg_num:
-            parts = reg_num.split("_")
-            reg_num = parts[0]
-            version = parts[-1]
+    def apply(self, db: Session, prepared: PreparedFile, source_type: str, doc_name: str = None,
+              previous_hash: Optional[str] = None) -> Optional[StaleRenditions]:
+        """
+        Writes a prepared file to the database. Only flushes; the caller commits,
+        so a writer can group many files into one transaction, and then commits or
+        rolls back self.lookups to match. For a file edited in place, returns the
+        renditions of its previous content, for the caller to drop_stale after commit.
+        """
+        file_path = prepared.path
+        filename = os.path.basename(file_path)
+        sheet = prepared.sheet
 
-        part = db.query(PartDB).filter(PartDB.registration_number == reg_num).first()
-        
-        # Material Handling
-        mat_name = getattr(sheet, 'material', 'Unknown') or "Unknown"
-        material = db.query(MaterialDB).filter(MaterialDB.name == mat_name).first()
-        if not material and mat_name != "Unknown":
-            material = MaterialDB(name=mat_name)
-            db.add(material)
-            db.commit()
-            db.refresh(material)
-
-        # Dimension extraction
-        width = getattr(sheet, 'width', 0.0)
-        height = getattr(sheet, 'height', 0.0)
-
-        if not part:
-            part = PartDB(
-                name=filename,
-                registration_number=reg_num,
-                version=version,
-                material_id=material.id if material else None,
-                gnc_file_path=file_path,
-                width=width,
-                height=height
+        # 1. Check if Attachment exists
+        existing_att = db.query(AttachmentDB).filter(AttachmentDB.file_path == file_path).first()
+        if existing_att:
+            if previous_hash is not None and previous_hash != prepared.digest:
+                return self._reingest(db, existing_att, prepared, filename, previous_hash)
+            return None
+
+        # 2. Determine Document Type & Status
+        doc_name, doc_type = document_identity(filename, source_type, doc_name)
+
+        # 3. Get/Create Document
+        doc_id = self._resolve_document(db, doc_name, doc_type, source_type)
+
+        # 4. Create Attachment
+        att = AttachmentDB(
+            document_id=doc_id,
+            file_path=file_path,
+            filename=filename,
+            media_type="application/x-gnc"
+        )
+        db.add(att)
+        db.flush()
+
+        # 5. Extract & Update Part/Task library
+        if sheet:
+            material_id = self._update_part_library(
+                db, sheet, filename, file_path, prepared.geometry_hash, prepared.bounds
             )
-            db.add(part)
-        else:
-            # Update existing part metadata
-            part.gnc_file_path = file_path
-            if part.width == 0:
-                part.width = width
-                part.height = height
-        db.commit()
-
-    def _process_tasks(self, db: Session, doc: DocumentDB, sheet, file_path: str, filename: str):
-        # Link to tasks
-        task = db.query(TaskDB).filter(TaskDB.document_id == doc.id, TaskDB.gnc_file_path == file_path).first()
-        if not task:
-            task = TaskDB(
-                document_id=doc.id,
-                name=filename,
-                gnc_file_path=file_path,
-                status="planned"
+            self._process_tasks(db, doc_id, file_path, filename, material_id)
+        return None
+
+    def _reingest(self, db: Session, att: AttachmentDB, prepared: PreparedFile, filename: str,
+                  previous_hash: str) -> StaleRenditions:
+        """
+        Updates the part and task rows of a file that was edited in place, and
+        returns the cached renditions of the previous content.
+        """
+        file_path = prepared.path
+        logger.info(f"Re-ingesting modified file {file_path}")
+        old_hashes = {h for (h,) in db.query(PartDB.geometry_hash).filter(
+            PartDB.gnc_file_path == file_path, PartDB.geometry_hash.isnot(None)
+        ).all()}
+
+        if prepared.sheet:
+            material_id = self._update_part_library(
+                db, prepared.sheet, filename, file_path, prepared.geometry_hash, prepared.bounds, refresh=True
             )
-            db.add(task)
+            if att.document_id is not None:
+                self._process_tasks(db, att.document_id, file_path, filename, material_id)
+
+        # Thumbnails are shared by geometry hash; only drop those no part uses any more
+        db.flush()
+        unused = sorted(
+            old_hash for old_hash in old_hashes
+            if db.query(PartDB.id).filter(PartDB.geometry_hash == old_hash).first() is None
+        )
+        return StaleRenditions(file_path, previous_hash, unused)
+
+    def drop_stale(self, stale: List[StaleRenditions]):
+        """Drops the renditions of replaced content; call only after the replacement is committed."""
+        for renditions in stale:
+            # Parse and tile caches are keyed by path and content hash of the old version
+            parse_cache.invalidate(renditions.path)
+            if self.invalidate_tiles is not None:
+                self.invalidate_tiles(renditions.content_hash)
+            for old_hash in renditions.thumbnails:
+                self.thumbnails.discard(old_hash)
+
+    def tombstone_files(self, paths: List[str]) -> int:
+        """
+        Detaches files that disappeared from the share, in bulk: their attachments are
+        removed, and tasks and parts keep their history but lose the file path.
+        Returns the number of files tombstoned.
+        """
+        if not paths:
+            return 0
+        db = self.db_session_factory()
+        try:
+            for chunk in chunked(paths):
+                db.query(AttachmentDB).filter(AttachmentDB.file_path.in_(chunk)).delete(synchronize_session=False)
+                db.query(TaskDB).filter(TaskDB.gnc_file_path.in_(chunk)).update(
+                    {TaskDB.gnc_file_path: None}, synchronize_session=False
+                )
+                db.query(PartDB).filter(PartDB.gnc_file_path.in_(chunk)).update(
+                    {PartDB.gnc_file_path: None}, synchronize_session=False
+                )
             db.commit()
+        except Exception as e:
+            logger.error(f"Failed to tombstone {len(paths)} files: {e}")
+            db.rollback()
+            return 0
+        finally:
+            db.close()
+
+        for path in paths:
+            parse_cache.invalidate(path)
+        logger.info(f"Tombstoned {len(paths)} missing files")
+        return len(paths)
+
+    def evict_thumbnails(self) -> dict:
+        """Evicts thumbnails no part references and enforces the cache size bound."""
+        db = self.db_session_factory()
+        try:
+            rows = db.query(PartDB.geometry_hash).filter(PartDB.geometry_hash.isnot(None)).distinct().all()
+        finally:
+            db.close()
+        return self.thumbnails.evict(h for (h,) in rows)
+
+    def _resolve_document(self, db: Session, name: str, doc_type: str, source_type: str) -> int:
+        lookups = self.lookups
+        if lookups is not None:
+            doc_id = lookups.documents.get((name, doc_type))
+        else:
+            row = db.query(DocumentDB.id).filter(
+                DocumentDB.name == name, DocumentDB.type == doc_type
+            ).order_by(DocumentDB.id).first()
+            doc_id = row[0] if row else None
+        if doc_id is not None:
+            return doc_id
+
+        doc = DocumentDB(**new_document_row(name, doc_type, source_type))
+        db.add(doc)
+        db.flush()
+        if lookups is not None:
+            lookups.set_document((name, doc_type), doc.id)
+        return doc.id
+
+    def _resolve_material(self, db: Session, sheet: SheetInfo) -> Optional[int]:
+        mat_name = sheet.material or "Unknown"
+        lookups = self.lookups
+        if lookups is not None:
+            material_id = lookups.materials.get(mat_name)
+        else:
+            material_id = db.query(MaterialDB.id).filter(MaterialDB.name == mat_name).scalar()
+        if material_id is None and mat_name != "Unknown":
+            material = MaterialDB(name=mat_name)
+            db.add(material)
+            db.flush()
+            material_id = material.id
+            if lookups is not None:
+                lookups.set_material(mat_name, material_id)
+        return material_id
+
+    def _update_part_library(self, db: Session, sheet: SheetInfo, filename: str, file_path: str, g_hash: str = None,
+                             bounds=None, refresh: bool = False) -> Optional[int]:
+        """
+        Creates or updates the library part for a sheet and returns its material id.
+        refresh=True overwrites dimensions and material from the sheet, for files
+        that were edited after they were first ingested.
+        """
+        material_id = self._resolve_material(db, sheet)
+        upsert_parts(db, [LibraryFile(file_path, filename, None, material_id, sheet, g_hash, bounds)],
+                     self.lookups, refresh)
+        return material_id
+
+    def _process_tasks(self, db: Session, doc_id: int, file_path: str, filename: str,
+                       material_id: Optional[int] = None):
+        upsert_tasks(db, [LibraryFile(file_path, filename, doc_id, material_id)])
@@ -1,69 +1,400 @@
 import os
+import time
 import logging
-from typing import List, Set
-from .processor import SyncProcessor
+import functools
+import itertools
+import threading
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+from src.infrastructure.database.manifest_repository import (
+    SQLFileManifestRepository, SQLSyncCheckpointRepository, ManifestEntry
+)
+from src.infrastructure.database.directory_stats_repository import SQLDirectoryStatsRepository
+from .processor import SyncProcessor, content_hash
+from .pipeline import SyncPipeline, IngestItem
+from .metrics import SyncMetrics, RootMetrics
+from .walker import ParallelWalker
+from .checkpoint import IngestProgress
+from .adaptive import AdaptiveSchedule
 
 logger = logging.getLogger(__name__)
 
+
+class ListedFile(NamedTuple):
+    path: str
+    doc_name: Optional[str]
+    size: int
+    mtime_ns: int
+    # Only taken for files that differ from their manifest entry
+    content_hash: Optional[str] = None
+    # The base file next to an _801 variant
+    variant_of: Optional[str] = None
+
+
 class DirectoryScanner:
-    def __init__(self, processor: SyncProcessor):
+    def __init__(self, processor: SyncProcessor, pipeline: Optional[SyncPipeline] = None,
+                 metrics: Optional[SyncMetrics] = None, max_depth: Optional[int] = 1):
         self.processor = processor
+        self.pipeline = pipeline or SyncPipeline(processor)
+        self.metrics = metrics or SyncMetrics()
+        # How deep scans descend below a root: 1 is the root and its document
+        # directories, None the whole tree. Nested folders belong to their document.
+        self.max_depth = max_depth
+        # Turns the per-directory change statistics every scan records into rescan intervals
+        self.schedule = AdaptiveSchedule()
+        # Trial syncs: files are parsed and written in rolled-back transactions, and
+        # the manifest, checkpoints, tombstones and directory statistics are left alone
+        self.dry_run = False
         self.suffixes = ['_801', 'to801', '_to801']
 
-    def scan(self, root_path: str, source_type: str):
+    def scan(self, root_path: str, source_type: str, cycle: int = 0,
+             stop_event: Optional[threading.Event] = None) -> dict:
+        """
+        Walks root_path, diffs the files against the file manifest and dispatches
+        only new or changed files to the ingestion pipeline. A rescan with no changes
+        costs one walk and one bulk manifest query. Files stream from the walk into
+        the pipeline, so parsing starts while slow directories are still listed.
+
+        New and changed files are hashed on the walker threads. A file whose content
+        was already parsed, in any root, is linked to that file instead of being
+        parsed again, and _801 variants are linked to their base file; the manifest
+        keeps both relationships in variant_of.
+
+        Every stored batch commits its manifest rows and advances the root's
+        checkpoint, so a scan interrupted by a stop or a crash resumes next time
+        without re-parsing what it stored. Setting stop_event ends the scan early;
+        files in flight are still stored.
+        """
+        stats = {"listed": 0, "dispatched": 0, "unchanged": 0, "linked": 0, "failed": 0, "tombstoned": 0}
         if not os.path.exists(root_path):
             logger.warning(f"Scan path does not exist: {root_path}")
-            return
+            return stats
 
+        metrics = self.metrics.scoped(root_path)
+        db = self.processor.db_session_factory()
+        try:
+            manifest = SQLFileManifestRepository(db)
+            checkpoints = SQLSyncCheckpointRepository(db)
+            progress = self._load_progress(manifest, root_path, cycle, metrics, checkpointed=not self.dry_run)
+            try:
+                files = self.iter_files(root_path, stop_event, metrics, progress)
+            except OSError as e:
+                logger.error(f"Failed to scan directory {root_path}: {e}")
+                return stats
+
+            previous = None if self.dry_run else checkpoints.begin(root_path, source_type, cycle)
+            if previous:
+                stats["resumed"] = previous["files_written"]
+                logger.info(
+                    f"Resuming interrupted scan of {root_path} (cycle {previous['cycle']}): "
+                    f"{previous['files_written']} files already stored, "
+                    f"{len(previous['in_flight'])} were in flight, last directory {previous['directory']}"
+                )
+
+            listing = []
+            dispatched = self._ingest_changed(_recorded(files, listing), progress, source_type, stats, stop_event, metrics)
+            stats["listed"] = len(listing)
+            known = progress.entries
+
+            if stop_event is not None and stop_event.is_set():
+                # A partial scan must not stamp or sweep files it never looked at;
+                # the checkpoint stays, so the next cycle picks the root up first
+                logger.info(f"Scan of {root_path} stopped after {stats['dispatched']} files")
+                return stats
+
+            started = time.perf_counter()
+            listed_paths = {f.path for f in listing}
+            # A directory that failed to list keeps its files until it lists again:
+            # they are stamped as seen, so the sweep leaves them alone
+            unlisted = tuple(d + os.sep for d in progress.unlisted)
+            if unlisted:
+                kept = [p for p in known if p not in listed_paths and p.startswith(unlisted)]
+                logger.warning(f"{len(progress.unlisted)} directories under {root_path} failed to list; "
+                               f"keeping their {len(kept)} files")
+                listed_paths.update(kept)
+            missing = [p for p in known if p not in listed_paths]
+            if self.dry_run:
+                # Counted, not swept: the files a real sync would tombstone
+                stats["tombstoned"] = sum(1 for p in missing if not known[p].missing)
+                logger.info(f"Dry run of {root_path}: {stats['dispatched']} files dispatched, "
+                            f"{stats['tombstoned']} would be tombstoned")
+                return stats
+            # Other roots may be ingesting; their writers wait while the manifest is swept
+            with self.pipeline.write_lock:
+                manifest.mark_seen(root_path, cycle, list(listed_paths), missing)
+
+                # Mark and sweep: whatever was not stamped this cycle is gone from the share
+                unseen = []
+                if not listing and known:
+                    logger.warning(f"{root_path} listed no files; skipping deletion sweep")
+                else:
+                    unseen = manifest.find_unseen(root_path, cycle)
+                    stats["tombstoned"] = self.processor.tombstone_files(unseen)
+                    if stats["tombstoned"]:
+                        manifest.mark_missing(unseen)
+                checkpoints.finish(root_path)
+                self._record_directories(db, root_path, progress.walked, dispatched + unseen)
+            metrics.stage("sweep", time.perf_counter() - started)
+            metrics.add(tombstoned=stats["tombstoned"])
+        finally:
+            db.close()
+
+        logger.info(
+            f"Scanned {root_path}: {stats['listed']} files, {stats['dispatched']} dispatched "
+            f"({stats['linked']} linked copies), {stats['unchanged']} unchanged, {stats['failed']} failed, "
+            f"{stats['tombstoned']} tombstoned"
+        )
+        return stats
+
+    def scan_directories(self, root_path: str, source_type: str, directories: Set[str], cycle: int = 0,
+                         stop_event: Optional[threading.Event] = None) -> dict:
+        """
+        Syncs only the given directories of root_path (the root itself and/or
+        directories within max_depth below it), each without descending, for
+        filesystem events. Files that are gone from them, or from under a directory
+        that was removed, are tombstoned right away; cycle stamps are left to the
+        next full scan.
+        """
+        stats = {"listed": 0, "dispatched": 0, "unchanged": 0, "linked": 0, "failed": 0, "tombstoned": 0}
+        if not os.path.isdir(root_path):
+            logger.error(f"Failed to scan directory {root_path}: not a directory")
+            return stats
+        metrics = self.metrics.scoped(root_path)
+        directories = {d for d in directories if self._within_depth(root_path, d)}
+        present = sorted(d for d in directories if os.path.isdir(d))
+        vanished = [d for d in directories if d not in present]
+
+        db = self.processor.db_session_factory()
+        try:
+            manifest = SQLFileManifestRepository(db)
+            progress = self._load_progress(manifest, root_path, cycle, metrics)
+            listing = []
+            listed_dirs = set()
+            list_directory = functools.partial(self._list_directory, root_path, metrics, progress.entries)
+            for directory, files in zip(present, self.pipeline.walk(list_directory, present)):
+                # A directory that failed to list keeps its files until it lists again
+                if files is not None:
+                    listed_dirs.add(directory)
+                    listing.extend(files)
+            stats["listed"] = len(listing)
+
+            dispatched = self._ingest_changed(listing, progress, source_type, stats, stop_event, metrics)
+            known = progress.entries
+            started = time.perf_counter()
+            listed_paths = {f.path for f in listing}
+            gone = [
+                path for path, entry in known.items()
+                if not entry.missing and path not in listed_paths and (
+                    os.path.dirname(path) in listed_dirs or any(path.startswith(d + os.sep) for d in vanished)
+                )
+            ]
+            if self.dry_run:
+                stats["tombstoned"] = len(gone)
+                return stats
+            with self.pipeline.write_lock:
+                stats["tombstoned"] = self.processor.tombstone_files(gone)
+                if stats["tombstoned"]:
+                    manifest.mark_missing(gone)
+                self._record_directories(db, root_path, listed_dirs, dispatched + gone)
+                if vanished:
+                    SQLDirectoryStatsRepository(db).forget(vanished)
+            metrics.stage("sweep", time.perf_counter() - started)
+            metrics.add(tombstoned=stats["tombstoned"])
+        finally:
+            db.close()
+
+        logger.info(
+            f"Synced {len(directories)} changed directories under {root_path}: {stats['dispatched']} dispatched, "
+            f"{stats['failed']} failed, {stats['tombstoned']} tombstoned"
+        )
+        return stats
+
+    def _load_progress(self, manifest: SQLFileManifestRepository, root_path: str, cycle: int,
+                       metrics: RootMetrics, checkpointed: bool = False) -> IngestProgress:
+        started = time.perf_counter()
+        known = manifest.load(root_path)
+        digests = manifest.load_digests()
+        metrics.stage("diff", time.perf_counter() - started)
+        return IngestProgress(root_path, cycle, known, checkpointed, digests)
+
+    def due_directories(self, root_path: str) -> Set[str]:
+        """
+        The directories of root_path an adaptive pass lists: the root itself (one
+        cheap listing that also reveals new document directories), directories
+        never scanned, and those whose adaptive interval has elapsed.
+        """
+        db = self.processor.db_session_factory()
+        try:
+            stats = SQLDirectoryStatsRepository(db)
+            known = stats.known(root_path)
+            directories = {root_path, *stats.due(root_path)}
+        finally:
+            db.close()
         try:
             with os.scandir(root_path) as it:
-                entries = sorted(list(it), key=lambda e: e.name)
+                directories.update(e.path for e in it if e.is_dir(follow_symlinks=False) and e.path not in known)
+        except OSError as e:
+            logger.error(f"Failed to scan directory {root_path}: {e}")
+        return {d for d in directories if self._within_depth(root_path, d)}
+
+    def _record_directories(self, db, root_path: str, scanned: Iterable[str], changed_files: List[str]):
+        changed = {os.path.dirname(path) for path in changed_files}
+        SQLDirectoryStatsRepository(db).record(root_path, scanned, changed, self.schedule.next_interval)
+
+    def _ingest_changed(self, listing: Iterable[ListedFile], progress: IngestProgress, source_type: str,
+                        stats: dict, stop_event: Optional[threading.Event], metrics: RootMetrics) -> List[str]:
+        """
+        Diffs listing against the manifest entries in progress and sends new and
+        changed files through the pipeline, which stores their manifest rows.
+        Files with the content of one already parsed are sent as linked copies.
+        Returns the paths that were dispatched.
+        """
+        known = progress.entries
+        digests = progress.digests
+        dispatched = []
+
+        def changed():
+            for f in listing:
+                entry = known.get(f.path)
+                if not self._is_changed(f, entry):
+                    stats["unchanged"] += 1
+                    metrics.add(skipped=1)
+                    continue
+                # A reappearing file was detached when it was tombstoned; ingest it as new
+                previous_hash = entry.content_hash if entry and not entry.missing else None
+                if entry and digests.get(entry.content_hash) == f.path:
+                    # Copies found from now on must not be linked to content the file no longer holds
+                    del digests[entry.content_hash]
+                original = digests.get(f.content_hash) if f.content_hash else None
+                linked = original is not None and original != f.path
+                if linked:
+                    stats["linked"] += 1
+                elif f.content_hash:
+                    digests.setdefault(f.content_hash, f.path)
+                metrics.add(dispatched=1)
+                progress.dispatched(f.path)
+                dispatched.append(f.path)
+                yield IngestItem(f.path, f.doc_name, f.size, f.mtime_ns, previous_hash, f.content_hash,
+                                 original if linked else f.variant_of, linked)
+
+        # Failed files are not recorded, so they are retried next cycle
+        _, stats["failed"], stats["dispatched"] = self.pipeline.ingest(
+            changed(), source_type, stop_event, metrics, progress, self.dry_run
+        )
+        return dispatched
+
+    def _is_changed(self, f: ListedFile, entry) -> bool:
+        return entry is None or entry.missing or (entry.size, entry.mtime_ns) != (f.size, f.mtime_ns)
+
+    def list_files(self, root_path: str) -> Optional[List[ListedFile]]:
+        """Returns the GNC files to sync under root_path, or None if it cannot be listed."""
+        try:
+            return list(self.iter_files(root_path))
         except OSError as e:
             logger.error(f"Failed to scan directory {root_path}: {e}")
-            return
+            return None
+
+    def iter_files(self, root_path: str, stop_event: Optional[threading.Event] = None,
+                   metrics: Optional[RootMetrics] = None,
+                   progress: Optional[IngestProgress] = None) -> Iterator[ListedFile]:
+        """
+        Streams the GNC files to sync under root_path, down to max_depth, as the
+        parallel walk lists their directories. Files directly in the root have no
+        document; files anywhere below a sub-directory belong to that document.
+        With progress, files that differ from its manifest entries are hashed.
+        Raises OSError right away if root_path itself cannot be listed.
+        """
+        known = progress.entries if progress is not None else None
+        walker = ParallelWalker(self.pipeline.walk_executor(), self.max_depth)
+        walk = walker.walk(root_path, functools.partial(self._visit, root_path, known), stop_event)
+        # The root is the only listing in flight at first, so this raises if it fails
+        first = next(walk)
+        return self._walked_files(itertools.chain([first], walk), metrics or self.metrics.scoped(root_path), progress)
+
+    def _walked_files(self, walk, metrics: RootMetrics, progress: Optional[IngestProgress]) -> Iterator[ListedFile]:
+        for directory in walk:
+            if directory.error is not None:
+                if progress is not None:
+                    progress.unlisted.append(directory.path)
+                continue
+            metrics.stage("walk", directory.seconds)
+            metrics.add(dirs_listed=1, files_seen=len(directory.result))
+            yield from directory.result
+            if progress is not None:
+                progress.walked.append(directory.path)
+
+    def _visit(self, root_path: str, known: Optional[Dict[str, ManifestEntry]], path: str, depth: int,
+               entries) -> List[ListedFile]:
+        listing = []
+        self._collect(entries, self._doc_name(root_path, path), listing, known)
+        return listing
 
-        # Deduplication logic implementation
-        base_files = self._get_base_files(entries)
+    def _doc_name(self, root_path: str, path: str) -> Optional[str]:
+        if path == root_path:
+            return None
+        return os.path.relpath(path, root_path).split(os.sep)[0]
 
+    def _within_depth(self, root_path: str, path: str) -> bool:
+        if path == root_path:
+            return True
+        if not path.startswith(root_path.rstrip(os.sep) + os.sep):
+            return False
+        return self.max_depth is None or len(os.path.relpath(path, root_path).split(os.sep)) <= self.max_depth
+
+    def _collect(self, entries, doc_name: Optional[str], listing: List[ListedFile],
+                 known: Optional[Dict[str, ManifestEntry]] = None):
+        bases = self._base_files(entries)
         for entry in entries:
             try:
-                if entry.is_dir():
-                    self._scan_directory(entry, source_type)
-                elif entry.is_file() and entry.name.lower().endswith('.gnc'):
-                    if self._should_skip_file(entry.name, base_files):
-                        continue
-                    self.processor.process_file(entry.path, source_type)
-            except Exception as e:
+                if entry.is_file() and entry.name.lower().endswith('.gnc'):
+                    st = entry.stat()
+                    f = ListedFile(entry.path, doc_name, st.st_size, st.st_mtime_ns,
+                                   variant_of=self._base_of(entry.name, bases))
+                    if known is not None:
+                        previous = known.get(f.path)
+                        digest = content_hash(f.path) if self._is_changed(f, previous) else previous.content_hash
+                        f = f._replace(content_hash=digest)
+                    listing.append(f)
+            except OSError as e:
                 logger.error(f"Error processing entry {entry.name}: {e}")
 
-    def _get_base_files(self, entries) -> Set[str]:
-        base_files = set()
+    def _base_files(self, entries) -> Dict[str, str]:
+        """{lower-case name without extension: path} of the directory's GNC files that are not variants."""
+        base_files = {}
         for e in entries:
             if e.is_file() and e.name.lower().endswith('.gnc'):
                 fname = e.name[:-4].lower()
                 if not any(fname.endswith(s) for s in self.suffixes):
-                    base_files.add(fname)
+                    base_files[fname] = e.path
         return base_files
 
-    def _should_skip_file(self, filename: str, base_files: Set[str]) -> bool:
+    def _base_of(self, filename: str, base_files: Dict[str, str]) -> Optional[str]:
+        """Path of the base file an _801 variant was made from, if it sits next to it."""
         fname = filename[:-4].lower()
         for s in self.suffixes:
             if fname.endswith(s):
                 potential_base = fname[:-len(s)]
                 if potential_base in base_files:
-                    return True
-        return False
+                    return base_files[potential_base]
+        return None
 
-    def _scan_directory(self, entry: os.DirEntry, source_type: str):
-        # Implementation for directory-as-document logic
-        # For now, simplistic: scan all GNCs inside
+    def _list_directory(self, root_path: str, metrics: RootMetrics, known: Optional[Dict[str, ManifestEntry]],
+                        path: str) -> Optional[List[ListedFile]]:
+        """Lists one directory without descending; None if it cannot be listed."""
+        started = time.perf_counter()
         try:
-            with os.scandir(entry.path) as it:
-                sub_entries = list(it)
-                base_files = self._get_base_files(sub_entries)
-                for se in sub_entries:
-                    if se.is_file() and se.name.lower().endswith('.gnc'):
-                        if not self._should_skip_file(se.name, base_files):
-                            self.processor.process_file(se.path, source_type, doc_name=entry.name)
-        except OSError:
-            pass
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            logger.error(f"Failed to scan directory {path}: {e}")
+            return None
+        listing = self._visit(root_path, known, path, 0, entries)
+        metrics.stage("walk", time.perf_counter() - started)
+        metrics.add(dirs_listed=1, files_seen=len(listing))
+        return listing
+
+
+def _recorded(files: Iterable[ListedFile], listing: List[ListedFile]) -> Iterator[ListedFile]:
+    """Passes files through, keeping each in listing for the deletion sweep."""
+    for f in files:
+        listing.append(f)
+        yield f
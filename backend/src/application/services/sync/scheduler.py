@@ -0,0 +1,231 @@
+import itertools
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first: a user waiting on a button beats a filesystem event beats the timer
+PRIORITIES = {"manual": 0, "watch": 1, "periodic": 2}
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+class SyncJob:
+    """
+    One unit of sync work. kind "full" is a scan cycle over every root; kind
+    "directories" syncs the changed directories of one root; kind "adaptive"
+    lists the directories of every root that are due by their change rate.
+    """
+
+    def __init__(self, job_id: int, kind: str, reason: str, root: Optional[str] = None,
+                 directories: Optional[Set[str]] = None):
+        self.id = job_id
+        self.kind = kind
+        self.reason = reason
+        self.priority = PRIORITIES.get(reason, len(PRIORITIES))
+        self.root = root
+        self.directories = set(directories or ())
+        self.state = QUEUED
+        # Triggers that were folded into this job while it was queued
+        self.coalesced = 0
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.cancel_event = threading.Event()
+        self.finished = threading.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "reason": self.reason,
+            "root": self.root,
+            "directories": len(self.directories),
+            "state": self.state,
+            "coalesced": self.coalesced,
+            "created_at": self.created_at.isoformat(timespec="seconds"),
+            "started_at": self.started_at.isoformat(timespec="seconds") if self.started_at else None,
+            "finished_at": self.finished_at.isoformat(timespec="seconds") if self.finished_at else None,
+            "result": self.result,
+            "error": self.error
+        }
+
+
+class SyncScheduler:
+    """
+    Runs sync jobs one at a time on a single worker thread.
+
+    Triggers never start a second scan: a trigger that matches a queued job is
+    folded into it (a queued full cycle absorbs everything, directory jobs for the
+    same root merge their directory sets, adaptive passes merge with each other),
+    so any number of triggers arriving
+    while a cycle runs yield at most one follow-up cycle. Queued jobs run by
+    priority, manual before watch before periodic. The running job is cancelled
+    through its cancel_event, which runner must pass to the scan as stop event.
+    """
+
+    def __init__(self, runner: Callable[[SyncJob], Optional[dict]], history: int = 20,
+                 on_change: Optional[Callable[[], None]] = None):
+        self.runner = runner
+        # Called (under the scheduler lock) whenever a job is queued, started or finished
+        self.on_change = on_change
+        self._ids = itertools.count(1)
+        self._queue: List[SyncJob] = []
+        self._current: Optional[SyncJob] = None
+        self._history = deque(maxlen=history)
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        with self._cond:
+            self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="sync-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Drops queued jobs, cancels the running one and waits for it to wind down."""
+        with self._cond:
+            self._stopping = True
+            for job in self._queue:
+                self._finish(job, CANCELLED)
+            self._queue.clear()
+            if self._current:
+                self._current.cancel_event.set()
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, kind: str = "full", reason: str = "manual", root: Optional[str] = None,
+               directories: Optional[Set[str]] = None) -> SyncJob:
+        with self._cond:
+            if self._stopping:
+                job = SyncJob(next(self._ids), kind, reason, root, directories)
+                self._finish(job, CANCELLED)
+                return job
+            job = self._coalesce(kind, reason, root, directories)
+            if job is None:
+                job = SyncJob(next(self._ids), kind, reason, root, directories)
+                self._queue.append(job)
+            self._changed()
+            self._cond.notify_all()
+            return job
+
+    def cancel(self, job_id: Optional[int] = None) -> Optional[SyncJob]:
+        """Cancels a queued job, or the running one (job_id None or its id). Returns the job."""
+        with self._cond:
+            for job in self._queue:
+                if job.id == job_id:
+                    self._queue.remove(job)
+                    self._finish(job, CANCELLED)
+                    return job
+            if self._current and job_id in (None, self._current.id):
+                self._current.cancel_event.set()
+                return self._current
+            return None
+
+    def get(self, job_id: int) -> Optional[SyncJob]:
+        with self._cond:
+            for job in [self._current, *self._queue, *self._history]:
+                if job is not None and job.id == job_id:
+                    return job
+            return None
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "running": self._current.to_dict() if self._current else None,
+                "queued": [job.to_dict() for job in sorted(self._queue, key=self._order)],
+                "recent": [job.to_dict() for job in reversed(self._history)]
+            }
+
+    def _coalesce(self, kind, reason, root, directories) -> Optional[SyncJob]:
+        priority = PRIORITIES.get(reason, len(PRIORITIES))
+        full = next((job for job in self._queue if job.kind == "full"), None)
+        target = None
+        if full is not None:
+            # A queued full cycle covers every root
+            target = full
+        elif kind == "directories":
+            target = next((job for job in self._queue if job.kind == "directories" and job.root == root), None)
+            if target is not None:
+                target.directories.update(directories or ())
+        elif kind == "adaptive":
+            target = next((job for job in self._queue if job.kind == "adaptive"), None)
+        if target is None:
+            if kind == "full":
+                # A full cycle supersedes queued directory and adaptive jobs
+                absorbed = [job for job in self._queue if job.kind != "full"]
+                if not absorbed:
+                    return None
+                # Keeps the reason of the most urgent job, as folding into a queued job does:
+                # a periodic cycle that absorbs a watch job must still scan the watched root
+                lead = min(absorbed, key=self._order)
+                target = SyncJob(next(self._ids), kind, reason if priority <= lead.priority else lead.reason)
+                target.coalesced = sum(job.coalesced + 1 for job in absorbed)
+                target.priority = min(priority, lead.priority)
+                for job in absorbed:
+                    self._queue.remove(job)
+                    job.error = f"Superseded by job {target.id}"
+                    self._finish(job, CANCELLED)
+                self._queue.append(target)
+                return target
+            return None
+        target.coalesced += 1
+        if priority < target.priority:
+            target.priority = priority
+            target.reason = reason
+        return target
+
+    def _order(self, job: SyncJob):
+        return (job.priority, job.id)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                job = min(self._queue, key=self._order)
+                self._queue.remove(job)
+                job.state = RUNNING
+                job.started_at = datetime.now()
+                self._current = job
+                self._changed()
+
+            state = DONE
+            try:
+                job.result = self.runner(job)
+                if job.cancel_event.is_set():
+                    state = CANCELLED
+            except Exception as e:
+                logger.error(f"Sync job {job.id} ({job.kind}) failed: {e}")
+                job.error = str(e)
+                state = FAILED
+
+            with self._cond:
+                self._current = None
+                self._finish(job, state)
+                self._cond.notify_all()
+
+    def _finish(self, job: SyncJob, state: str):
+        job.state = state
+        job.finished_at = datetime.now()
+        self._history.append(job)
+        job.finished.set()
+        self._changed()
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
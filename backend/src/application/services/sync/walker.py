@@ -0,0 +1,91 @@
+import os
+import time
+import logging
+import threading
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class WalkedDirectory(NamedTuple):
+    path: str
+    # 0 for the root, 1 for its sub-directories, ...
+    depth: int
+    # Whatever visit returned for the directory's entries
+    result: Any
+    # Time spent listing the directory and visiting its entries
+    seconds: float
+    # Set when the directory could not be listed; result is None then. Unlike an
+    # empty directory, its files are unknown rather than gone.
+    error: Optional[str] = None
+
+
+class ParallelWalker:
+    """
+    Walks a directory tree with many directory listings in flight at once.
+
+    On a file share each scandir is a network round-trip, so listing directories
+    one after another leaves the walk bound by latency. Here every directory found
+    is listed as its own task on executor; up to max_pending listings run
+    concurrently, and directories are yielded in the order their listings finish.
+
+    visit(path, depth, entries) runs on the worker thread that listed the directory,
+    so per-entry work that also costs round-trips (stat) is spread over the pool too.
+    max_depth limits the descent: 1 lists the root and its sub-directories, None
+    walks the whole tree. Symlinked directories are not followed.
+    """
+
+    def __init__(self, executor: Executor, max_depth: Optional[int] = 1, max_pending: int = 256):
+        self.executor = executor
+        self.max_depth = max_depth
+        self.max_pending = max(1, max_pending)
+
+    def walk(self, root: str, visit: Callable[[str, int, List[os.DirEntry]], Any],
+             stop_event: Optional[threading.Event] = None) -> Iterator[WalkedDirectory]:
+        """
+        Yields a WalkedDirectory per directory under root. Raises OSError if root
+        itself cannot be listed; unreadable sub-directories are logged and yielded
+        with their error set, and are not descended into. Setting stop_event stops
+        descending; listings already running are yielded.
+        """
+        backlog = [(root, 0)]
+        pending = {}
+        try:
+            while backlog or pending:
+                # Deeper directories first keeps the backlog (and memory) small on wide trees
+                while backlog and len(pending) < self.max_pending:
+                    path, depth = backlog.pop()
+                    pending[self.executor.submit(self._list, path, depth, visit)] = (path, depth)
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, depth = pending.pop(future)
+                    try:
+                        result, subdirs, seconds = future.result()
+                    except OSError as e:
+                        if depth == 0:
+                            raise
+                        logger.error(f"Failed to scan directory {path}: {e}")
+                        yield WalkedDirectory(path, depth, None, 0.0, str(e))
+                        continue
+                    if stop_event is None or not stop_event.is_set():
+                        backlog.extend((sub, depth + 1) for sub in subdirs)
+                    yield WalkedDirectory(path, depth, result, seconds)
+        finally:
+            # An abandoned walk must not leave listings queued on the shared pool
+            for future in pending:
+                future.cancel()
+
+    def _list(self, path: str, depth: int, visit):
+        started = time.perf_counter()
+        with os.scandir(path) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        subdirs = []
+        if self.max_depth is None or depth < self.max_depth:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                except OSError as e:
+                    logger.error(f"Error processing entry {entry.name}: {e}")
+        return visit(path, depth, entries), subdirs, time.perf_counter() - started
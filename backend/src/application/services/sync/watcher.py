@@ -0,0 +1,273 @@
+import os
+import sys
+import time
+import select
+import struct
+import ctypes
+import ctypes.util
+import logging
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+_WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+               | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT = struct.Struct("iIII")
+
+# Events on these filesystems are only raised for local changes, so a watch would miss
+# files other machines drop on the share
+NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb", "smb3", "smbfs", "afs", "ceph", "9p",
+                       "fuse.sshfs", "fuse.rclone", "davfs", "glusterfs"}
+
+# Passed to on_change instead of a directory set when the whole root must be rescanned
+FULL_RESCAN = None
+
+
+def _load_libc():
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+_libc = _load_libc()
+
+
+def filesystem_type(path: str) -> Optional[str]:
+    """Type of the filesystem path lives on, from /proc/self/mounts; None if unknown."""
+    try:
+        with open("/proc/self/mounts") as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return None
+    path = os.path.realpath(path)
+    best, fs_type = "", None
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        # Mount points with spaces are octal-escaped
+        mount_point = fields[1].replace("\\040", " ")
+        if (path == mount_point or path.startswith(mount_point.rstrip("/") + "/")) and len(mount_point) > len(best):
+            best, fs_type = mount_point, fields[2]
+    return fs_type
+
+
+def watch_supported(path: str) -> bool:
+    """True when inotify events for path can be trusted: Linux, and a local filesystem."""
+    if _libc is None or not os.path.isdir(path):
+        return False
+    return filesystem_type(path) not in NETWORK_FILESYSTEMS
+
+
+class InotifyWatcher:
+    """
+    Watches sync roots with Linux inotify through ctypes, at the depth the scanner
+    syncs: the root and its sub-directories down to max_depth (None: all of them).
+
+    Events are debounced: once a burst has been quiet for debounce seconds (or has
+    lasted max_delay seconds) on_change(root, directories) is called from the
+    watcher thread with the set of directories that changed, or FULL_RESCAN when
+    the kernel dropped events or the root itself went away.
+    """
+
+    def __init__(self, on_change: Callable[[str, Optional[Set[str]]], None],
+                 debounce: float = 2.0, max_delay: float = 30.0, max_depth: Optional[int] = 1):
+        if _libc is None:
+            raise OSError("inotify is not available on this platform")
+        self.on_change = on_change
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.max_depth = max_depth
+        self._fd = -1
+        # wd -> (root, directory, depth below root)
+        self._wds: Dict[int, Tuple[str, str, int]] = {}
+        self._roots: Dict[str, Set[int]] = {}
+        self._pending: Dict[str, Optional[Set[str]]] = {}
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._fd = _libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sync-watch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._wds.clear()
+        self._roots.clear()
+
+    @property
+    def roots(self) -> Set[str]:
+        with self._lock:
+            return set(self._roots)
+
+    def watch(self, root: str) -> bool:
+        """Adds watches for root and its sub-directories. Returns False if root cannot be watched."""
+        with self._lock:
+            if root in self._roots:
+                return True
+            self._roots[root] = set()
+            if not self._add(root, root, 0):
+                del self._roots[root]
+                return False
+            self._add_subdirs(root, root, 0)
+            return True
+
+    def unwatch(self, root: str):
+        with self._lock:
+            for wd in self._roots.pop(root, set()):
+                self._wds.pop(wd, None)
+                _libc.inotify_rm_watch(self._fd, wd)
+            self._pending.pop(root, None)
+
+    def _add(self, root: str, path: str, depth: int) -> bool:
+        wd = _libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            logger.warning(f"Cannot watch {path}: {os.strerror(ctypes.get_errno())}")
+            return False
+        self._wds[wd] = (root, path, depth)
+        self._roots[root].add(wd)
+        return True
+
+    def _descends(self, depth: int) -> bool:
+        return self.max_depth is None or depth < self.max_depth
+
+    def _add_subdirs(self, root: str, path: str, depth: int) -> List[str]:
+        """Watches the sub-directories of path within max_depth; returns the ones added."""
+        if not self._descends(depth):
+            return []
+        added = []
+        try:
+            with os.scandir(path) as it:
+                subdirs = [entry.path for entry in it if entry.is_dir(follow_symlinks=False)]
+        except OSError as e:
+            logger.warning(f"Failed to list {path} for watching: {e}")
+            return added
+        for sub in subdirs:
+            if self._add(root, sub, depth + 1):
+                added.append(sub)
+                added.extend(self._add_subdirs(root, sub, depth + 1))
+        return added
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([self._fd], [], [], self._timeout())
+            except (OSError, ValueError):
+                break
+            if readable:
+                self._read()
+            self._flush_due()
+
+    def _timeout(self) -> float:
+        with self._lock:
+            if not self._pending:
+                return 0.5
+            now = time.monotonic()
+            due = min(self._last_event + self.debounce, self._first_event + self.max_delay)
+            return min(0.5, max(0.0, due - now))
+
+    def _read(self):
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        with self._lock:
+            while offset + _EVENT.size <= len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+                offset += _EVENT.size + length
+                self._handle(wd, mask, os.fsdecode(name))
+
+    def _handle(self, wd: int, mask: int, name: str):
+        if mask & IN_Q_OVERFLOW:
+            for root in self._roots:
+                self._mark(root, FULL_RESCAN)
+            return
+        watched = self._wds.get(wd)
+        if watched is None:
+            return
+        root, path, depth = watched
+        if mask & IN_IGNORED:
+            self._wds.pop(wd, None)
+            self._roots.get(root, set()).discard(wd)
+            return
+        if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+            # A vanished document directory is covered by its parent's event
+            if path == root:
+                self._mark(root, FULL_RESCAN)
+            return
+
+        if mask & IN_ISDIR:
+            if not self._descends(depth):
+                return
+            child = os.path.join(path, name)
+            changed = {child}
+            if mask & (IN_CREATE | IN_MOVED_TO) and self._add(root, child, depth + 1):
+                # A tree moved in arrives whole, with no events for its contents
+                changed.update(self._add_subdirs(root, child, depth + 1))
+            self._mark(root, changed)
+        elif name.lower().endswith(".gnc") and mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE):
+            self._mark(root, {path})
+
+    def _mark(self, root: str, directories: Optional[Set[str]]):
+        now = time.monotonic()
+        if not self._pending:
+            self._first_event = now
+        self._last_event = now
+        if root in self._pending and self._pending[root] is FULL_RESCAN:
+            return
+        if directories is FULL_RESCAN:
+            self._pending[root] = FULL_RESCAN
+        else:
+            self._pending.setdefault(root, set()).update(directories)
+
+    def _flush_due(self):
+        with self._lock:
+            if not self._pending:
+                return
+            now = time.monotonic()
+            if now - self._last_event < self.debounce and now - self._first_event < self.max_delay:
+                return
+            pending, self._pending = self._pending, {}
+        for root, directories in pending.items():
+            try:
+                self.on_change(root, directories)
+            except Exception as e:
+                logger.error(f"Handling changes under {root} failed: {e}")
@@ -0,0 +1,268 @@
+import os
+import time
+import queue
+import logging
+import threading
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from src.infrastructure.database.models import DocumentDB, AttachmentDB, MaterialDB, TaskDB
+from src.infrastructure.database.manifest_repository import chunked
+from .processor import (
+    SyncProcessor, PreparedFile, LibraryFile, document_identity, new_document_row, upsert_parts, upsert_tasks
+)
+from .lookups import SyncLookups
+from .metrics import SyncMetrics
+from .checkpoint import IngestProgress
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of the writer's input queue
+DONE = object()
+
+
+class IngestItem(NamedTuple):
+    path: str
+    doc_name: Optional[str]
+    size: int
+    mtime_ns: int
+    previous_hash: Optional[str]
+    # SHA-1 taken while diffing against the manifest, when the file could be read
+    content_hash: Optional[str] = None
+    # Base file of an _801 variant, or the file this one is an identical copy of
+    variant_of: Optional[str] = None
+    # An identical copy: not parsed, its task takes the material of variant_of
+    linked: bool = False
+
+
+class BatchIngestWriter:
+    """
+    Writes prepared files in one transaction per batch_size files or flush_ms
+    milliseconds, whichever comes first.
+
+    Files seen for the first time are written with bulk inserts. Documents,
+    materials and parts are resolved from the processor's per-cycle SyncLookups
+    when a cycle is running, and otherwise with one query per table per batch;
+    rows created by the batch are mapped in memory from INSERT ... RETURNING.
+    Files that are already attached (edited in place) are rare and go through
+    SyncProcessor.apply; the cached renditions of their previous content are
+    dropped after the batch commits. Variants and identical copies are attached
+    and get their task, but the part library row stays with the file they were
+    linked to.
+
+    With dry_run every batch is written and then rolled back, so a trial sync
+    costs the same queries as a real one but leaves the database as it was.
+    """
+
+    def __init__(self, processor: SyncProcessor, source_type: str, batch_size: int = 200,
+                 flush_ms: int = 500, metrics: Optional[SyncMetrics] = None,
+                 write_lock: Optional[threading.Lock] = None, progress: Optional[IngestProgress] = None,
+                 dry_run: bool = False):
+        self.processor = processor
+        self.dry_run = dry_run
+        self.metrics = metrics
+        # When set, each batch also stores its manifest rows and checkpoint
+        self.progress = progress
+        # Shared by writers running at the same time; they also share the cycle lookups
+        self.write_lock = write_lock or threading.Lock()
+        self.source_type = source_type
+        self.batch_size = max(1, batch_size)
+        self.flush_ms = flush_ms
+        self.records: List[dict] = []
+        self.failed = 0
+        self.batches = 0
+        self._pending: List[Tuple[IngestItem, PreparedFile]] = []
+        self._deadline = 0.0
+
+    def run(self, buffer: queue.Queue):
+        """Consumes (item, prepared) pairs from buffer until DONE, then flushes."""
+        while True:
+            timeout = max(0.0, self._deadline - time.monotonic()) if self._pending else None
+            try:
+                entry = buffer.get(timeout=timeout)
+            except queue.Empty:
+                self.flush()
+                continue
+            if entry is DONE:
+                break
+            self.add(*entry)
+        self.flush()
+
+    def add(self, item: IngestItem, prepared: PreparedFile):
+        if prepared.error:
+            logger.error(f"Sync error for {item.path}: {prepared.error}")
+            self._failed(item)
+            return
+        if not self._pending:
+            self._deadline = time.monotonic() + self.flush_ms / 1000.0
+        self._pending.append((item, prepared))
+        if len(self._pending) >= self.batch_size or time.monotonic() >= self._deadline:
+            self.flush()
+
+    def flush(self):
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            self._commit(batch)
+        except Exception as e:
+            # One bad file must not cost the whole batch; retry the files one by one
+            logger.warning(f"Batch of {len(batch)} files failed ({e}); retrying individually")
+            for item, prepared in batch:
+                try:
+                    self._commit([(item, prepared)])
+                except Exception as e:
+                    logger.error(f"Sync error for {item.path}: {e}")
+                    self._failed(item)
+
+    def _failed(self, item: IngestItem):
+        self.failed += 1
+        if self.progress is not None:
+            self.progress.failed(item.path)
+        if self.metrics is not None:
+            self.metrics.add(failed=1)
+
+    def _commit(self, batch: List[Tuple[IngestItem, PreparedFile]]):
+        with self.write_lock:
+            self._commit_locked(batch)
+
+    def _commit_locked(self, batch: List[Tuple[IngestItem, PreparedFile]]):
+        started = time.perf_counter()
+        lookups = self.processor.lookups
+        records = [
+            {"path": item.path, "size": item.size, "mtime_ns": item.mtime_ns, "content_hash": prepared.digest,
+             "variant_of": item.variant_of}
+            for item, prepared in batch
+        ]
+        # Renditions of the previous content of edited files, dropped once the batch is committed
+        stale = []
+        db = self.processor.db_session_factory()
+        try:
+            attached = set()
+            for chunk in chunked([item.path for item, _ in batch]):
+                attached.update(p for (p,) in db.query(AttachmentDB.file_path).filter(
+                    AttachmentDB.file_path.in_(chunk)
+                ).all())
+
+            fresh = []
+            for item, prepared in batch:
+                if item.path in attached:
+                    renditions = self.processor.apply(db, prepared, self.source_type, item.doc_name,
+                                                      item.previous_hash)
+                    if renditions is not None:
+                        stale.append(renditions)
+                else:
+                    fresh.append((item, prepared))
+            if fresh:
+                self._insert_fresh(db, fresh, lookups)
+            if self.progress is not None:
+                self.progress.stage(db, records)
+            if self.dry_run:
+                db.rollback()
+                if lookups is not None:
+                    lookups.rollback()
+            else:
+                db.commit()
+                if lookups is not None:
+                    lookups.commit()
+        except Exception:
+            db.rollback()
+            if lookups is not None:
+                lookups.rollback()
+            raise
+        finally:
+            db.close()
+
+        if not self.dry_run:
+            self.processor.drop_stale(stale)
+        self.batches += 1
+        if self.progress is not None:
+            self.progress.committed(records)
+        if self.metrics is not None:
+            self.metrics.stage("write", time.perf_counter() - started, len(batch))
+            self.metrics.add(written=len(batch))
+        self.records.extend(records)
+
+    def _insert_fresh(self, db: Session, fresh: List[Tuple[IngestItem, PreparedFile]],
+                      lookups: Optional[SyncLookups]):
+        names = [os.path.basename(item.path) for item, _ in fresh]
+        doc_keys = [document_identity(name, self.source_type, item.doc_name) for (item, _), name in zip(fresh, names)]
+        doc_ids = self._document_ids(db, set(doc_keys), lookups)
+        material_ids = self._material_ids(db, {p.sheet.material or "Unknown" for _, p in fresh if p.sheet}, lookups)
+
+        db.execute(insert(AttachmentDB), [
+            {"document_id": doc_ids[key], "file_path": item.path, "filename": name, "media_type": "application/x-gnc"}
+            for (item, _), name, key in zip(fresh, names, doc_keys)
+        ])
+
+        sheets = [
+            (item, LibraryFile(item.path, name, doc_ids[key], material_ids.get(prepared.sheet.material or "Unknown"),
+                               prepared.sheet, prepared.geometry_hash, prepared.bounds))
+            for (item, prepared), name, key in zip(fresh, names, doc_keys) if prepared.sheet
+        ]
+        if sheets:
+            # A machine-edited variant belongs to its base file's part
+            parts = [f for item, f in sheets if not item.variant_of]
+            if parts:
+                upsert_parts(db, parts, lookups)
+            upsert_tasks(db, [f for _, f in sheets])
+
+        linked = [(item, prepared, name, doc_ids[key]) for (item, prepared), name, key in zip(fresh, names, doc_keys)
+                  if item.linked]
+        if linked:
+            self._link_copies(db, linked)
+
+    def _link_copies(self, db: Session, linked: list):
+        """Gives identical copies the task their original got when it was parsed, if it got one."""
+        materials = {}
+        for chunk in chunked(sorted({item.variant_of for item, _, _, _ in linked})):
+            rows = db.query(TaskDB.gnc_file_path, TaskDB.material_id).filter(
+                TaskDB.gnc_file_path.in_(chunk)
+            ).order_by(TaskDB.id).all()
+            for path, material_id in rows:
+                materials.setdefault(path, material_id)
+        tasks = [
+            LibraryFile(item.path, name, doc_id, materials[item.variant_of])
+            for item, _, name, doc_id in linked if item.variant_of in materials
+        ]
+        if tasks:
+            upsert_tasks(db, tasks)
+
+    def _document_ids(self, db: Session, keys: set, lookups: Optional[SyncLookups]) -> Dict[Tuple[str, str], int]:
+        ids = {}
+        if lookups is not None:
+            ids.update((key, lookups.documents[key]) for key in keys if key in lookups.documents)
+        else:
+            for chunk in chunked(sorted({name for name, _ in keys})):
+                rows = db.query(DocumentDB.id, DocumentDB.name, DocumentDB.type).filter(
+                    DocumentDB.name.in_(chunk)
+                ).order_by(DocumentDB.id).all()
+                for doc_id, name, doc_type in rows:
+                    ids.setdefault((name, doc_type), doc_id)
+        missing = [key for key in sorted(keys) if key not in ids]
+        if missing:
+            rows = db.execute(insert(DocumentDB).returning(DocumentDB.id, DocumentDB.name, DocumentDB.type), [
+                new_document_row(name, doc_type, self.source_type) for name, doc_type in missing
+            ])
+            for doc_id, name, doc_type in rows:
+                ids[(name, doc_type)] = doc_id
+                if lookups is not None:
+                    lookups.set_document((name, doc_type), doc_id)
+        return ids
+
+    def _material_ids(self, db: Session, names: set, lookups: Optional[SyncLookups]) -> Dict[str, int]:
+        ids = {}
+        if lookups is not None:
+            ids.update((name, lookups.materials[name]) for name in names if name in lookups.materials)
+        else:
+            for chunk in chunked(sorted(names)):
+                ids.update(db.query(MaterialDB.name, MaterialDB.id).filter(MaterialDB.name.in_(chunk)).all())
+        missing = [name for name in sorted(names) if name not in ids and name != "Unknown"]
+        if missing:
+            rows = db.execute(insert(MaterialDB).returning(MaterialDB.name, MaterialDB.id),
+                              [{"name": name} for name in missing])
+            for name, material_id in rows:
+                ids[name] = material_id
+                if lookups is not None:
+                    lookups.set_material(name, material_id)
+        return ids
@@ -0,0 +1,230 @@
+import os
+import sys
+import time
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from src.infrastructure.parsers.gnc_parser import GNCParser
+from src.infrastructure.parsers.parse_cache import parse_cache
+from src.infrastructure.graphics.geometry import Geometry, compile_sheet, geometry_hash
+from src.infrastructure.graphics.thumbnail_cache import ThumbnailCache
+from src.infrastructure.graphics.thumbnail_batch import ThumbnailBatchRenderer, BatchReport, render_thumbnail
+from src.infrastructure.graphics.sprite_atlas import atlas_fingerprint, grid_layout, svg_atlas, png_atlas
+from src.infrastructure.database.models import PartDB
+from src.domain.models import Part
+
+logger = logging.getLogger(__name__)
+
+# backend/src/application/services -> project root
+_ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", ".."))
+DEFAULT_THUMBNAIL_DIR = os.path.join(_ROOT_DIR, "static", "uploads", "thumbnails")
+DEFAULT_ATLAS_DIR = os.path.join(_ROOT_DIR, "static", "uploads", "atlases")
+ATLAS_URL_PREFIX = "/uploads/atlases"
+
+
+def _compile_file(path: str) -> Tuple[str, Optional[str], Optional[Geometry], Optional[str]]:
+    """Worker entry point: parse one GNC file. Returns (path, hash, geometry, error)."""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        geometry = compile_sheet(GNCParser().parse(content, filename=os.path.basename(path)))
+        return path, geometry_hash(geometry), geometry, None
+    except Exception as e:
+        return path, None, None, str(e)
+
+
+class ThumbnailService:
+    """Serves part thumbnails from the cache, rendering a missing format on first request."""
+
+    def __init__(self, cache: ThumbnailCache):
+        self.cache = cache
+
+    def get_thumbnail(self, part: Part, fmt: str = "svg") -> Optional[str]:
+        """Returns the path of the part's thumbnail in fmt, or None if it has no geometry."""
+        if part.geometry_hash and self.cache.exists(part.geometry_hash, fmt):
+            return self.cache.path_for(part.geometry_hash, fmt)
+
+        if not part.gnc_file_path or not os.path.exists(part.gnc_file_path):
+            return None
+        geometry = compile_sheet(parse_cache.get_sheet(part.gnc_file_path))
+        g_hash = geometry_hash(geometry)
+        if not g_hash:
+            return None
+        if not self.cache.exists(g_hash, fmt):
+            self.cache.store(g_hash, render_thumbnail(geometry, fmt), fmt)
+        return self.cache.path_for(g_hash, fmt)
+
+
+class ThumbnailAtlasService:
+    """
+    Packs the thumbnails of one page of parts into a single sprite atlas.
+    Atlases are stored under a fingerprint of the page's (part id, geometry hash)
+    pairs, so a repeated page query is served from disk and any geometry change
+    produces a new atlas.
+    """
+
+    def __init__(self, thumbnails: ThumbnailService, cache: ThumbnailCache, columns: int = 10):
+        self.thumbnails = thumbnails
+        self.cache = cache
+        self.columns = columns
+
+    def get_atlas(self, parts: List[Part], fmt: str = "svg", cell: int = 64) -> dict:
+        fingerprint = atlas_fingerprint([(p.id, p.geometry_hash) for p in parts], fmt, cell)
+        if not self.cache.exists(fingerprint, fmt):
+            self.cache.store(fingerprint, self._build(parts, fmt, cell), fmt)
+            self.cache.evict()
+
+        width, height, offsets = grid_layout(len(parts), cell, self.columns)
+        sprites = []
+        for part, (x, y) in zip(parts, offsets):
+            # Parts without a geometry hash have no sprite; clients fall back to their own thumbnail
+            placed = part.geometry_hash is not None
+            sprites.append({
+                "id": part.id,
+                "x": x if placed else None,
+                "y": y if placed else None,
+                "symbol": f"g-{part.geometry_hash}" if placed else None
+            })
+        return {
+            "fingerprint": fingerprint,
+            "url": f"{ATLAS_URL_PREFIX}/{fingerprint}.{fmt}",
+            "format": fmt,
+            "cell": cell,
+            "width": width,
+            "height": height,
+            "sprites": sprites
+        }
+
+    def _build(self, parts: List[Part], fmt: str, cell: int) -> bytes:
+        if fmt == "svg":
+            entries = [self._svg_entry(p) for p in parts]
+            return svg_atlas(entries, cell, self.columns).encode('utf-8')
+
+        from src.infrastructure.graphics.raster import RasterRenderer
+        renderer = RasterRenderer()
+        alphas = {}
+        for part in parts:
+            if part.geometry_hash and part.geometry_hash not in alphas:
+                alphas[part.geometry_hash] = self._alpha(renderer, part, cell)
+        return png_atlas([alphas.get(p.geometry_hash) for p in parts], cell, self.columns, renderer.color)
+
+    def _svg_entry(self, part: Part):
+        if not part.geometry_hash:
+            return None
+        try:
+            path = self.thumbnails.get_thumbnail(part, "svg")
+            if not path:
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                return f"g-{part.geometry_hash}", f.read()
+        except Exception as e:
+            logger.warning(f"No atlas thumbnail for part {part.id}: {e}")
+            return None
+
+    def _alpha(self, renderer, part: Part, cell: int):
+        if not part.gnc_file_path or not os.path.exists(part.gnc_file_path):
+            return None
+        try:
+            geometry = compile_sheet(parse_cache.get_sheet(part.gnc_file_path))
+            return renderer.render_alpha(geometry, cell, cell)
+        except Exception as e:
+            logger.warning(f"No atlas thumbnail for part {part.id}: {e}")
+            return None
+
+
+class ThumbnailBackfillService:
+    """
+    Fills in geometry hashes and thumbnails for parts that are already in the database,
+    e.g. after mounting an existing share or upgrading from name-based thumbnails.
+    """
+
+    def __init__(self, db_session_factory, cache: ThumbnailCache, workers: Optional[int] = None):
+        self.db_session_factory = db_session_factory
+        self.cache = cache
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.renderer = ThumbnailBatchRenderer(cache, workers=self.workers)
+
+    def run(self, only_missing: bool = True, fmt: str = "svg") -> BatchReport:
+        started = time.perf_counter()
+        db = self.db_session_factory()
+        try:
+            query = db.query(PartDB.id, PartDB.gnc_file_path).filter(PartDB.gnc_file_path.isnot(None))
+            if only_missing:
+                query = query.filter(PartDB.geometry_hash.is_(None))
+            rows = query.all()
+
+            parts_by_path = {}
+            for part_id, path in rows:
+                parts_by_path.setdefault(path, []).append(part_id)
+
+            paths = [p for p in parts_by_path if os.path.exists(p)]
+            failures = [(p, "File not found") for p in parts_by_path if not os.path.exists(p)]
+
+            # Phase 1: parse and compile in the pool
+            if self.workers <= 1:
+                compiled = list(map(_compile_file, paths))
+            else:
+                with ProcessPoolExecutor(max_workers=self.workers,
+                                         mp_context=multiprocessing.get_context("spawn")) as pool:
+                    compiled = list(pool.map(_compile_file, paths, chunksize=8))
+
+            jobs = []
+            updates = []
+            for path, g_hash, geometry, error in compiled:
+                if error:
+                    failures.append((path, error))
+                    continue
+                if not g_hash:
+                    continue
+                jobs.append((g_hash, geometry))
+                updates.extend({"id": part_id, "geometry_hash": g_hash} for part_id in parts_by_path[path])
+
+            # Phase 2: render from the compact geometry form
+            report = self.renderer.render(jobs, overwrite=not only_missing, fmt=fmt)
+            report.failed = failures + report.failed
+
+            if updates:
+                db.bulk_update_mappings(PartDB, updates)
+                db.commit()
+        finally:
+            db.close()
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill part thumbnails for an existing DocuFlow database.")
+    parser.add_argument("--db", help="Path to the SQLite database (defaults to the configured database)")
+    parser.add_argument("--thumbnail-dir", default=DEFAULT_THUMBNAIL_DIR)
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--all", action="store_true", help="Re-render every part, not only those without a thumbnail")
+    parser.add_argument("--format", choices=["svg", "png"], default="svg", help="Thumbnail format to render")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.infrastructure.config import get_db_url
+
+    db_url = f"sqlite:///{args.db}" if args.db else get_db_url()
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    service = ThumbnailBackfillService(session_factory, ThumbnailCache(args.thumbnail_dir), workers=args.workers)
+    report = service.run(only_missing=not args.all, fmt=args.format)
+
+    print(f"Rendered:  {report.rendered}")
+    print(f"Cached:    {report.skipped}")
+    print(f"Failed:    {len(report.failed)}")
+    print(f"Elapsed:   {report.elapsed:.2f}s ({report.rendered / report.elapsed if report.elapsed else 0:.1f} files/s)")
+    for key, error in report.failed[:20]:
+        print(f"  {key}: {error}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional
-from src.domain.models import Document, Part, Material, Task, Tag
+from src.domain.models import Document, DocumentSummary, Part, Material, Task, Tag
+from src.domain.pagination import Page
 
 class IDocumentRepository(ABC):
     @abstractmethod
@@ -11,6 +12,18 @@ class IDocumentRepository(ABC):
     def list(self, skip: int = 0, limit: int = 100) -> List[Document]:
         pass
 
+    @abstractmethod
+    def list_summaries(self, skip: int = 0, limit: int = 100) -> List[DocumentSummary]:
+        pass
+
+    @abstractmethod
+    def page(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        pass
+
+    @abstractmethod
+    def page_summaries(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        pass
+
     @abstractmethod
     def add(self, document: Document) -> Document:
         pass
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from src.domain.models import JournalEntry, Attachment
+from src.domain.pagination import Page
 from abc import ABC, abstractmethod
 
 class IJournalRepository(ABC):
@@ -11,6 +12,10 @@ class IJournalRepository(ABC):
     def list(self, skip: int = 0, limit: int = 100) -> List[JournalEntry]:
         pass
 
+    @abstractmethod
+    def page(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        pass
+
     @abstractmethod
     def add(self, entity: JournalEntry) -> JournalEntry:
         pass
@@ -1,5 +1,6 @@
 from typing import List, Optional
 from src.domain.models import Material, Part, StockItem, Reservation, Consumption
+from src.domain.pagination import Page
 from abc import ABC, abstractmethod
 
 class IMaterialRepository(ABC):
@@ -18,6 +19,8 @@ class IPartRepository(ABC):
     @abstractmethod
     def list(self, skip: int = 0, limit: int = 100, filters: dict = None) -> List[Part]: pass
     @abstractmethod
+    def page(self, cursor: Optional[str] = None, limit: int = 100, filters: dict = None) -> Page: pass
+    @abstractmethod
     def get_by_id(self, id: int) -> Optional[Part]: pass
     @abstractmethod
     def add(self, part: Part) -> Part: pass
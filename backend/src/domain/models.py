@@ -75,6 +75,8 @@ class Part(DomainModel):
     width: Optional[float] = 0.0
     height: Optional[float] = 0.0
     stats: Optional[str] = None
+    geometry_hash: Optional[str] = None
+    thumbnail_url: Optional[str] = None
 
 class StockItem(DomainModel):
     id: Optional[int] = None
@@ -130,3 +132,17 @@ class Document(DomainModel):
     attachments: List[Attachment] = []
     tasks: List[Task] = []
     journal_entries: List[JournalEntry] = []
+
+class DocumentSummary(DomainModel):
+    """A document as listed: its own columns without content, and counts instead of collections."""
+    id: int
+    name: str
+    description: Optional[str] = None
+    type: DocumentType = DocumentType.OTHER
+    status: DocumentStatus = DocumentStatus.IN_PROGRESS
+    registration_date: Optional[date] = None
+    author: Optional[str] = None
+    done_date: Optional[date] = None
+    attachment_count: int = 0
+    task_count: int = 0
+    open_journal_count: int = 0
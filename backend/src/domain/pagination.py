@@ -0,0 +1,11 @@
+from typing import List, NamedTuple, Optional
+
+
+class Page(NamedTuple):
+    items: List
+    # Opaque cursor of the page after this one; None on the last page
+    next_cursor: Optional[str]
+
+
+class InvalidCursor(ValueError):
+    """A cursor that was not issued for this listing, or was altered."""
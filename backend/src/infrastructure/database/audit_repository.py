@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
 from .models import AuditLogDB
+from .pagination import keyset_page
 
 class SQLAuditRepository:
     def __init__(self, db: Session):
@@ -16,3 +18,14 @@ class SQLAuditRepository:
         )
         self.db.add(log)
         self.db.commit()
+
+    def list(self, skip: int = 0, limit: int = 100) -> List[AuditLogDB]:
+        """Newest first."""
+        return self.db.query(AuditLogDB).order_by(
+            AuditLogDB.timestamp.desc(), AuditLogDB.id.desc()
+        ).offset(skip).limit(limit).all()
+
+    def page(self, cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[AuditLogDB], Optional[str]]:
+        """list, paged by (timestamp, id) with a cursor instead of an offset; returns the next page's cursor too."""
+        return keyset_page(self.db.query(AuditLogDB), [AuditLogDB.timestamp, AuditLogDB.id], cursor, limit,
+                           descending=True)
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from typing import Callable, Iterable, List, Optional, Set
+from .models import DirectoryStatsDB
+from .manifest_repository import chunked
+
+
+class SQLDirectoryStatsRepository:
+    """Per-directory scan and change counts under a sync root, with each directory's next due time."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record(self, root: str, scanned: Iterable[str], changed: Set[str],
+               next_interval: Callable[[Optional[float], bool], float], now: Optional[datetime] = None):
+        """
+        Counts a scan of each directory in scanned, and a change for those also in
+        changed. next_interval(previous_interval_sec, changed) sets when each is due again.
+        """
+        now = now or datetime.now()
+        scanned = sorted(set(scanned))
+        existing = {}
+        for chunk in chunked(scanned):
+            existing.update(
+                (row.path, row) for row in self.db.query(DirectoryStatsDB).filter(DirectoryStatsDB.path.in_(chunk)).all()
+            )
+        inserts = []
+        updates = []
+        for path in scanned:
+            row = existing.get(path)
+            was_changed = path in changed
+            interval = next_interval(row.interval_sec if row else None, was_changed)
+            values = {
+                "path": path,
+                "scans": (row.scans or 0) + 1 if row else 1,
+                "changes": ((row.changes or 0) if row else 0) + (1 if was_changed else 0),
+                "last_scanned_at": now,
+                "last_changed_at": now if was_changed else (row.last_changed_at if row else None),
+                "interval_sec": interval,
+                "next_due_at": now + timedelta(seconds=interval)
+            }
+            if row is None:
+                inserts.append(dict(values, root=root))
+            else:
+                updates.append(values)
+        if inserts:
+            self.db.bulk_insert_mappings(DirectoryStatsDB, inserts)
+        if updates:
+            self.db.bulk_update_mappings(DirectoryStatsDB, updates)
+        self.db.commit()
+
+    def forget(self, paths: Iterable[str]):
+        """Drops the statistics of directories that no longer exist."""
+        for chunk in chunked(sorted(set(paths))):
+            self.db.query(DirectoryStatsDB).filter(DirectoryStatsDB.path.in_(chunk)).delete(synchronize_session=False)
+        self.db.commit()
+
+    def known(self, root: str) -> Set[str]:
+        return {p for (p,) in self.db.query(DirectoryStatsDB.path).filter(DirectoryStatsDB.root == root).all()}
+
+    def due(self, root: str, now: Optional[datetime] = None) -> List[str]:
+        """Directories under root whose adaptive interval has elapsed."""
+        return [p for (p,) in self.db.query(DirectoryStatsDB.path).filter(
+            DirectoryStatsDB.root == root,
+            DirectoryStatsDB.next_due_at <= (now or datetime.now())
+        ).all()]
+
+    def list(self, root: str, limit: int = 100) -> List[dict]:
+        """The directories of root that are due soonest."""
+        rows = self.db.query(DirectoryStatsDB).filter(DirectoryStatsDB.root == root).order_by(
+            DirectoryStatsDB.next_due_at
+        ).limit(limit).all()
+        return [
+            {
+                "path": row.path,
+                "scans": row.scans,
+                "changes": row.changes,
+                "last_scanned_at": row.last_scanned_at.isoformat(timespec="seconds") if row.last_scanned_at else None,
+                "last_changed_at": row.last_changed_at.isoformat(timespec="seconds") if row.last_changed_at else None,
+                "interval_sec": row.interval_sec,
+                "next_due_at": row.next_due_at.isoformat(timespec="seconds") if row.next_due_at else None
+            }
+            for row in rows
+        ]
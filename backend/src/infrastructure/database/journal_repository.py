@@ -2,6 +2,8 @@ from sqlalchemy.orm import Session, subqueryload
 from typing import List, Optional
 from src.domain.models import JournalEntry, Attachment
 from src.domain.journal_interface import IJournalRepository
+from src.domain.pagination import Page
+from .pagination import keyset_page
 from .models import JournalEntryDB, AttachmentDB
 
 class SQLJournalRepository(IJournalRepository):
@@ -31,9 +33,17 @@ class SQLJournalRepository(IJournalRepository):
         return self._to_domain(db_entry) if db_entry else None
 
     def list(self, skip: int = 0, limit: int = 100) -> List[JournalEntry]:
-        db_entries = self.db.query(JournalEntryDB).options(subqueryload(JournalEntryDB.attachments)).order_by(JournalEntryDB.created_at.desc()).offset(skip).limit(limit).all()
+        db_entries = self.db.query(JournalEntryDB).options(subqueryload(JournalEntryDB.attachments)).order_by(JournalEntryDB.created_at.desc(), JournalEntryDB.id.desc()).offset(skip).limit(limit).all()
         return [self._to_domain(e) for e in db_entries]
 
+    def page(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        """list, newest first, paged by (created_at, id) with a cursor instead of an offset."""
+        db_entries, next_cursor = keyset_page(
+            self.db.query(JournalEntryDB).options(subqueryload(JournalEntryDB.attachments)),
+            [JournalEntryDB.created_at, JournalEntryDB.id], cursor, limit, descending=True
+        )
+        return Page([self._to_domain(e) for e in db_entries], next_cursor)
+
     def add(self, entity: JournalEntry) -> JournalEntry:
         db_entry = JournalEntryDB(
             text=entity.text,
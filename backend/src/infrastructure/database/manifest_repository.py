@@ -0,0 +1,164 @@
+import json
+from datetime import datetime
+from sqlalchemy import update, bindparam
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from .models import FileManifestDB, SyncCheckpointDB
+
+# Stay well below SQLite's bound-parameter limit in IN (...) clauses
+_IN_CHUNK = 500
+
+
+class ManifestEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    content_hash: Optional[str]
+    missing: bool
+    variant_of: Optional[str] = None
+
+
+class SQLFileManifestRepository:
+    """Bulk access to the sync file manifest. Every method touches a whole root at once."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load(self, root: str) -> Dict[str, ManifestEntry]:
+        """Returns {path: ManifestEntry} for every known file under root, in one query."""
+        rows = self.db.query(
+            FileManifestDB.path, FileManifestDB.size, FileManifestDB.mtime_ns,
+            FileManifestDB.content_hash, FileManifestDB.missing_since, FileManifestDB.variant_of
+        ).filter(FileManifestDB.root == root).all()
+        return {
+            path: ManifestEntry(size, mtime_ns, content_hash, missing_since is not None, variant_of)
+            for path, size, mtime_ns, content_hash, missing_since, variant_of in rows
+        }
+
+    def load_digests(self) -> Dict[str, str]:
+        """
+        Returns {content_hash: path} of the files whose content was parsed, across all
+        roots, in one query; identical copies found later are linked to these paths.
+        """
+        rows = self.db.query(FileManifestDB.content_hash, FileManifestDB.path).filter(
+            FileManifestDB.content_hash.isnot(None),
+            FileManifestDB.variant_of.is_(None),
+            FileManifestDB.missing_since.is_(None)
+        ).order_by(FileManifestDB.path).all()
+        digests = {}
+        for content_hash, path in rows:
+            digests.setdefault(content_hash, path)
+        return digests
+
+    def save(self, root: str, records: List[dict], known: Iterable[str], cycle: int):
+        """
+        Inserts or updates manifest rows for files that were just processed.
+        records are dicts with path, size, mtime_ns, content_hash and variant_of; known is the set
+        of paths already in the manifest (from load), so no lookups are needed.
+        """
+        self.stage(root, records, known, cycle)
+        self.db.commit()
+
+    def stage(self, root: str, records: List[dict], known: Iterable[str], cycle: int):
+        """save without the commit, to store manifest rows in the caller's transaction."""
+        known = known if isinstance(known, (set, frozenset, dict)) else set(known)
+        inserts = []
+        updates = []
+        for record in records:
+            row = dict(record, root=root, last_seen_cycle=cycle, missing_since=None)
+            (updates if record["path"] in known else inserts).append(row)
+        if inserts:
+            self.db.bulk_insert_mappings(FileManifestDB, inserts)
+        if updates:
+            self.db.bulk_update_mappings(FileManifestDB, updates)
+
+    def mark_seen(self, root: str, cycle: int, seen: List[str], missing: List[str]):
+        """
+        Stamps every file listed this cycle with the cycle number.
+        When few files went missing (the usual case) this is a single UPDATE over the
+        root; otherwise the seen paths are stamped with one executemany.
+        """
+        if len(missing) <= _IN_CHUNK:
+            stmt = update(FileManifestDB).where(FileManifestDB.root == root)
+            if missing:
+                stmt = stmt.where(FileManifestDB.path.notin_(missing))
+            self.db.execute(stmt.values(last_seen_cycle=cycle))
+        elif seen:
+            stmt = update(FileManifestDB.__table__).where(
+                FileManifestDB.__table__.c.path == bindparam("seen_path")
+            ).values(last_seen_cycle=cycle)
+            self.db.execute(stmt, [{"seen_path": p} for p in seen])
+        self.db.commit()
+
+    def find_unseen(self, root: str, cycle: int) -> List[str]:
+        """Paths under root that were not stamped in this cycle and are not tombstoned yet."""
+        return [p for (p,) in self.db.query(FileManifestDB.path).filter(
+            FileManifestDB.root == root,
+            FileManifestDB.last_seen_cycle < cycle,
+            FileManifestDB.missing_since.is_(None)
+        ).all()]
+
+    def mark_missing(self, paths: List[str]):
+        now = datetime.now()
+        for chunk in chunked(paths):
+            self.db.execute(update(FileManifestDB).where(FileManifestDB.path.in_(chunk)).values(missing_since=now))
+        self.db.commit()
+
+
+class SQLSyncCheckpointRepository:
+    """Checkpoints of unfinished full scans, one row per sync root."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list(self) -> List[dict]:
+        return [self._to_dict(row) for row in self.db.query(SyncCheckpointDB).order_by(SyncCheckpointDB.root).all()]
+
+    def begin(self, root: str, source_type: str, cycle: int) -> Optional[dict]:
+        """
+        Opens the checkpoint for a scan of root. Returns the previous checkpoint when
+        an earlier scan of root never finished (the server stopped mid-scan), else None.
+        """
+        row = self.db.query(SyncCheckpointDB).filter(SyncCheckpointDB.root == root).first()
+        previous = self._to_dict(row) if row else None
+        now = datetime.now()
+        if row is None:
+            row = SyncCheckpointDB(root=root, started_at=now, files_written=0, resumes=0)
+            self.db.add(row)
+        else:
+            row.resumes = (row.resumes or 0) + 1
+        row.source_type = source_type
+        row.cycle = cycle
+        row.updated_at = now
+        self.db.commit()
+        return previous
+
+    def advance(self, root: str, written: int, directory: Optional[str], in_flight: List[str]):
+        """Records a stored batch; runs in the batch's own transaction, so it is committed with it."""
+        self.db.execute(update(SyncCheckpointDB).where(SyncCheckpointDB.root == root).values(
+            files_written=SyncCheckpointDB.files_written + written,
+            directory=directory,
+            in_flight=json.dumps(in_flight),
+            updated_at=datetime.now()
+        ))
+
+    def finish(self, root: str):
+        self.db.query(SyncCheckpointDB).filter(SyncCheckpointDB.root == root).delete()
+        self.db.commit()
+
+    def _to_dict(self, row: SyncCheckpointDB) -> dict:
+        return {
+            "root": row.root,
+            "source_type": row.source_type,
+            "cycle": row.cycle,
+            "started_at": row.started_at.isoformat(timespec="seconds") if row.started_at else None,
+            "updated_at": row.updated_at.isoformat(timespec="seconds") if row.updated_at else None,
+            "files_written": row.files_written or 0,
+            "directory": row.directory,
+            "in_flight": json.loads(row.in_flight) if row.in_flight else [],
+            "resumes": row.resumes or 0
+        }
+
+
+def chunked(items: List[str], size: int = _IN_CHUNK) -> Iterable[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
@@ -2,6 +2,9 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from src.domain.models import Material, Part, StockItem, Reservation, Consumption
 from src.domain.material_interface import IMaterialRepository, IPartRepository, IStockRepository
+from src.domain.pagination import Page
+from .pagination import keyset_page
+from src.infrastructure.graphics.thumbnail_cache import thumbnail_url
 from .models import MaterialDB, PartDB, StockItemDB, ReservationDB, ConsumptionDB
 
 class SQLMaterialRepository(IMaterialRepository):
@@ -51,10 +54,21 @@ class SQLPartRepository(IPartRepository):
             gnc_file_path=db_p.gnc_file_path,
             width=db_p.width or 0.0,
             height=db_p.height or 0.0,
-            stats=db_p.stats
+            stats=db_p.stats,
+            geometry_hash=db_p.geometry_hash,
+            thumbnail_url=thumbnail_url(db_p.geometry_hash)
         )
 
     def list(self, skip: int = 0, limit: int = 100, filters: dict = None) -> List[Part]:
+        db_parts = self._filtered(filters).order_by(PartDB.id).offset(skip).limit(limit).all()
+        return [self._to_domain(p) for p in db_parts]
+
+    def page(self, cursor: Optional[str] = None, limit: int = 100, filters: dict = None) -> Page:
+        """list, paged by id with a cursor instead of an offset."""
+        db_parts, next_cursor = keyset_page(self._filtered(filters), [PartDB.id], cursor, limit)
+        return Page([self._to_domain(p) for p in db_parts], next_cursor)
+
+    def _filtered(self, filters: Optional[dict]):
         query = self.db.query(PartDB)
         if filters:
             if filters.get("search"):
@@ -70,9 +84,7 @@ class SQLPartRepository(IPartRepository):
                 query = query.filter(PartDB.height >= float(filters["min_height"]))
             if filters.get("max_height"):
                 query = query.filter(PartDB.height <= float(filters["max_height"]))
-        
-        db_parts = query.offset(skip).limit(limit).all()
-        return [self._to_domain(p) for p in db_parts]
+        return query
 
     def get_by_id(self, id: int) -> Optional[Part]:
         db_p = self.db.query(PartDB).filter(PartDB.id == id).first()
@@ -87,7 +99,8 @@ class SQLPartRepository(IPartRepository):
             gnc_file_path=part.gnc_file_path,
             width=part.width,
             height=part.height,
-            stats=part.stats
+            stats=part.stats,
+            geometry_hash=part.geometry_hash
         )
         self.db.add(db_p)
         self.db.commit()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Enum, Text, ForeignKey, Table, Float, DateTime, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Date, Enum, Text, ForeignKey, Table, Float, DateTime, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import date, datetime
@@ -86,6 +86,7 @@ class PartDB(Base):
     width = Column(Float, default=0.0)
     height = Column(Float, default=0.0)
     stats = Column(Text, nullable=True)
+    geometry_hash = Column(String, nullable=True, index=True)
 
     material = relationship("MaterialDB", back_populates="parts")
 class SettingDB(Base):
@@ -151,6 +152,51 @@ class AssigneeDB(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
 
+class FileManifestDB(Base):
+    """Last known state of every GNC file under a sync root, used to skip unchanged files."""
+    __tablename__ = "file_manifest"
+    path = Column(String, primary_key=True)
+    root = Column(String, index=True)
+    size = Column(BigInteger)
+    mtime_ns = Column(BigInteger)
+    content_hash = Column(String, nullable=True, index=True)
+    last_seen_cycle = Column(Integer, default=0, index=True)
+    # Set when a scan no longer finds the file; cleared if it reappears
+    missing_since = Column(DateTime, nullable=True)
+    # The base file of an _801 variant, or the file an identical copy was linked to
+    variant_of = Column(String, nullable=True)
+
+class SyncCheckpointDB(Base):
+    """Progress of the full scan of a sync root; the row exists only while the scan is unfinished."""
+    __tablename__ = "sync_checkpoints"
+    root = Column(String, primary_key=True)
+    source_type = Column(String)
+    cycle = Column(Integer)
+    started_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now)
+    # Files stored so far, counted across resumed attempts
+    files_written = Column(Integer, default=0)
+    # Last directory whose files had all entered the pipeline
+    directory = Column(String, nullable=True)
+    # JSON list of files dispatched but not yet stored at the last checkpoint
+    in_flight = Column(Text, nullable=True)
+    # How many times the scan was picked up again after an interruption
+    resumes = Column(Integer, default=0)
+
+class DirectoryStatsDB(Base):
+    """Observed change rate of a directory under a sync root, for adaptive rescans."""
+    __tablename__ = "directory_stats"
+    path = Column(String, primary_key=True)
+    root = Column(String, index=True)
+    scans = Column(Integer, default=0)
+    # Scans that found new, modified or deleted files
+    changes = Column(Integer, default=0)
+    last_scanned_at = Column(DateTime, nullable=True)
+    last_changed_at = Column(DateTime, nullable=True)
+    # Current adaptive rescan interval
+    interval_sec = Column(Float)
+    next_due_at = Column(DateTime, index=True)
+
 class FilterPresetDB(Base):
     __tablename__ = "filter_presets"
     id = Column(Integer, primary_key=True, index=True)
@@ -0,0 +1,64 @@
+import json
+import base64
+import binascii
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+from src.domain.pagination import InvalidCursor
+
+
+def keyset_page(query: Query, keys: Sequence, cursor: Optional[str], limit: int,
+                descending: bool = False) -> Tuple[list, Optional[str]]:
+    """
+    Fetches the page of query after cursor, ordered by keys (unique together,
+    e.g. (created_at, id)). Instead of skipping rows with OFFSET, the page starts
+    with a WHERE (keys) > (cursor values) seek on the sort index, so page 1000
+    costs as much as page 1. Returns the rows and the cursor of the next page,
+    None on the last one. Rows whose key is NULL are never reached by a cursor.
+    """
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        if len(keys) == 1:
+            bound = keys[0] < values[0] if descending else keys[0] > values[0]
+        else:
+            bound = tuple_(*keys) < tuple_(*values) if descending else tuple_(*keys) > tuple_(*values)
+        query = query.filter(bound)
+    query = query.order_by(*[key.desc() if descending else key.asc() for key in keys])
+    limit = max(0, limit)
+    # One row more than asked tells whether another page follows
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit or not limit:
+        return rows[:limit], None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], key.key) for key in keys])
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else v for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence) -> List[Any]:
+    """The key values in cursor, typed like the key columns. Raises InvalidCursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("wrong number of keys")
+        return [_typed(value, key) for value, key in zip(values, keys)]
+    except (ValueError, TypeError, binascii.Error) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def _typed(value: Any, key) -> Any:
+    python_type = key.type.python_type
+    if value is None:
+        return None
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is int and not isinstance(value, int):
+        raise ValueError(f"{key.key} must be an integer")
+    return value
@@ -1,11 +1,32 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from sqlalchemy.orm import Session, selectinload, joinedload
+from sqlalchemy import func, desc, select, or_
 import json
 from typing import List, Optional
-from src.domain.models import Document, Tag, Attachment, Task, Part, DocumentType, DocumentStatus, TaskStatus, FilterPreset
+from src.domain.models import (
+    Document, DocumentSummary, Tag, Attachment, Task, Part, Material, JournalEntry, DocumentType, DocumentStatus,
+    TaskStatus, JournalEntryStatus, FilterPreset
+)
 from src.domain.interfaces import IDocumentRepository, ITaskRepository
+from src.domain.pagination import Page
+from .pagination import keyset_page
 from .models import DocumentDB, TagDB, AttachmentDB, TaskDB, PartDB, MaterialDB, StockItemDB, JournalEntryDB, AuditLogDB, FilterPresetDB
 
+# Everything _to_domain walks. Collections are loaded with one SELECT ... IN per
+# relationship for all documents of a query, so listing 100 documents costs as
+# many statements as listing one; joins would multiply rows across collections.
+DOCUMENT_LOADERS = (
+    selectinload(DocumentDB.tags),
+    selectinload(DocumentDB.attachments),
+    selectinload(DocumentDB.tasks).selectinload(TaskDB.parts),
+    selectinload(DocumentDB.journal_entries).selectinload(JournalEntryDB.attachments),
+)
+
+# A task's material is a single row, joined in; its parts are a collection
+TASK_LOADERS = (
+    joinedload(TaskDB.material),
+    selectinload(TaskDB.parts),
+)
+
 class SQLDocumentRepository(IDocumentRepository):
     def __init__(self, db: Session):
         self.db = db
@@ -61,13 +82,68 @@ class SQLDocumentRepository(IDocumentRepository):
         )
 
     def get_by_id(self, document_id: int) -> Optional[Document]:
-        db_doc = self.db.query(DocumentDB).filter(DocumentDB.id == document_id).first()
+        db_doc = self.db.query(DocumentDB).options(*DOCUMENT_LOADERS).filter(DocumentDB.id == document_id).first()
         return self._to_domain(db_doc) if db_doc else None
 
     def list(self, skip: int = 0, limit: int = 100) -> List[Document]:
-        db_docs = self.db.query(DocumentDB).offset(skip).limit(limit).all()
+        db_docs = self.db.query(DocumentDB).options(*DOCUMENT_LOADERS).order_by(DocumentDB.id).offset(skip).limit(limit).all()
         return [self._to_domain(d) for d in db_docs]
 
+    def page(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        """list, paged by id with a cursor instead of an offset."""
+        db_docs, next_cursor = keyset_page(
+            self.db.query(DocumentDB).options(*DOCUMENT_LOADERS), [DocumentDB.id], cursor, limit
+        )
+        return Page([self._to_domain(d) for d in db_docs], next_cursor)
+
+    def list_summaries(self, skip: int = 0, limit: int = 100) -> List[DocumentSummary]:
+        """
+        Lists documents for overviews in a single statement: the list columns and
+        per-document counts from correlated subqueries. content (whole nesting
+        projects) and the related rows are only loaded by get_by_id.
+        """
+        rows = self._summary_query().order_by(DocumentDB.id).offset(skip).limit(limit).all()
+        return [self._to_summary(row) for row in rows]
+
+    def page_summaries(self, cursor: Optional[str] = None, limit: int = 100) -> Page:
+        rows, next_cursor = keyset_page(self._summary_query(), [DocumentDB.id], cursor, limit)
+        return Page([self._to_summary(row) for row in rows], next_cursor)
+
+    def _summary_query(self):
+        attachment_count = select(func.count(AttachmentDB.id)).where(
+            AttachmentDB.document_id == DocumentDB.id
+        ).correlate(DocumentDB).scalar_subquery()
+        task_count = select(func.count(TaskDB.id)).where(
+            TaskDB.document_id == DocumentDB.id
+        ).correlate(DocumentDB).scalar_subquery()
+        # Entries without a status count as pending, as in _to_domain
+        open_journal_count = select(func.count(JournalEntryDB.id)).where(
+            JournalEntryDB.document_id == DocumentDB.id,
+            or_(JournalEntryDB.status.is_(None), func.lower(JournalEntryDB.status) == JournalEntryStatus.PENDING.value)
+        ).correlate(DocumentDB).scalar_subquery()
+
+        return self.db.query(
+            DocumentDB.id, DocumentDB.name, DocumentDB.description, DocumentDB.type, DocumentDB.status,
+            DocumentDB.registration_date, DocumentDB.author, DocumentDB.done_date,
+            attachment_count.label("attachment_count"), task_count.label("task_count"),
+            open_journal_count.label("open_journal_count")
+        )
+
+    def _to_summary(self, row) -> DocumentSummary:
+        return DocumentSummary(
+            id=row.id,
+            name=row.name,
+            description=row.description,
+            type=row.type.lower() if row.type else DocumentType.OTHER,
+            status=row.status.lower() if row.status else DocumentStatus.IN_PROGRESS,
+            registration_date=row.registration_date,
+            author=row.author,
+            done_date=row.done_date,
+            attachment_count=row.attachment_count,
+            task_count=row.task_count,
+            open_journal_count=row.open_journal_count
+        )
+
     def add(self, document: Document) -> Document:
         db_doc = DocumentDB(
             name=document.name,
@@ -98,8 +174,7 @@ class SQLDocumentRepository(IDocumentRepository):
         db_doc.done_date = document.done_date
         
         self.db.commit()
-        self.db.refresh(db_doc)
-        return self._to_domain(db_doc)
+        return self.get_by_id(db_doc.id)
 
     def delete(self, document_id: int) -> bool:
         db_doc = self.db.query(DocumentDB).filter(DocumentDB.id == document_id).first()
@@ -205,8 +280,7 @@ class SQLDocumentRepository(IDocumentRepository):
             self.db.add(db_task)
             
         self.db.commit()
-        self.db.refresh(db_doc)
-        return self._to_domain(db_doc)
+        return self.get_by_id(db_doc.id)
 
     def list_tags(self) -> List[Tag]:
         db_tags = self.db.query(TagDB).all()
@@ -241,11 +315,11 @@ class SQLTaskRepository(ITaskRepository):
         )
 
     def get_by_id(self, task_id: int) -> Optional[Task]:
-        db_task = self.db.query(TaskDB).filter(TaskDB.id == task_id).first()
+        db_task = self.db.query(TaskDB).options(*TASK_LOADERS).filter(TaskDB.id == task_id).first()
         return self._to_domain(db_task) if db_task else None
 
     def list(self, skip: int = 0, limit: int = 100, filters: dict = None) -> List[Task]:
-        query = self.db.query(TaskDB)
+        query = self.db.query(TaskDB).options(*TASK_LOADERS)
         if filters:
             if filters.get("assignee"):
                 query = query.filter(TaskDB.assignee.ilike(f"%{filters['assignee']}%"))
@@ -292,7 +366,7 @@ class SQLTaskRepository(ITaskRepository):
         return False
 
     def get_tasks_by_document_id(self, document_id: int) -> List[Task]:
-        db_tasks = self.db.query(TaskDB).filter(TaskDB.document_id == document_id).all()
+        db_tasks = self.db.query(TaskDB).options(*TASK_LOADERS).filter(TaskDB.document_id == document_id).all()
         return [self._to_domain(t) for t in db_tasks]
 
 class SQLFilterPresetRepository:
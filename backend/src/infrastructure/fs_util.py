@@ -0,0 +1,26 @@
+import os
+import tempfile
+
+
+def atomic_write(path: str, data: bytes):
+    """
+    Writes bytes to path atomically.
+    The data goes to a temp file in the target directory which is then renamed
+    over the destination, so readers on the share never see a half-written file.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=f"-{os.path.basename(path)}", dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,207 @@
+import hashlib
+import math
+from typing import List, Tuple, Optional
+from ..parsers.gnc_parser import GNCPart, GNCSheet
+
+# Compact geometry form: a list of contours, each a list of plain tuples
+#   ("M", x, y)                  move to
+#   ("L", x, y)                  line to
+#   ("A", x, y, cx, cy, cw)      arc to (x, y) around (cx, cy), cw=True for G02
+# It is cheap to pickle, so it can be shipped to worker processes.
+Segment = tuple
+Geometry = List[List[Segment]]
+
+
+def _is_move(cmd) -> bool:
+    return cmd.type == "G00" or (cmd.command == "G" and cmd.value == 0)
+
+def _is_line(cmd) -> bool:
+    return (cmd.type == "G01" or (cmd.command == "G" and cmd.value == 1) or
+            cmd.type == "MODAL" or cmd.type == "G41" or cmd.type == "G40")
+
+def _is_arc(cmd) -> bool:
+    return cmd.type == "G02" or cmd.type == "G03" or (cmd.command == "G" and cmd.value in [2, 3])
+
+
+def compile_part(part: GNCPart) -> Geometry:
+    """
+    Compiles the G-code commands of a part into the compact geometry form.
+    Follows the same interpretation as the GncCanvas renderer.
+    """
+    geometry = []
+    for contour in part.contours:
+        segments = []
+        current_x = None
+        current_y = None
+
+        for cmd in contour.commands:
+            prev_x = current_x
+            prev_y = current_y
+
+            if cmd.x is not None:
+                current_x = cmd.x
+            if cmd.y is not None:
+                current_y = cmd.y
+
+            if current_x is None or current_y is None:
+                continue
+
+            if not segments:
+                # Always move to the start of the contour
+                segments.append(("M", current_x, current_y))
+            elif _is_move(cmd):
+                segments.append(("M", current_x, current_y))
+            elif _is_line(cmd):
+                segments.append(("L", current_x, current_y))
+            elif _is_arc(cmd):
+                if prev_x is None or prev_y is None:
+                    continue
+                # I and J are relative to the start point
+                center_x = prev_x + (cmd.i if cmd.i is not None else 0.0)
+                center_y = prev_y + (cmd.j if cmd.j is not None else 0.0)
+                is_clockwise = cmd.type == "G02" or (cmd.command == "G" and cmd.value == 2)
+                segments.append(("A", current_x, current_y, center_x, center_y, is_clockwise))
+
+        if segments:
+            geometry.append(segments)
+    return geometry
+
+
+def compile_sheet(sheet: GNCSheet) -> Geometry:
+    """Compiles every part of a sheet into one geometry (absolute coordinates)."""
+    geometry = []
+    for part in sheet.parts:
+        geometry.extend(compile_part(part))
+    return geometry
+
+
+def geometry_bounds(geometry: Geometry) -> Optional[Tuple[float, float, float, float]]:
+    """Returns (min_x, min_y, max_x, max_y) of all vertices, or None if empty."""
+    xs = [seg[1] for contour in geometry for seg in contour]
+    ys = [seg[2] for contour in geometry for seg in contour]
+    if not xs:
+        return None
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def fit_transform(bounds: Tuple[float, float, float, float], width: int, height: int, padding: int = 10):
+    """
+    Returns (scale, tx, ty) that fit bounds centered into a width x height image.
+    Y is flipped, since image Y increases downward and GNC Y increases upward.
+    """
+    min_x, min_y, max_x, max_y = bounds
+    data_w = max_x - min_x
+    data_h = max_y - min_y
+
+    avail_w = width - padding * 2
+    avail_h = height - padding * 2
+    scale_x = avail_w / data_w if data_w > 0 else 1
+    scale_y = avail_h / data_h if data_h > 0 else 1
+    scale = min(scale_x, scale_y) * 0.95  # 0.95 safety factor
+
+    offset_x = (width - data_w * scale) / 2
+    offset_y = (height - data_h * scale) / 2
+
+    def tx(x: float) -> float:
+        return offset_x + (x - min_x) * scale
+
+    def ty(y: float) -> float:
+        return height - (offset_y + (y - min_y) * scale)
+
+    return scale, tx, ty
+
+
+def geometry_hash(geometry: Geometry) -> Optional[str]:
+    """
+    Content hash of a geometry, independent of where the part sits on the sheet.
+    Coordinates are normalised to the bounding box origin and rounded to 1 micron,
+    so byte-different programs that cut the same shape share one hash.
+    """
+    bounds = geometry_bounds(geometry)
+    if bounds is None:
+        return None
+    ox, oy = bounds[0], bounds[1]
+
+    def q(v: float) -> str:
+        # Adding 0.0 folds -0.0 into 0.0 so the text form is stable
+        return f"{round(v, 3) + 0.0:.3f}"
+
+    h = hashlib.sha1()
+    for contour in geometry:
+        h.update(b"C")
+        for seg in contour:
+            if seg[0] == "A":
+                h.update(f"A{q(seg[1] - ox)},{q(seg[2] - oy)},{q(seg[3] - ox)},{q(seg[4] - oy)},{int(seg[5])};".encode())
+            else:
+                h.update(f"{seg[0]}{q(seg[1] - ox)},{q(seg[2] - oy)};".encode())
+    return h.hexdigest()
+
+
+def _perpendicular_distance(p, a, b) -> float:
+    dx = b[0] - a[0]
+    dy = b[1] - a[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    return abs(dy * p[0] - dx * p[1] + b[0] * a[1] - b[1] * a[0]) / math.hypot(dx, dy)
+
+
+def douglas_peucker(points: List[Tuple[float, float]], tolerance: float) -> List[Tuple[float, float]]:
+    """Iterative Douglas-Peucker; the first and last points are always kept."""
+    if len(points) < 3:
+        return list(points)
+
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_dist = 0.0
+        index = start
+        for i in range(start + 1, end):
+            dist = _perpendicular_distance(points[i], points[start], points[end])
+            if dist > max_dist:
+                max_dist = dist
+                index = i
+        if max_dist > tolerance:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def simplify(geometry: Geometry, tolerance: float) -> Geometry:
+    """
+    Level-of-detail reduction of compiled geometry.
+    Runs of consecutive line vertices are simplified with Douglas-Peucker; moves and
+    arcs are kept as anchors, except arcs smaller than the tolerance which are
+    indistinguishable from their chord and are folded into the surrounding lines.
+    """
+    if tolerance <= 0:
+        return geometry
+
+    simplified = []
+    for contour in geometry:
+        out = []
+        run = []  # pending line vertices, starting at the last anchor point
+
+        def flush():
+            if len(run) > 1:
+                out.extend(("L", x, y) for x, y in douglas_peucker(run, tolerance)[1:])
+            run.clear()
+
+        for seg in contour:
+            kind, x, y = seg[0], seg[1], seg[2]
+            if kind == "A" and run:
+                radius = math.hypot(run[-1][0] - seg[3], run[-1][1] - seg[4])
+                if radius < tolerance:
+                    kind = "L"
+            if kind == "L" and run:
+                run.append((x, y))
+                continue
+
+            flush()
+            out.append(seg)
+            run.append((x, y))
+        flush()
+        simplified.append(out)
+    return simplified
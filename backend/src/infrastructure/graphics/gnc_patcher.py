@@ -0,0 +1,60 @@
+import difflib
+from typing import List, Tuple
+
+
+class GNCPatcher:
+    """
+    Computes a line-level patch between a GNC file on disk and freshly generated content.
+    Unchanged lines are copied byte-for-byte from the original, so the encoding and
+    line endings of untouched regions survive a save.
+    """
+
+    def _split(self, original: bytes) -> List[bytes]:
+        return original.splitlines(keepends=True)
+
+    def _generated_lines(self, generated: str) -> List[str]:
+        lines = generated.split("\n")
+        if generated.endswith("\n"):
+            lines.pop()
+        return lines
+
+    def _newline(self, original: bytes) -> bytes:
+        return b"\r\n" if b"\r\n" in original else b"\n"
+
+    def diff(self, original: bytes, generated: str) -> List[Tuple[int, int, int, int]]:
+        """
+        Returns the changed hunks as (old_start, old_end, new_start, new_end),
+        zero-based and end-exclusive. Lines that only differ in surrounding
+        whitespace are treated as equal.
+        """
+        old_lines = [l.decode('utf-8', errors='ignore').strip() for l in self._split(original)]
+        new_lines = [l.strip() for l in self._generated_lines(generated)]
+
+        matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+        return [(i1, i2, j1, j2) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+    def apply(self, original: bytes, generated: str, hunks: List[Tuple[int, int, int, int]]) -> bytes:
+        """Splices the generated lines of each hunk into the original bytes."""
+        old_lines = self._split(original)
+        new_lines = self._generated_lines(generated)
+        newline = self._newline(original)
+
+        # Terminate the last line while splicing so appended lines don't run into it
+        trailing = original.endswith((b"\n", b"\r"))
+        if old_lines and not trailing:
+            old_lines[-1] += newline
+
+        out = []
+        cursor = 0
+        for i1, i2, j1, j2 in hunks:
+            out.extend(old_lines[cursor:i1])
+            for line in new_lines[j1:j2]:
+                out.append(line.encode('utf-8') + newline)
+            cursor = i2
+        out.extend(old_lines[cursor:])
+
+        data = b"".join(out)
+        # Keep the original's convention for the final line terminator
+        if not trailing and data.endswith(newline):
+            data = data[:-len(newline)]
+        return data
@@ -0,0 +1,156 @@
+import math
+import zlib
+import struct
+from typing import List, Tuple
+import numpy as np
+from .geometry import Geometry, fit_transform, geometry_bounds, simplify
+
+# Same look as the SVG thumbnails: #60a5fa stroke on a transparent background
+STROKE_COLOR = (0x60, 0xa5, 0xfa)
+DEFAULT_STROKE_PX = 2.0
+DEFAULT_TOLERANCE_PX = 0.35
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xffffffff)
+
+
+def _png(width: int, height: int, bit_depth: int, color_type: int, rows: np.ndarray, extra: bytes = b"") -> bytes:
+    # Every scanline is prefixed with filter type 0 (None)
+    raw = np.zeros((height, rows.shape[1] + 1), dtype=np.uint8)
+    raw[:, 1:] = rows
+    header = struct.pack(">IIBBBBB", width, height, bit_depth, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _png_chunk(b"IHDR", header) + extra +
+            _png_chunk(b"IDAT", zlib.compress(raw.tobytes(), 9)) + _png_chunk(b"IEND", b""))
+
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    """Encodes an (h, w, 4) uint8 array as an RGBA PNG using only zlib and struct."""
+    height, width = rgba.shape[:2]
+    return _png(width, height, 8, 6, rgba.reshape(height, width * 4))
+
+
+def encode_mask_png(alpha: np.ndarray, color: Tuple[int, int, int]) -> bytes:
+    """
+    Encodes an (h, w) uint8 coverage mask drawn in a single color as a 4-bit indexed PNG.
+    Alpha is quantised to 16 levels, which is plenty for anti-aliased edges; the palette
+    holds the color at each level, so two pixels share a byte and runs compress well.
+    """
+    height, width = alpha.shape
+    levels = (alpha.astype(np.uint16) * 15 + 127) // 255
+    if width % 2:
+        levels = np.pad(levels, ((0, 0), (0, 1)))
+    packed = ((levels[:, 0::2] << 4) | levels[:, 1::2]).astype(np.uint8)
+
+    palette = bytes(color) * 16
+    transparency = bytes(range(0, 256, 17))
+    extra = _png_chunk(b"PLTE", palette) + _png_chunk(b"tRNS", transparency)
+    return _png(width, height, 4, 3, packed, extra)
+
+
+def _arc_points(start: Tuple[float, float], seg: tuple, tolerance: float) -> List[Tuple[float, float]]:
+    """Flattens an arc segment into points whose chords stay within tolerance of the arc."""
+    _, x, y, cx, cy, clockwise = seg
+    radius = math.hypot(start[0] - cx, start[1] - cy)
+    if radius <= tolerance:
+        return [(x, y)]
+
+    a0 = math.atan2(start[1] - cy, start[0] - cx)
+    a1 = math.atan2(y - cy, x - cx)
+    if clockwise:
+        sweep = -((a0 - a1) % (2 * math.pi))
+    else:
+        sweep = (a1 - a0) % (2 * math.pi)
+    if sweep == 0:
+        # Start equals end: a full circle
+        sweep = -2 * math.pi if clockwise else 2 * math.pi
+
+    step = 2 * math.acos(max(1 - tolerance / radius, -1.0))
+    n = max(2, math.ceil(abs(sweep) / step))
+    angles = a0 + sweep * np.arange(1, n + 1) / n
+    points = list(zip((cx + radius * np.cos(angles)).tolist(), (cy + radius * np.sin(angles)).tolist()))
+    points[-1] = (x, y)
+    return points
+
+
+class RasterRenderer:
+    """
+    Anti-aliased line rasteriser built on NumPy, for PNG thumbnails.
+    Geometry is flattened to line segments in pixel space and each segment is drawn
+    as a capsule whose edge coverage falls off over one pixel. No native graphics
+    library is involved.
+    """
+
+    def __init__(self, stroke_px: float = DEFAULT_STROKE_PX, color: Tuple[int, int, int] = STROKE_COLOR):
+        self.stroke_px = stroke_px
+        self.color = color
+
+    def segments(self, geometry: Geometry, width: int, height: int,
+                 tolerance_px: float = DEFAULT_TOLERANCE_PX) -> np.ndarray:
+        """Returns an (n, 4) array of x0, y0, x1, y1 line segments in pixel coordinates."""
+        bounds = geometry_bounds(geometry)
+        if bounds is None:
+            return np.zeros((0, 4))
+
+        scale, tx, ty = fit_transform(bounds, width, height)
+        tolerance = max(tolerance_px, 0.1) / scale
+
+        segs = []
+        for contour in simplify(geometry, tolerance):
+            prev = None
+            for seg in contour:
+                if seg[0] == "M" or prev is None:
+                    prev = (seg[1], seg[2])
+                    continue
+                points = _arc_points(prev, seg, tolerance) if seg[0] == "A" else [(seg[1], seg[2])]
+                for point in points:
+                    segs.append((tx(prev[0]), ty(prev[1]), tx(point[0]), ty(point[1])))
+                    prev = point
+        return np.array(segs, dtype=np.float64).reshape(-1, 4)
+
+    def coverage(self, segs: np.ndarray, width: int, height: int) -> np.ndarray:
+        """Rasterises segments into an (h, w) float coverage mask in 0..1."""
+        mask = np.zeros((height, width), dtype=np.float32)
+        half = self.stroke_px / 2
+        reach = half + 1
+
+        for x0, y0, x1, y1 in segs:
+            left = max(int(math.floor(min(x0, x1) - reach)), 0)
+            right = min(int(math.ceil(max(x0, x1) + reach)), width)
+            top = max(int(math.floor(min(y0, y1) - reach)), 0)
+            bottom = min(int(math.ceil(max(y0, y1) + reach)), height)
+            if left >= right or top >= bottom:
+                continue
+
+            # Distance from each pixel center in the window to the segment
+            px = np.arange(left, right, dtype=np.float32) + 0.5 - x0
+            py = np.arange(top, bottom, dtype=np.float32)[:, None] + 0.5 - y0
+            dx = x1 - x0
+            dy = y1 - y0
+            length_sq = dx * dx + dy * dy
+            if length_sq > 0:
+                t = np.clip((px * dx + py * dy) / length_sq, 0.0, 1.0)
+                dist = np.hypot(px - t * dx, py - t * dy)
+            else:
+                dist = np.hypot(px, py)
+
+            window = mask[top:bottom, left:right]
+            np.maximum(window, np.clip(half + 0.5 - dist, 0.0, 1.0), out=window)
+        return mask
+
+    def render_alpha(self, geometry: Geometry, width: int = 200, height: int = 200,
+                     tolerance_px: float = DEFAULT_TOLERANCE_PX) -> np.ndarray:
+        """Returns the (h, w) uint8 alpha of the stroke."""
+        mask = self.coverage(self.segments(geometry, width, height, tolerance_px), width, height)
+        return np.round(mask * 255).astype(np.uint8)
+
+    def render_rgba(self, geometry: Geometry, width: int = 200, height: int = 200,
+                    tolerance_px: float = DEFAULT_TOLERANCE_PX) -> np.ndarray:
+        rgba = np.zeros((height, width, 4), dtype=np.uint8)
+        rgba[..., :3] = self.color
+        rgba[..., 3] = self.render_alpha(geometry, width, height, tolerance_px)
+        return rgba
+
+    def render_png(self, geometry: Geometry, width: int = 200, height: int = 200,
+                   tolerance_px: float = DEFAULT_TOLERANCE_PX) -> bytes:
+        return encode_mask_png(self.render_alpha(geometry, width, height, tolerance_px), self.color)
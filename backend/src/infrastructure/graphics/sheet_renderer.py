@@ -0,0 +1,195 @@
+import os
+import json
+import math
+import shutil
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Tuple
+from src.infrastructure.fs_util import atomic_write
+from .geometry import Geometry, geometry_bounds, simplify
+from .svg_generator import SVGGenerator
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256
+TILE_FORMATS = {"svg": "image/svg+xml", "json": "application/json"}
+
+# The deepest level resolves about 4 px per mm, enough to inspect lead-ins and micro-joints
+TARGET_PX_PER_MM = 4.0
+MAX_ZOOM_LIMIT = 8
+TILE_TOLERANCE_PX = 0.5
+
+
+def _contour_bbox(contour: list) -> Tuple[float, float, float, float]:
+    xs = []
+    ys = []
+    for seg in contour:
+        xs.append(seg[1])
+        ys.append(seg[2])
+        if seg[0] == "A":
+            # Conservative: the full circle the arc lies on
+            radius = math.hypot(seg[1] - seg[3], seg[2] - seg[4])
+            xs.extend((seg[3] - radius, seg[3] + radius))
+            ys.extend((seg[4] - radius, seg[4] + radius))
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+class SheetTileRenderer:
+    """
+    Renders a nested sheet as a pyramid of square tiles.
+    Zoom 0 fits the whole sheet into one tile and each level doubles the resolution.
+    Every level draws geometry simplified to its own resolution, and rendered tiles are
+    cached on disk by sheet content hash, zoom and tile position.
+    """
+
+    def __init__(self, cache_dir: str, tile_size: int = TILE_SIZE, max_sheets: int = 200, max_levels: int = 32):
+        self.cache_dir = cache_dir
+        self.tile_size = tile_size
+        self.max_sheets = max_sheets
+        self.max_levels = max_levels
+        self.svg_gen = SVGGenerator()
+        # (content_hash, zoom) -> list of (bbox, simplified contour)
+        self._levels: "OrderedDict[tuple, list]" = OrderedDict()
+        # content_hash -> (min_x, min_y, size)
+        self._extents: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _extent(self, geometry: Geometry) -> Tuple[float, float, float]:
+        bounds = geometry_bounds(geometry)
+        if bounds is None:
+            return (0.0, 0.0, 1.0)
+        size = max(bounds[2] - bounds[0], bounds[3] - bounds[1]) or 1.0
+        margin = size * 0.01
+        return (bounds[0] - margin, bounds[1] - margin, size + 2 * margin)
+
+    def max_zoom(self, size: float) -> int:
+        levels = math.ceil(math.log2(max(size * TARGET_PX_PER_MM / self.tile_size, 1.0)))
+        return min(levels, MAX_ZOOM_LIMIT)
+
+    def describe(self, content_hash: str, geometry: Geometry) -> dict:
+        min_x, min_y, size = self._extent(geometry)
+        max_zoom = self.max_zoom(size)
+        return {
+            "content_hash": content_hash,
+            "tile_size": self.tile_size,
+            "origin": [min_x, min_y],
+            "size": size,
+            "min_zoom": 0,
+            "max_zoom": max_zoom,
+            "tiles_per_side": [2 ** z for z in range(max_zoom + 1)],
+            "formats": list(TILE_FORMATS)
+        }
+
+    def tile_path(self, content_hash: str, z: int, x: int, y: int, fmt: str) -> str:
+        return os.path.join(self.cache_dir, content_hash, str(z), f"{x}_{y}.{fmt}")
+
+    def get_tile(self, content_hash: str, load_geometry: Callable[[], Geometry],
+                 z: int, x: int, y: int, fmt: str = "svg") -> bytes:
+        """
+        Returns one tile, rendering it on a cache miss.
+        load_geometry is only called when the sheet's levels are not in memory.
+        """
+        if fmt not in TILE_FORMATS:
+            raise ValueError(f"Unknown tile format: {fmt}")
+
+        path = self.tile_path(content_hash, z, x, y, fmt)
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            pass
+
+        data = self.render_tile(content_hash, load_geometry, z, x, y, fmt)
+        is_new_sheet = not os.path.isdir(os.path.join(self.cache_dir, content_hash))
+        atomic_write(path, data)
+        if is_new_sheet:
+            self._evict_sheets()
+        return data
+
+    def render_tile(self, content_hash: str, load_geometry: Callable[[], Geometry],
+                    z: int, x: int, y: int, fmt: str = "svg") -> bytes:
+        min_x, min_y, size, contours = self._level(content_hash, load_geometry, z)
+
+        per_side = 2 ** z
+        if not (0 <= x < per_side and 0 <= y < per_side):
+            raise ValueError(f"Tile {z}/{x}/{y} is outside the sheet")
+
+        tile_world = size / per_side
+        scale = self.tile_size / tile_world
+        left = min_x + x * tile_world
+        # Tile rows count downwards from the top edge of the sheet (GNC Y points up)
+        top = min_y + size - y * tile_world
+        right = left + tile_world
+        bottom = top - tile_world
+        margin = 2.0 / scale
+
+        visible = [c for bbox, c in contours
+                   if bbox[2] >= left - margin and bbox[0] <= right + margin
+                   and bbox[3] >= bottom - margin and bbox[1] <= top + margin]
+
+        def tx(px: float) -> float:
+            return (px - left) * scale
+
+        def ty(py: float) -> float:
+            return (top - py) * scale
+
+        if fmt == "json":
+            paths = [self.svg_gen.path_data([c], scale, tx, ty, 1) for c in visible]
+            return json.dumps({"z": z, "x": x, "y": y, "tile_size": self.tile_size, "paths": paths},
+                              separators=(",", ":")).encode('utf-8')
+
+        path_str = self.svg_gen.path_data(visible, scale, tx, ty, 1)
+        size_px = self.tile_size
+        svg = (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size_px} {size_px}" '
+               f'width="{size_px}" height="{size_px}">')
+        if path_str:
+            svg += (f'<path d="{path_str}" stroke="#60a5fa" stroke-width="1.5" fill="none" '
+                    f'stroke-linecap="round" stroke-linejoin="round"/>')
+        return (svg + '</svg>').encode('utf-8')
+
+    def _level(self, content_hash: str, load_geometry: Callable[[], Geometry], z: int):
+        key = (content_hash, z)
+        with self._lock:
+            contours = self._levels.get(key)
+            extent = self._extents.get(content_hash)
+            if contours is not None and extent is not None:
+                self._levels.move_to_end(key)
+                return extent + (contours,)
+
+        geometry = load_geometry()
+        extent = self._extent(geometry)
+        if z < 0 or z > self.max_zoom(extent[2]):
+            raise ValueError(f"Zoom level {z} is out of range")
+
+        scale = self.tile_size * (2 ** z) / extent[2]
+        contours = [(_contour_bbox(c), c) for c in simplify(geometry, TILE_TOLERANCE_PX / scale) if c]
+
+        with self._lock:
+            self._extents[content_hash] = extent
+            self._extents.move_to_end(content_hash)
+            self._levels[key] = contours
+            self._levels.move_to_end(key)
+            while len(self._levels) > self.max_levels:
+                self._levels.popitem(last=False)
+            while len(self._extents) > self.max_levels:
+                self._extents.popitem(last=False)
+        return extent + (contours,)
+
+    def _evict_sheets(self):
+        """Keeps the tile cache to the most recently created max_sheets sheets."""
+        try:
+            with os.scandir(self.cache_dir) as it:
+                dirs = [(e.stat().st_mtime, e.path) for e in it if e.is_dir()]
+        except OSError:
+            return
+        dirs.sort()
+        for _, path in dirs[:max(0, len(dirs) - self.max_sheets)]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    def invalidate(self, content_hash: str):
+        with self._lock:
+            for key in [k for k in self._levels if k[0] == content_hash]:
+                del self._levels[key]
+            self._extents.pop(content_hash, None)
+        shutil.rmtree(os.path.join(self.cache_dir, content_hash), ignore_errors=True)
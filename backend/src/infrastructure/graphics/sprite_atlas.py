@@ -0,0 +1,63 @@
+import re
+import math
+import hashlib
+from typing import List, Optional, Sequence, Tuple
+
+_SVG_BODY = re.compile(r'<svg[^>]*\sviewBox="([^"]+)"[^>]*>(.*)</svg>', re.S)
+
+
+def atlas_fingerprint(members: Sequence[Tuple[int, Optional[str]]], fmt: str, cell: int) -> str:
+    """
+    Identifies an atlas by its layout and the (part id, geometry hash) of each member,
+    so the atlas is replaced as soon as any member's geometry changes.
+    """
+    h = hashlib.sha1(f"{fmt}:{cell}".encode())
+    for part_id, g_hash in members:
+        h.update(f";{part_id}:{g_hash or ''}".encode())
+    return h.hexdigest()
+
+
+def grid_layout(count: int, cell: int, columns: int) -> Tuple[int, int, List[Tuple[int, int]]]:
+    """Returns (width, height, [(x, y) per cell]) of a row-major grid."""
+    columns = max(1, min(columns, count))
+    rows = math.ceil(count / columns) if count else 0
+    offsets = [((i % columns) * cell, (i // columns) * cell) for i in range(count)]
+    return columns * cell, rows * cell, offsets
+
+
+def svg_atlas(thumbnails: List[Optional[Tuple[str, str]]], cell: int, columns: int) -> str:
+    """
+    Packs (symbol id, thumbnail SVG markup) entries into one SVG.
+    Every distinct thumbnail becomes a <symbol> that is placed on the grid with <use>,
+    so the atlas works both as a sprite sheet and as a symbol library
+    (<use href="atlas.svg#symbol-id">). None entries leave their cell empty.
+    """
+    width, height, offsets = grid_layout(len(thumbnails), cell, columns)
+    symbols = {}
+    uses = []
+    for entry, (x, y) in zip(thumbnails, offsets):
+        if entry is None:
+            continue
+        symbol_id, markup = entry
+        if symbol_id not in symbols:
+            match = _SVG_BODY.search(markup)
+            if not match:
+                continue
+            symbols[symbol_id] = f'<symbol id="{symbol_id}" viewBox="{match.group(1)}">{match.group(2).strip()}</symbol>'
+        uses.append(f'<use href="#{symbol_id}" x="{x}" y="{y}" width="{cell}" height="{cell}"/>')
+
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+            f'width="{width}" height="{height}"><defs>{"".join(symbols.values())}</defs>{"".join(uses)}</svg>')
+
+
+def png_atlas(alphas: list, cell: int, columns: int, color: Tuple[int, int, int]) -> bytes:
+    """Packs (cell, cell) uint8 alpha masks into one PNG grid. None entries leave their cell empty."""
+    import numpy as np
+    from .raster import encode_mask_png
+
+    width, height, offsets = grid_layout(len(alphas), cell, columns)
+    sheet = np.zeros((max(height, 1), max(width, 1)), dtype=np.uint8)
+    for alpha, (x, y) in zip(alphas, offsets):
+        if alpha is not None:
+            sheet[y:y + cell, x:x + cell] = alpha
+    return encode_mask_png(sheet, color)
@@ -0,0 +1,127 @@
+import os
+import time
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+from .geometry import Geometry
+from .svg_generator import SVGGenerator
+from .thumbnail_cache import ThumbnailCache
+
+logger = logging.getLogger(__name__)
+
+WRITE_BUFFER_SIZE = 64 * 1024
+
+THUMBNAIL_FORMATS = {"svg": "image/svg+xml", "png": "image/png"}
+
+
+def render_thumbnail(geometry: Geometry, fmt: str = "svg", width: int = 200, height: int = 200) -> bytes:
+    """Renders a thumbnail in the requested format ("svg" or "png")."""
+    if fmt == "svg":
+        return SVGGenerator().render_svg(geometry, width, height).encode('utf-8')
+    if fmt == "png":
+        # Imported lazily so SVG rendering keeps working without NumPy
+        from .raster import RasterRenderer
+        return RasterRenderer().render_png(geometry, width, height)
+    raise ValueError(f"Unknown thumbnail format: {fmt}")
+
+
+class BatchReport:
+    def __init__(self):
+        self.rendered = 0
+        self.skipped = 0
+        self.failed: List[Tuple[str, str]] = []
+        self.bytes_written = 0
+        self.elapsed = 0.0
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.rendered / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "rendered": self.rendered,
+            "skipped": self.skipped,
+            "failed": len(self.failed),
+            "failures": [{"key": key, "error": error} for key, error in self.failed],
+            "bytes_written": self.bytes_written,
+            "elapsed_sec": round(self.elapsed, 3),
+            "files_per_sec": round(self.files_per_sec, 1)
+        }
+
+
+def _render_job(job: Tuple[str, Geometry, str, int, int, str]) -> Tuple[str, Optional[str], int]:
+    """
+    Worker entry point: renders one geometry and writes it next to its final path
+    through a large write buffer, then renames it into place.
+    Returns (geometry_hash, error, bytes_written).
+    """
+    g_hash, geometry, output_path, width, height, fmt = job
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        data = render_thumbnail(geometry, fmt, width, height)
+        with open(tmp_path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            f.write(data)
+        os.replace(tmp_path, output_path)
+        return g_hash, None, len(data)
+    except Exception as e:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return g_hash, str(e), 0
+
+
+class ThumbnailBatchRenderer:
+    """
+    Renders many thumbnails across a process pool.
+    Jobs are (geometry_hash, geometry) pairs in the compact geometry form, which
+    pickles cheaply; hashes already present in the cache are skipped.
+    """
+
+    def __init__(self, cache: ThumbnailCache, workers: Optional[int] = None, chunksize: int = 16):
+        self.cache = cache
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.chunksize = chunksize
+
+    def render(self, jobs: Iterable[Tuple[str, Geometry]], width: int = 200, height: int = 200,
+               overwrite: bool = False, fmt: str = "svg") -> BatchReport:
+        if fmt not in THUMBNAIL_FORMATS:
+            raise ValueError(f"Unknown thumbnail format: {fmt}")
+        report = BatchReport()
+        started = time.perf_counter()
+
+        pending = []
+        seen = set()
+        for g_hash, geometry in jobs:
+            if not g_hash or g_hash in seen:
+                continue
+            seen.add(g_hash)
+            if not overwrite and self.cache.exists(g_hash, fmt):
+                report.skipped += 1
+                continue
+            pending.append((g_hash, geometry, self.cache.path_for(g_hash, fmt), width, height, fmt))
+
+        if self.workers <= 1 or len(pending) < 2:
+            results = map(_render_job, pending)
+            self._collect(results, report)
+        else:
+            # Spawned, not forked: this also runs inside the threaded API server
+            with ProcessPoolExecutor(max_workers=self.workers,
+                                     mp_context=multiprocessing.get_context("spawn")) as pool:
+                self._collect(pool.map(_render_job, pending, chunksize=self.chunksize), report)
+
+        report.elapsed = time.perf_counter() - started
+        logger.info(
+            f"Rendered {report.rendered} thumbnails ({report.skipped} cached, {len(report.failed)} failed) "
+            f"in {report.elapsed:.1f}s, {report.files_per_sec:.1f} files/s"
+        )
+        return report
+
+    def _collect(self, results, report: BatchReport):
+        for g_hash, error, size in results:
+            if error:
+                report.failed.append((g_hash, error))
+            else:
+                report.rendered += 1
+                report.bytes_written += size
@@ -0,0 +1,100 @@
+import os
+import re
+import logging
+from typing import Iterable, Optional
+from src.infrastructure.fs_util import atomic_write
+
+logger = logging.getLogger(__name__)
+
+# Thumbnails live under static/, which is served at the site root
+THUMBNAIL_URL_PREFIX = "/uploads/thumbnails"
+
+# Only content-addressed files are managed; legacy name-based thumbnails are left alone
+_HASH_FILE_PATTERN = re.compile(r'^([0-9a-f]{40})\.(svg|png)$')
+
+
+def thumbnail_url(geometry_hash: Optional[str], ext: str = "svg") -> Optional[str]:
+    if not geometry_hash:
+        return None
+    return f"{THUMBNAIL_URL_PREFIX}/{geometry_hash}.{ext}"
+
+
+class ThumbnailCache:
+    """
+    Content-addressed thumbnail store keyed by geometry hash.
+    Identical parts share one file, and a file is never re-rendered while it exists.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path_for(self, geometry_hash: str, ext: str = "svg") -> str:
+        return os.path.join(self.directory, f"{geometry_hash}.{ext}")
+
+    def exists(self, geometry_hash: str, ext: str = "svg") -> bool:
+        return os.path.exists(self.path_for(geometry_hash, ext))
+
+    def store(self, geometry_hash: str, content, ext: str = "svg") -> str:
+        path = self.path_for(geometry_hash, ext)
+        data = content.encode('utf-8') if isinstance(content, str) else content
+        atomic_write(path, data)
+        return path
+
+    def discard(self, geometry_hash: str) -> int:
+        """Removes every rendition of a hash. Returns the number of files removed."""
+        removed = 0
+        for ext in ("svg", "png"):
+            try:
+                os.remove(self.path_for(geometry_hash, ext))
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def evict(self, live_hashes: Optional[Iterable[str]] = None) -> dict:
+        """
+        Drops thumbnails whose hash no part references any more, then trims the
+        least recently written files until the cache fits within max_bytes.
+        The SVGs of live hashes are never trimmed and do not count against the
+        bound: Part.thumbnail_url links them directly, and sync only renders them
+        for new content. Other formats are re-rendered on request by ThumbnailService.
+        With live_hashes=None only the size bound is enforced.
+        """
+        live = set(live_hashes) if live_hashes is not None else None
+        entries = []
+        orphans = 0
+        pinned = 0
+
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                match = _HASH_FILE_PATTERN.match(entry.name)
+                if not match or not entry.is_file():
+                    continue
+                if live is not None and match.group(1) not in live:
+                    try:
+                        os.remove(entry.path)
+                        orphans += 1
+                    except OSError as e:
+                        logger.warning(f"Failed to evict thumbnail {entry.name}: {e}")
+                    continue
+                st = entry.stat()
+                if live is not None and match.group(2) == "svg":
+                    pinned += st.st_size
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        trimmed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                trimmed += 1
+            except OSError as e:
+                logger.warning(f"Failed to evict thumbnail {path}: {e}")
+
+        return {"orphans": orphans, "trimmed": trimmed, "bytes": total + pinned, "pinned": pinned}
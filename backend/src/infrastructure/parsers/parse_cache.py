@@ -0,0 +1,86 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from .gnc_parser import GNCParser, GNCSheet
+
+
+class GNCParseCache:
+    """
+    Keeps the raw bytes and parsed GNCSheet of recently used GNC files.
+    Entries are keyed by path and validated against the file's size and mtime,
+    so an edit made on the share is picked up on the next access.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def _signature(self, path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return (st.st_size, st.st_mtime_ns)
+
+    def _lookup(self, path: str) -> list:
+        key = self._key(path)
+        signature = self._signature(path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] == signature:
+                self._entries.move_to_end(key)
+                return entry
+
+        with open(path, 'rb') as f:
+            raw = f.read()
+        # [signature, raw bytes, parsed sheet (lazy), content digest (lazy)]
+        entry = [signature, raw, None, None]
+        self._put(key, entry)
+        return entry
+
+    def _put(self, key: str, entry: list):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_bytes(self, path: str) -> bytes:
+        return self._lookup(path)[1]
+
+    def get_digest(self, path: str) -> str:
+        """SHA-1 of the file content, computed once per cached version."""
+        entry = self._lookup(path)
+        if entry[3] is None:
+            entry[3] = hashlib.sha1(entry[1]).hexdigest()
+        return entry[3]
+
+    def get_sheet(self, path: str) -> GNCSheet:
+        """
+        Returns the parsed sheet for path. The returned object is shared between
+        callers and must be treated as read-only.
+        """
+        entry = self._lookup(path)
+        if entry[2] is None:
+            content = entry[1].decode('utf-8', errors='ignore')
+            entry[2] = GNCParser().parse(content, filename=os.path.basename(path))
+        return entry[2]
+
+    def store(self, path: str, raw: bytes, sheet: Optional[GNCSheet] = None):
+        """Records content that was just written to path."""
+        self._put(self._key(path), [self._signature(path), raw, sheet, None])
+
+    def invalidate(self, path: str) -> bool:
+        with self._lock:
+            return self._entries.pop(self._key(path), None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Process-wide cache shared by services and the sync subsystem
+parse_cache = GNCParseCache()
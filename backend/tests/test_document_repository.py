@@ -0,0 +1,112 @@
+import os
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from src.infrastructure.database.models import (
+    Base, DocumentDB, TagDB, AttachmentDB, TaskDB, PartDB, MaterialDB, JournalEntryDB
+)
+from src.infrastructure.database.repositories import SQLDocumentRepository, SQLTaskRepository
+from src.infrastructure.database.journal_repository import SQLJournalRepository
+from src.domain.pagination import InvalidCursor
+
+def _session(tmp_path, documents):
+    engine = create_engine(f"sqlite:///{tmp_path / 'docs.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    material = MaterialDB(name="ST37")
+    tag = TagDB(name="urgent")
+    for i in range(documents):
+        doc = DocumentDB(name=f"Order_{i}", type="order", status="in_progress", tags=[tag])
+        doc.attachments = [AttachmentDB(file_path=f"/share/{i}/{n}.gnc", filename=f"{n}.gnc",
+                                        media_type="application/x-gnc") for n in range(2)]
+        doc.tasks = [TaskDB(name=f"T{n}", status="planned", material=material,
+                            parts=[PartDB(name=f"P{i}_{n}", registration_number=f"P{i}_{n}")]) for n in range(2)]
+        entry = JournalEntryDB(text="Check nesting", type="warning", status="pending", document=doc)
+        entry.attachments = [AttachmentDB(file_path=f"/journal/{i}.png", filename=f"{i}.png", media_type="image/png")]
+        db.add_all([doc, entry])
+    db.commit()
+    db.expunge_all()
+    return engine, db
+
+def _count_statements(engine, fn):
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, len(statements)
+
+def test_document_list_uses_constant_number_of_queries(tmp_path):
+    engine, db = _session(tmp_path, 100)
+    repo = SQLDocumentRepository(db)
+
+    docs, statements = _count_statements(engine, lambda: repo.list(limit=100))
+    assert len(docs) == 100
+    assert all(len(d.tasks) == 2 and len(d.tasks[0].parts) == 1 for d in docs)
+    assert all(d.tags[0].name == "urgent" and len(d.journal_entries[0].attachments) == 1 for d in docs)
+    # Documents, then tags, attachments, tasks, task parts, journal entries and their attachments
+    assert statements == 7
+
+    db.expunge_all()
+    _, few = _count_statements(engine, lambda: repo.list(limit=10))
+    assert few == statements
+
+    db.expunge_all()
+    doc, statements = _count_statements(engine, lambda: repo.get_by_id(docs[0].id))
+    assert len(doc.attachments) == 2 and statements == 7
+
+    db.expunge_all()
+    tasks, statements = _count_statements(engine, lambda: SQLTaskRepository(db).list(limit=200))
+    assert len(tasks) == 200 and all(t.material.name == "ST37" for t in tasks)
+    assert statements == 2
+
+def test_document_summaries_skip_content_and_collections(tmp_path):
+    engine, db = _session(tmp_path, 20)
+    doc = db.query(DocumentDB).first()
+    doc_id = doc.id
+    doc.content = "x" * 100000
+    db.add(JournalEntryDB(text="Done", type="info", status="done", document_id=doc_id))
+    db.commit()
+    db.expunge_all()
+
+    summaries, statements = _count_statements(engine, lambda: SQLDocumentRepository(db).list_summaries(limit=100))
+    assert statements == 1 and len(summaries) == 20
+    first = next(s for s in summaries if s.id == doc_id)
+    assert (first.attachment_count, first.task_count, first.open_journal_count) == (2, 2, 1)
+    assert "content" not in first.model_dump()
+
+def _walk(page, limit):
+    items, cursor, pages = [], None, 0
+    while True:
+        result = page(cursor=cursor, limit=limit)
+        items += result.items
+        pages += 1
+        if result.next_cursor is None:
+            return items, pages
+        cursor = result.next_cursor
+
+def test_cursor_pages_follow_offset_order(tmp_path):
+    engine, db = _session(tmp_path, 25)
+    docs = SQLDocumentRepository(db)
+    journal = SQLJournalRepository(db)
+
+    walked, pages = _walk(docs.page, 10)
+    assert pages == 3 and [d.id for d in walked] == [d.id for d in docs.list(limit=100)]
+    summaries, _ = _walk(docs.page_summaries, 25)
+    assert [s.id for s in summaries] == [d.id for d in walked]
+
+    # Entries created in the same instant are ordered by id
+    entries, pages = _walk(journal.page, 4)
+    assert pages == 7 and [e.id for e in entries] == [e.id for e in journal.list(limit=100)]
+
+    with pytest.raises(InvalidCursor):
+        docs.page(cursor="not-a-cursor")
+    with pytest.raises(InvalidCursor):
+        journal.page(cursor=docs.page(limit=1).next_cursor)
@@ -0,0 +1,39 @@
+import os
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.graphics.gnc_patcher import GNCPatcher
+from src.application.services.gnc_service import GncService
+
+SAMPLE = b"(*MODEL TEST)\r\nG71 G90\r\nN1005 G00 X10.000 Y10.000\r\nN1010 G01 X20.000 Y10.000\r\nM30"
+
+def test_patch_only_touches_changed_lines():
+    patcher = GNCPatcher()
+    generated = "(*MODEL TEST)\nG71 G90\nN1005 G00 X10.000 Y10.000\nN1010 G01 X25.000 Y10.000\nM30"
+
+    hunks = patcher.diff(SAMPLE, generated)
+    assert hunks == [(3, 4, 3, 4)]
+
+    patched = patcher.apply(SAMPLE, generated, hunks)
+    # Line endings of the original survive and no trailing newline is added
+    assert patched == SAMPLE.replace(b"X20.000", b"X25.000")
+
+def test_patch_appends_after_unterminated_last_line():
+    patcher = GNCPatcher()
+    generated = "(*MODEL TEST)\nG71 G90\nN1005 G00 X10.000 Y10.000\nN1010 G01 X20.000 Y10.000\nM30\n(END)"
+
+    patched = patcher.apply(SAMPLE, generated, patcher.diff(SAMPLE, generated))
+    assert patched == SAMPLE + b"\r\n(END)"
+
+def test_save_patch_mode_skips_unchanged_write(tmp_path):
+    service = GncService(output_dir=str(tmp_path))
+    sheet = service.parse_gnc(SAMPLE.decode(), "sample.gnc")
+
+    first = service.save_gnc(sheet, "sample.gnc", mode="full")
+    assert first["mode"] == "full"
+
+    second = service.save_gnc(sheet, "sample.gnc", mode="patch")
+    assert second["changed"] is False
+    assert second["changed_ranges"] == []
@@ -0,0 +1,565 @@
+import os
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.infrastructure.database.models import Base, FileManifestDB, AttachmentDB, PartDB
+from src.application.services.sync.processor import SyncProcessor, content_hash
+from src.application.services.sync.scanner import DirectoryScanner
+from src.application.services.sync.checkpoint import IngestProgress
+
+PROGRAM = """(PART NAME:{name})
+N1005 G00 X0 Y0
+N1010 G01 X{size} Y0
+N1015 G01 X{size} Y{size}
+N1020 G01 X0 Y0
+"""
+
+def _write(path, name, size=10):
+    with open(path, 'w') as f:
+        f.write(PROGRAM.format(name=name, size=size))
+
+def _scanner(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    return DirectoryScanner(SyncProcessor(session_factory)), session_factory
+
+def test_rescan_dispatches_only_new_and_changed_files(tmp_path, monkeypatch):
+    root = tmp_path / "sidra"
+    (root / "Order_1").mkdir(parents=True)
+    _write(root / "A.gnc", "A")
+    _write(root / "Order_1" / "B.gnc", "B")
+    _write(root / "Order_1" / "B_801.gnc", "B")  # identical to B.gnc, linked instead of parsed
+
+    scanner, session_factory = _scanner(tmp_path)
+    monkeypatch.setattr(scanner.processor.thumbnails, "directory", str(tmp_path / "thumbs"))
+    os.makedirs(tmp_path / "thumbs")
+
+    first = scanner.scan(str(root), "sidra", cycle=1)
+    assert (first["listed"], first["dispatched"], first["linked"]) == (3, 3, 1)
+
+    second = scanner.scan(str(root), "sidra", cycle=2)
+    assert (second["dispatched"], second["unchanged"]) == (0, 3)
+
+    _write(root / "A.gnc", "A", size=25)
+    _write(root / "C.gnc", "C")
+    third = scanner.scan(str(root), "sidra", cycle=3)
+    assert (third["listed"], third["dispatched"]) == (4, 2)
+
+    db = session_factory()
+    try:
+        rows = db.query(FileManifestDB).all()
+        assert len(rows) == 4
+        assert all(r.last_seen_cycle == 3 and r.content_hash for r in rows)
+        assert db.query(AttachmentDB).count() == 4
+    finally:
+        db.close()
+
+def test_modified_file_is_reingested_in_place(tmp_path, monkeypatch):
+    root = tmp_path / "sidra"
+    root.mkdir()
+    _write(root / "P1.gnc", "P1", size=10)
+
+    scanner, session_factory = _scanner(tmp_path)
+    monkeypatch.setattr(scanner.processor.thumbnails, "directory", str(tmp_path / "thumbs"))
+    os.makedirs(tmp_path / "thumbs")
+    scanner.scan(str(root), "sidra", cycle=1)
+
+    db = session_factory()
+    try:
+        part = db.query(PartDB).filter(PartDB.registration_number == "P1").one()
+        old_hash = part.geometry_hash
+        assert part.width == 10
+    finally:
+        db.close()
+    assert os.path.exists(tmp_path / "thumbs" / f"{old_hash}.svg")
+
+    old_digest = content_hash(str(root / "P1.gnc"))
+    invalidated = []
+    monkeypatch.setattr(scanner.processor, "invalidate_tiles", invalidated.append)
+    _write(root / "P1.gnc", "P1", size=40)
+    # A batch that rolls back keeps the renditions the database still points at
+    def fail(self, db, records):
+        raise RuntimeError("disk full")
+    with monkeypatch.context() as m:
+        m.setattr(IngestProgress, "stage", fail)
+        assert scanner.scan(str(root), "sidra", cycle=2)["failed"] == 1
+    assert os.path.exists(tmp_path / "thumbs" / f"{old_hash}.svg")
+    assert invalidated == []
+
+    scanner.scan(str(root), "sidra", cycle=3)
+    assert invalidated == [old_digest]
+
+    db = session_factory()
+    try:
+        part = db.query(PartDB).filter(PartDB.registration_number == "P1").one()
+        assert db.query(PartDB).count() == 1
+        assert (part.width, part.height) == (40, 40)
+        assert part.geometry_hash != old_hash
+    finally:
+        db.close()
+    assert not os.path.exists(tmp_path / "thumbs" / f"{old_hash}.svg")
+
+def test_deleted_file_is_tombstoned_and_revived(tmp_path, monkeypatch):
+    from src.infrastructure.database.models import TaskDB
+    root = tmp_path / "mihtav"
+    (root / "Order_7").mkdir(parents=True)
+    _write(root / "Order_7" / "S1.gnc", "S1")
+    _write(root / "Order_7" / "S2.gnc", "S2")
+
+    scanner, session_factory = _scanner(tmp_path)
+    monkeypatch.setattr(scanner.processor.thumbnails, "directory", str(tmp_path / "thumbs"))
+    os.makedirs(tmp_path / "thumbs")
+    scanner.scan(str(root), "mihtav", cycle=1)
+
+    os.remove(root / "Order_7" / "S2.gnc")
+    stats = scanner.scan(str(root), "mihtav", cycle=2)
+    assert stats["tombstoned"] == 1
+    # Already tombstoned files are not counted again
+    assert scanner.scan(str(root), "mihtav", cycle=3)["tombstoned"] == 0
+
+    gone = str(root / "Order_7" / "S2.gnc")
+    db = session_factory()
+    try:
+        assert db.query(AttachmentDB).filter(AttachmentDB.file_path == gone).count() == 0
+        assert db.query(TaskDB).filter(TaskDB.gnc_file_path == gone).count() == 0
+        assert db.query(TaskDB).count() == 2
+        assert db.query(FileManifestDB).filter(FileManifestDB.path == gone).one().missing_since is not None
+    finally:
+        db.close()
+
+    _write(root / "Order_7" / "S2.gnc", "S2")
+    assert scanner.scan(str(root), "mihtav", cycle=4)["dispatched"] == 1
+    db = session_factory()
+    try:
+        assert db.query(AttachmentDB).filter(AttachmentDB.file_path == gone).count() == 1
+        assert db.query(FileManifestDB).filter(FileManifestDB.path == gone).one().missing_since is None
+        # The restored file gets its detached task and part back instead of new ones
+        assert db.query(TaskDB).count() == 2
+        assert db.query(TaskDB).filter(TaskDB.gnc_file_path.is_(None)).count() == 0
+        assert db.query(PartDB).filter(PartDB.registration_number == "S2").one().gnc_file_path == gone
+    finally:
+        db.close()
+
+    # The same through the per-file path
+    os.remove(root / "Order_7" / "S2.gnc")
+    scanner.scan(str(root), "mihtav", cycle=5)
+    _write(root / "Order_7" / "S2.gnc", "S2")
+    assert scanner.processor.process_file(gone, "mihtav", "Order_7")
+    db = session_factory()
+    try:
+        assert db.query(TaskDB).count() == 2
+        assert db.query(TaskDB).filter(TaskDB.gnc_file_path == gone).count() == 1
+    finally:
+        db.close()
+
+def test_directory_that_fails_to_list_keeps_its_files(tmp_path, monkeypatch):
+    root = tmp_path / "mihtav"
+    for order in ("Order_A", "Order_B", "Order_C"):
+        (root / order).mkdir(parents=True)
+        _write(root / order / f"{order[-1]}1.gnc", f"{order[-1]}1")
+
+    scanner, session_factory = _scanner(tmp_path)
+    monkeypatch.setattr(scanner.processor.thumbnails, "directory", str(tmp_path / "thumbs"))
+    os.makedirs(tmp_path / "thumbs")
+    scanner.scan(str(root), "mihtav", cycle=1)
+
+    scandir = os.scandir
+    def failing(path):
+        if os.path.basename(path) == "Order_B":
+            raise PermissionError("The network path was not found")
+        return scandir(path)
+    with monkeypatch.context() as m:
+        m.setattr(os, "scandir", failing)
+        os.remove(root / "Order_A" / "A1.gnc")
+        stats = scanner.scan(str(root), "mihtav", cycle=2)
+    # Only the file that is really gone is tombstoned
+    assert stats["tombstoned"] == 1
+
+    kept = str(root / "Order_B" / "B1.gnc")
+    db = session_factory()
+    try:
+        assert db.query(AttachmentDB).filter(AttachmentDB.file_path == kept).count() == 1
+        assert db.query(FileManifestDB).filter(FileManifestDB.path == kept).one().missing_since is None
+    finally:
+        db.close()
+    assert scanner.scan(str(root), "mihtav", cycle=3)["tombstoned"] == 0
+
+def test_pipeline_parses_in_worker_processes_and_batches_writes(tmp_path):
+    from src.application.services.sync.pipeline import SyncPipeline
+    root = tmp_path / "sidra"
+    root.mkdir()
+    for i in range(7):
+        _write(root / f"W{i}.gnc", f"W{i}", size=10 + i)
+    (root / "Order_9").mkdir()  # walked on the thread pool, holds nothing
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    processor = SyncProcessor(session_factory)
+    processor.thumbnails.directory = str(tmp_path / "thumbs")
+    os.makedirs(tmp_path / "thumbs")
+    pipeline = SyncPipeline(processor, walkers=2, parse_workers=2, max_inflight=3,
+                            queue_size=2, batch_size=3, inline_threshold=0)
+    try:
+        stats = DirectoryScanner(processor, pipeline).scan(str(root), "sidra", cycle=1)
+        # Forking the threaded server process could copy held locks into the workers
+        assert pipeline._get_parse_pool()._mp_context.get_start_method() == "spawn"
+    finally:
+        pipeline.shutdown()
+    assert (stats["dispatched"], stats["failed"]) == (7, 0)
+
+    db = session_factory()
+    try:
+        assert db.query(PartDB).count() == 7
+        assert db.query(FileManifestDB).count() == 7
+    finally:
+        db.close()
+    assert len(os.listdir(tmp_path / "thumbs")) == 7
+
+def test_batch_writer_matches_serial_ingest(tmp_path):
+    from src.infrastructure.database.models import DocumentDB, MaterialDB, TaskDB
+    from src.application.services.sync.pipeline import SyncPipeline
+    root = tmp_path / "mihtav"
+    (root / "Order_3").mkdir(parents=True)
+    for name in ("X_1", "X_2", "Y"):
+        with open(root / "Order_3" / f"{name}.gnc", 'w') as f:
+            f.write("(Material:ST37)\n" + PROGRAM.format(name=name, size=10))
+    _write(root / "Z.gnc", "Z")
+
+    files = [(str(root / "Order_3" / f"{name}.gnc"), "Order_3") for name in ("X_1", "X_2", "Y")]
+    files.append((str(root / "Z.gnc"), None))
+
+    def ingest(db_name, batch_size=None):
+        engine = create_engine(f"sqlite:///{tmp_path / db_name}")
+        Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        processor = SyncProcessor(session_factory)
+        processor.thumbnails.directory = str(tmp_path / "thumbs")
+        if batch_size is None:
+            # One file at a time through SyncProcessor.process_file
+            assert all(processor.process_file(path, "mihtav", doc_name) for path, doc_name in files)
+        else:
+            pipeline = SyncPipeline(processor, parse_workers=1, batch_size=batch_size)
+            assert DirectoryScanner(processor, pipeline).scan(str(root), "mihtav", cycle=1)["failed"] == 0
+        db = session_factory()
+        try:
+            return (
+                sorted((d.name, d.type) for d in db.query(DocumentDB)),
+                [m.name for m in db.query(MaterialDB)],
+                sorted((p.registration_number, p.version, p.gnc_file_path, p.material_id is not None)
+                       for p in db.query(PartDB)),
+                sorted((t.name, t.material_id is not None) for t in db.query(TaskDB)),
+                db.query(AttachmentDB).count()
+            )
+        finally:
+            db.close()
+
+    os.makedirs(tmp_path / "thumbs")
+    batched = ingest("batched.db", batch_size=100)
+    assert batched == ingest("single.db", batch_size=1)
+    assert batched == ingest("serial.db")
+    documents, materials, parts, tasks, attachments = batched
+    assert documents == [("Order_3", "order"), ("Z", "order")]
+    assert materials == ["ST37"]
+    # X_1 and X_2 are versions of one part
+    assert [p[0] for p in parts] == ["X", "Y", "Z"]
+    assert (len(tasks), attachments) == (4, 4)
+
+def test_cycle_lookups_replace_per_file_queries(tmp_path):
+    from sqlalchemy import event
+    from src.application.services.sync.pipeline import SyncPipeline, IngestItem
+    for d in range(4):
+        (tmp_path / "share" / f"Order_{d % 2}").mkdir(parents=True, exist_ok=True)
+        for i in range(3):
+            with open(tmp_path / "share" / f"Order_{d % 2}" / f"Q{d}{i}.gnc", 'w') as f:
+                f.write(f"(Material:M{i % 2})\n" + PROGRAM.format(name=f"Q{d}{i}", size=10))
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    processor = SyncProcessor(session_factory)
+    processor.thumbnails.directory = str(tmp_path / "thumbs")
+    os.makedirs(tmp_path / "thumbs")
+    scanner = DirectoryScanner(processor, SyncPipeline(processor, parse_workers=1, batch_size=4))
+    listing = scanner.list_files(str(tmp_path / "share"))
+
+    lookups = []
+    def count(conn, cursor, statement, *args):
+        if statement.lstrip().startswith("SELECT") and any(
+            f"FROM {table}" in statement for table in ("documents", "materials", "parts")
+        ):
+            lookups.append(statement)
+    event.listen(engine, "before_cursor_execute", count)
+
+    processor.begin_cycle()
+    try:
+        # Half through the batch writer, half through the per-file path; both
+        # reuse the documents and materials the other half created
+        first, second = listing[:6], listing[6:]
+        scanner.pipeline.ingest([IngestItem(f.path, f.doc_name, f.size, f.mtime_ns, None) for f in first], "mihtav")
+        for f in second:
+            assert processor.process_file(f.path, "mihtav", doc_name=f.doc_name)
+    finally:
+        processor.end_cycle()
+    # Only the three preload queries
+    assert len(lookups) == 3
+
+    db = session_factory()
+    try:
+        from src.infrastructure.database.models import DocumentDB, MaterialDB
+        assert db.query(PartDB).count() == 12
+        assert db.query(DocumentDB).count() == 2
+        assert db.query(MaterialDB).count() == 2
+    finally:
+        db.close()
+
+def test_scan_records_cycle_metrics(tmp_path, monkeypatch):
+    root = tmp_path / "sidra"
+    (root / "Order_1").mkdir(parents=True)
+    _write(root / "A.gnc", "A")
+    _write(root / "Order_1" / "B.gnc", "B")
+
+    scanner, _ = _scanner(tmp_path)
+    monkeypatch.setattr(scanner.processor.thumbnails, "directory", str(tmp_path / "thumbs"))
+    os.makedirs(tmp_path / "thumbs")
+    metrics = scanner.metrics
+
+    metrics.begin_cycle(1)
+    scanner.scan(str(root), "sidra", cycle=1)
+    current = metrics.snapshot()["current"]
+    assert (current["dirs_listed"], current["files_seen"], current["dispatched"]) == (2, 2, 2)
+    assert (current["parsed"], current["written"], current["failed"]) == (2, 2, 0)
+    assert current["bytes_read"] == os.path.getsize(root / "A.gnc") + os.path.getsize(root / "Order_1" / "B.gnc")
+    assert current["progress"] == {"done": 2, "total": 2, "percent": 100.0}
+    assert current["stages"]["prepare"]["count"] == 2 and current["stages"]["write"]["count"] == 2
+    metrics.end_cycle()
+
+    version = metrics.version
+    metrics.begin_cycle(2)
+    scanner.scan(str(root), "sidra", cycle=2)
+    metrics.end_cycle()
+    snapshot = metrics.snapshot()
+    assert snapshot["version"] > version and snapshot["current"] is None
+    assert (snapshot["last_cycle"]["skipped"], snapshot["last_cycle"]["progress"]["percent"]) == (2, None)
+    assert snapshot["totals"]["written"] == 2 and snapshot["cycles"] == 2
+
+def test_walk_descends_to_configured_depth(tmp_path, monkeypatch):
+    root = tmp_path / "sidra"
+    (root / "Order_1" / "Rev_A" / "Cut").mkdir(parents=True)
+    _write(root / "A.gnc", "A")
+    _write(root / "Order_1" / "B.gnc", "B")
+    _write(root / "Order_1" / "Rev_A" / "C.gnc", "C")
+    _write(root / "Order_1" / "Rev_A" / "C_801.gnc", "C")  # variant of the C.gnc next to it
+    _write(root / "Order_1" / "Rev_A" / "Cut" / "D.gnc", "D")
+    _write(root / "Order_1" / "Rev_A" / "Cut" / "C_801.gnc", "C")  # no base file next to it
+
+    scanner, _ = _scanner(tmp_path)
+    listed = lambda: {(os.path.relpath(f.path, root), f.doc_name) for f in scanner.list_files(str(root))}
+
+    assert listed() == {("A.gnc", None), (os.path.join("Order_1", "B.gnc"), "Order_1")}
+
+    scanner.max_depth = None
+    assert listed() == {
+        ("A.gnc", None),
+        (os.path.join("Order_1", "B.gnc"), "Order_1"),
+        (os.path.join("Order_1", "Rev_A", "C.gnc"), "Order_1"),
+        (os.path.join("Order_1", "Rev_A", "C_801.gnc"), "Order_1"),
+        (os.path.join("Order_1", "Rev_A", "Cut", "D.gnc"), "Order_1"),
+        (os.path.join("Order_1", "Rev_A", "Cut", "C_801.gnc"), "Order_1"),
+    }
+    assert scanner.metrics.totals["dirs_listed"] == 2 + 4
+    assert scanner.list_files(str(tmp_path / "missing")) is None
+
+    # A sub-directory that fails to list is reported, not passed off as an empty one
+    from concurrent.futures import ThreadPoolExecutor
+    from src.application.services.sync.walker import ParallelWalker
+    scandir = os.scandir
+    def failing(path):
+        if os.path.basename(path) == "Rev_A":
+            raise PermissionError("denied")
+        return scandir(path)
+    monkeypatch.setattr(os, "scandir", failing)
+    with ThreadPoolExecutor(2) as pool:
+        walked = {os.path.relpath(d.path, root): d.error
+                  for d in ParallelWalker(pool, None).walk(str(root), lambda *args: None)}
+    assert walked == {".": None, "Order_1": None, os.path.join("Order_1", "Rev_A"): "denied"}
+
+def test_interrupted_scan_resumes_from_checkpoint(tmp_path, monkeypatch):
+    import threading
+    from src.application.services.sync.checkpoint import IngestProgress
+    from src.application.services.sync.pipeline import SyncPipeline
+    from src.infrastructure.database.manifest_repository import SQLSyncCheckpointRepository
+    root = tmp_path / "sidra"
+    root.mkdir()
+    for i in range(12):
+        _write(root / f"R{i}.gnc", f"R{i}", size=10 + i)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    processor = SyncProcessor(session_factory)
+    processor.thumbnails.directory = str(tmp_path / "thumbs")
+    os.makedirs(tmp_path / "thumbs")
+    scanner = DirectoryScanner(processor, SyncPipeline(processor, parse_workers=1, queue_size=1, batch_size=3))
+
+    # The server goes down right after the first batch is committed
+    stop = threading.Event()
+    committed = IngestProgress.committed
+    def committed_then_stop(self, records):
+        committed(self, records)
+        stop.set()
+    monkeypatch.setattr(IngestProgress, "committed", committed_then_stop)
+    first = scanner.scan(str(root), "sidra", cycle=1, stop_event=stop)
+    monkeypatch.setattr(IngestProgress, "committed", committed)
+
+    db = session_factory()
+    try:
+        [checkpoint] = SQLSyncCheckpointRepository(db).list()
+        stored = db.query(FileManifestDB).count()
+        # Files already in the pipeline were still stored, and recorded with their batches
+        assert stored == checkpoint["files_written"] == first["dispatched"] and 3 <= stored < 12
+        assert checkpoint["cycle"] == 1 and checkpoint["resumes"] == 0
+    finally:
+        db.close()
+
+    second = scanner.scan(str(root), "sidra", cycle=2)
+    assert second["resumed"] == stored
+    assert (second["unchanged"], second["dispatched"]) == (stored, 12 - stored)
+    db = session_factory()
+    try:
+        assert SQLSyncCheckpointRepository(db).list() == []
+        assert db.query(FileManifestDB).filter(FileManifestDB.last_seen_cycle == 2).count() == 12
+        assert db.query(PartDB).count() == 12
+    finally:
+        db.close()
+
+def test_adaptive_intervals_follow_directory_change_rate(tmp_path, monkeypatch):
+    from datetime import datetime
+    from src.infrastructure.database.models import DirectoryStatsDB
+    from src.application.services.sync.adaptive import AdaptiveSchedule
+    root = tmp_path / "sidra"
+    (root / "Active").mkdir(parents=True)
+    (root / "Archive").mkdir()
+    _write(root / "Active" / "A.gnc", "A")
+    _write(root / "Archive" / "B.gnc", "B")
+
+    scanner, session_factory = _scanner(tmp_path)
+    monkeypatch.setattr(scanner.processor.thumbnails, "directory", str(tmp_path / "thumbs"))
+    os.makedirs(tmp_path / "thumbs")
+    scanner.schedule = AdaptiveSchedule(60, 300)
+    scanner.scan(str(root), "sidra", cycle=1)
+
+    def intervals():
+        db = session_factory()
+        try:
+            return {os.path.basename(r.path): r.interval_sec for r in db.query(DirectoryStatsDB).all()}
+        finally:
+            db.close()
+
+    def adaptive_pass():
+        # Pretend every interval has elapsed
+        db = session_factory()
+        try:
+            db.query(DirectoryStatsDB).update({"next_due_at": datetime(2000, 1, 1)})
+            db.commit()
+        finally:
+            db.close()
+        directories = scanner.due_directories(str(root))
+        return directories, scanner.scan_directories(str(root), "sidra", directories, cycle=1)
+
+    assert intervals() == {"sidra": 60, "Active": 60, "Archive": 60}
+    assert scanner.due_directories(str(root)) == {str(root)}
+
+    _write(root / "Active" / "A.gnc", "A", size=20)
+    directories, stats = adaptive_pass()
+    assert len(directories) == 3 and stats["dispatched"] == 1
+    assert intervals() == {"sidra": 120, "Active": 60, "Archive": 120}
+
+    adaptive_pass()
+    adaptive_pass()
+    # Cold directories back off exponentially up to the longest interval
+    assert intervals() == {"sidra": 300, "Active": 240, "Archive": 300}
+
+    (root / "New").mkdir()
+    assert scanner.due_directories(str(root)) == {str(root), str(root / "New")}
+
+def test_identical_copies_and_801_variants_are_linked(tmp_path, monkeypatch):
+    from src.infrastructure.database.models import TaskDB
+    sidra = tmp_path / "sidra"
+    mihtav = tmp_path / "mihtav"
+    sidra.mkdir()
+    (mihtav / "Order_9").mkdir(parents=True)
+    _write(sidra / "P1.gnc", "P1", size=10)
+    _write(sidra / "P1_801.gnc", "P1", size=12)  # machine-edited variant
+    _write(sidra / "Spare.gnc", "P1", size=10)  # same bytes as P1.gnc
+    _write(mihtav / "Order_9" / "X.gnc", "P1", size=10)  # and again in another root
+
+    scanner, session_factory = _scanner(tmp_path)
+    monkeypatch.setattr(scanner.processor.thumbnails, "directory", str(tmp_path / "thumbs"))
+    os.makedirs(tmp_path / "thumbs")
+    first = scanner.scan(str(sidra), "sidra", cycle=1)
+    assert (first["dispatched"], first["linked"]) == (3, 1)
+    assert scanner.scan(str(mihtav), "mihtav", cycle=1)["linked"] == 1
+    assert (scanner.metrics.totals["parsed"], scanner.metrics.totals["linked"]) == (2, 2)
+
+    base = str(sidra / "P1.gnc")
+    db = session_factory()
+    try:
+        variants = dict(db.query(FileManifestDB.path, FileManifestDB.variant_of).all())
+        assert variants == {
+            base: None,
+            str(sidra / "P1_801.gnc"): base,
+            str(sidra / "Spare.gnc"): base,
+            str(mihtav / "Order_9" / "X.gnc"): base,
+        }
+        # The variant and the copies are attached, but the library keeps one part
+        assert db.query(AttachmentDB).count() == 4
+        assert [p.gnc_file_path for p in db.query(PartDB).all()] == [base]
+        assert db.query(TaskDB).count() == 4
+    finally:
+        db.close()
+
+def test_dry_run_parses_everything_and_stores_nothing(tmp_path, monkeypatch):
+    from src.infrastructure.database.models import DocumentDB, SettingDB, SyncCheckpointDB
+    from src.application.services.settings_service import SettingsService
+    from src.application.services.sync.manager import SyncManager
+    root = tmp_path / "mihtav"
+    (root / "Order_1").mkdir(parents=True)
+    _write(root / "Order_1" / "S1.gnc", "S1")
+    _write(root / "Order_1" / "S2.gnc", "S2")
+
+    scanner, session_factory = _scanner(tmp_path)
+    monkeypatch.setattr(scanner.processor.thumbnails, "directory", str(tmp_path / "thumbs"))
+    os.makedirs(tmp_path / "thumbs")
+    settings = SettingsService(session_factory)
+    settings.set_setting("sync_mihtav_path", str(root))
+    settings.set_setting("sync_watch_enabled", "false")
+    manager = SyncManager(scanner, settings)
+
+    results = manager.run_once(dry_run=True)
+    assert results[str(root)]["dispatched"] == 2
+    assert manager.metrics.snapshot()["last_cycle"]["written"] == 2
+    assert not scanner.dry_run and manager._last_scanned == {}
+    db = session_factory()
+    try:
+        for model in (FileManifestDB, SyncCheckpointDB, DocumentDB, AttachmentDB, PartDB):
+            assert db.query(model).count() == 0
+        assert db.query(SettingDB).filter(SettingDB.key == "sync_cycle").count() == 0
+    finally:
+        db.close()
+
+    assert manager.run_once()[str(root)]["dispatched"] == 2
+    assert manager.run_once()[str(root)]["dispatched"] == 0
+
+    # An edited file is re-ingested and rolled back without touching the cached renditions
+    thumbnails = sorted(os.listdir(tmp_path / "thumbs"))
+    _write(root / "Order_1" / "S1.gnc", "S1", size=40)
+    assert manager.run_once(dry_run=True)[str(root)]["dispatched"] == 1
+    assert sorted(os.listdir(tmp_path / "thumbs")) == thumbnails
+    assert manager.run_once()[str(root)]["dispatched"] == 1
+    assert sorted(os.listdir(tmp_path / "thumbs")) != thumbnails
@@ -0,0 +1,119 @@
+import os
+import sys
+import json
+import threading
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.application.services.sync.scheduler import SyncScheduler
+
+def test_single_flight_coalescing_and_cancellation():
+    started = threading.Event()
+    runs = []
+
+    def runner(job):
+        runs.append((job.kind, job.reason, sorted(job.directories)))
+        if len(runs) == 1:
+            started.set()
+            # A long scan: only returns once cancelled
+            assert job.cancel_event.wait(timeout=5)
+        return {"run": len(runs)}
+
+    scheduler = SyncScheduler(runner)
+    scheduler.start()
+    try:
+        first = scheduler.submit("full", "periodic")
+        assert started.wait(timeout=5)
+
+        # Triggers arriving mid-run fold into one follow-up job
+        watch = scheduler.submit("directories", "watch", "/share", {"/share/A"})
+        assert scheduler.submit("directories", "watch", "/share", {"/share/B"}) is watch
+        follow_up = scheduler.submit("full", "periodic")
+        assert scheduler.submit("full", "manual") is follow_up
+        assert scheduler.submit("full", "manual") is follow_up
+
+        status = scheduler.status()
+        assert status["running"]["id"] == first.id
+        assert [job["id"] for job in status["queued"]] == [follow_up.id]
+        assert watch.state == "cancelled" and watch.error == f"Superseded by job {follow_up.id}"
+        # Two watch and two manual triggers; the manual ones raised its priority
+        assert (follow_up.reason, follow_up.coalesced) == ("manual", 4)
+
+        assert scheduler.cancel(first.id) is first
+        assert follow_up.finished.wait(timeout=5)
+    finally:
+        scheduler.stop()
+
+    assert first.state == "cancelled"
+    assert (follow_up.state, follow_up.result) == ("done", {"run": 2})
+    assert runs == [("full", "periodic", []), ("full", "manual", [])]
+
+def test_superseding_full_job_keeps_most_urgent_reason():
+    runs = []
+    scheduler = SyncScheduler(lambda job: runs.append((job.kind, job.reason, job.priority)))
+
+    adaptive = scheduler.submit("adaptive", "periodic")
+    watch = scheduler.submit("directories", "watch", "/share", {"/share/A"})
+    full = scheduler.submit("full", "periodic")
+    assert adaptive.state == watch.state == "cancelled"
+    assert [job["id"] for job in scheduler.status()["queued"]] == [full.id]
+
+    scheduler.start()
+    try:
+        assert full.finished.wait(timeout=5)
+    finally:
+        scheduler.stop()
+    # Not "periodic", which would only scan roots that are due and skip the watched one
+    assert runs == [("full", "watch", 1)]
+
+def test_roots_scan_concurrently_with_isolated_failures(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.infrastructure.database.models import Base
+    from src.application.services.settings_service import SettingsService
+    from src.application.services.sync.processor import SyncProcessor
+    from src.application.services.sync.scanner import DirectoryScanner
+    from src.application.services.sync.manager import SyncManager
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    settings = SettingsService(session_factory)
+    settings.set_setting("sync_mihtav_path", "/share/mihtav")
+    settings.set_setting("sync_sidra_path", "/share/sidra")
+    settings.set_setting("sync_watch_enabled", "false")
+    settings.set_setting("sync_roots", json.dumps([
+        {"path": "/share/sidra", "interval": 5},
+        {"path": "/share/welding", "source_type": "welding", "interval": 30},
+        {"path": "/share/bad"},  # no source type
+    ]))
+    assert [(r["path"], r["source_type"], r["interval"]) for r in settings.get_sync_roots()] == [
+        ("/share/mihtav", "mihtav", None), ("/share/sidra", "sidra", 5), ("/share/welding", "welding", 30)
+    ]
+
+    scanner = DirectoryScanner(SyncProcessor(session_factory))
+    barrier = threading.Barrier(3, timeout=5)
+
+    def scan(path, source_type, cycle, stop_event):
+        # Every root must be in flight at once to get past the barrier
+        barrier.wait()
+        if source_type == "sidra":
+            raise OSError("share unreachable")
+        return {"listed": 1}
+
+    scanner.scan = scan
+    manager = SyncManager(scanner, settings)
+    results = manager._sync_cycle(threading.Event())
+    assert results == {
+        "/share/mihtav": {"listed": 1}, "/share/sidra": {"error": "share unreachable"}, "/share/welding": {"listed": 1}
+    }
+    roots = manager.metrics.snapshot()["last_cycle"]["roots"]
+    assert roots["/share/sidra"]["state"] == "failed" and roots["/share/welding"]["state"] == "done"
+
+    # Right after a cycle nothing is due; the sidra root comes due first
+    assert manager._sync_cycle(threading.Event(), only_due=True) == {}
+    assert 4 * 60 < manager._seconds_until_due(manager._roots()) <= 5 * 60
+    manager._last_scanned["/share/sidra"] -= 5 * 60
+    barrier = threading.Barrier(1)
+    assert list(manager._sync_cycle(threading.Event(), only_due=True)) == ["/share/sidra"]
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import pytest
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.infrastructure.database.models import Base, AttachmentDB, FileManifestDB
+from src.application.services.sync.processor import SyncProcessor
+from src.application.services.sync.scanner import DirectoryScanner
+from src.application.services.sync.watcher import InotifyWatcher, watch_supported
+
+PROGRAM = "(PART NAME:{name})\nN1005 G00 X0 Y0\nN1010 G01 X10 Y0\nN1015 G01 X10 Y10\nN1020 G01 X0 Y0\n"
+
+def _wait_for(changes, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not changes and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return changes.pop(0) if changes else None
+
+def test_watcher_events_drive_directory_sync(tmp_path):
+    root = tmp_path / "mihtav"
+    (root / "Order_1").mkdir(parents=True)
+    if not watch_supported(str(root)):
+        pytest.skip("inotify is not available here")
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'sync.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    processor = SyncProcessor(session_factory)
+    processor.thumbnails.directory = str(tmp_path / "thumbs")
+    os.makedirs(tmp_path / "thumbs")
+    scanner = DirectoryScanner(processor)
+
+    changes = []
+    watcher = InotifyWatcher(lambda r, dirs: changes.append((r, dirs)), debounce=0.2)
+    watcher.start()
+    try:
+        assert watcher.watch(str(root))
+        # A burst over two directories, including one created after the watch started
+        (root / "Order_1" / "A.gnc").write_text(PROGRAM.format(name="A"))
+        (root / "Order_2").mkdir()
+        (root / "Order_2" / "B.gnc").write_text(PROGRAM.format(name="B"))
+        (root / "notes.txt").write_text("ignored")
+
+        changed_root, directories = _wait_for(changes)
+        assert changed_root == str(root)
+        assert directories == {str(root / "Order_1"), str(root / "Order_2")}
+        stats = scanner.scan_directories(str(root), "mihtav", directories, cycle=1)
+        assert (stats["listed"], stats["dispatched"]) == (2, 2)
+
+        os.remove(root / "Order_2" / "B.gnc")
+        _, directories = _wait_for(changes)
+        assert directories == {str(root / "Order_2")}
+        assert scanner.scan_directories(str(root), "mihtav", directories, cycle=1)["tombstoned"] == 1
+    finally:
+        watcher.stop()
+
+    db = session_factory()
+    try:
+        assert [a.filename for a in db.query(AttachmentDB)] == ["A.gnc"]
+        assert db.query(FileManifestDB).filter(FileManifestDB.missing_since.isnot(None)).count() == 1
+    finally:
+        db.close()
@@ -0,0 +1,267 @@
+import os
+import sys
+
+# Add backend directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.parsers.gnc_parser import GNCParser
+from src.infrastructure.graphics.geometry import compile_sheet, geometry_hash
+from src.infrastructure.graphics.thumbnail_cache import ThumbnailCache
+
+SQUARE = """(PART NAME:SQUARE)
+N1005 G00 X{x0} Y{y0}
+N1010 G01 X{x1} Y{y0}
+N1015 G01 X{x1} Y{y1}
+N1020 G02 X{x0} Y{y1} I-{r} J0
+N1025 G01 X{x0} Y{y0}
+"""
+
+def _square(x0, y0, size=50.0):
+    content = SQUARE.format(x0=x0, y0=y0, x1=x0 + size, y1=y0 + size, r=size / 2)
+    return compile_sheet(GNCParser().parse(content, "square.gnc"))
+
+def test_geometry_hash_ignores_sheet_position():
+    assert geometry_hash(_square(0, 0)) == geometry_hash(_square(1200.5, 300.25))
+    assert geometry_hash(_square(0, 0)) != geometry_hash(_square(0, 0, size=60.0))
+
+def test_evict_removes_orphans_and_enforces_size(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=150)
+    live = ["a" * 40, "b" * 40]
+    for h in live + ["c" * 40]:
+        cache.store(h, "x" * 100)
+    for h in live:
+        cache.store(h, b"x" * 100, "png")
+    # Legacy name-based thumbnails are not managed by the cache
+    (tmp_path / "3476-00-042-A.svg").write_text("<svg/>")
+
+    result = cache.evict(live)
+    assert result["orphans"] == 1
+    # Part.thumbnail_url links live SVGs directly, so only the PNGs rendered on request are trimmed
+    assert result["trimmed"] == 1
+    assert all(cache.exists(h) for h in live)
+    assert sum(cache.exists(h, "png") for h in live) == 1
+    assert not cache.exists("c" * 40)
+    assert (tmp_path / "3476-00-042-A.svg").exists()
+
+def test_simplify_drops_collinear_vertices_and_keeps_arcs():
+    from src.infrastructure.graphics.geometry import simplify
+    line = [("M", 0.0, 0.0)] + [("L", float(x), 0.001 * (x % 2)) for x in range(1, 101)]
+    arc = ("A", 100.0, 100.0, 100.0, 50.0, False)
+    result = simplify([line + [arc]], tolerance=0.01)[0]
+
+    assert result == [("M", 0.0, 0.0), ("L", 100.0, 0.0), arc]
+
+def test_raster_png_covers_the_outline():
+    import zlib
+    import struct
+    from src.infrastructure.graphics.raster import RasterRenderer
+
+    renderer = RasterRenderer()
+    alpha = renderer.render_alpha(_square(0, 0), 100, 100)
+    # The bottom edge is opaque along its middle, the area between it and the arc stays empty
+    assert alpha[88, 50] > 200
+    assert alpha[60, 27] == 0
+
+    data = renderer.render_png(_square(0, 0), 100, 100)
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", data[16:26])
+    assert (width, height, bit_depth, color_type) == (100, 100, 4, 3)
+    idat = data.index(b"IDAT")
+    length = struct.unpack(">I", data[idat - 4:idat])[0]
+    assert len(zlib.decompress(data[idat + 4:idat + 4 + length])) == 100 * (50 + 1)
+
+def test_svg_atlas_shares_symbols_and_fingerprint_tracks_geometry():
+    from src.infrastructure.graphics.sprite_atlas import atlas_fingerprint, svg_atlas
+    from src.infrastructure.graphics.svg_generator import SVGGenerator
+
+    markup = SVGGenerator().render_svg(_square(0, 0))
+    atlas = svg_atlas([("g-a", markup), ("g-a", markup), None], cell=64, columns=2)
+    assert atlas.count("<symbol") == 1
+    assert atlas.count("<use") == 2
+    assert 'viewBox="0 0 128 128"' in atlas
+
+    page = [(1, "a" * 40), (2, "b" * 40)]
+    assert atlas_fingerprint(page, "svg", 64) == atlas_fingerprint(list(page), "svg", 64)
+    assert atlas_fingerprint(page, "svg", 64) != atlas_fingerprint([(1, "a" * 40), (2, "c" * 40)], "svg", 64)
+
+def _two_squares():
+    # Opposite corners of a 3 m sheet, so most tiles at deeper levels are empty
+    return _square(0, 0) + _square(2950, 2950)
+
+def test_sheet_tiles_are_bounded_culled_and_cached(tmp_path):
+    import pytest
+    from src.infrastructure.graphics.sheet_renderer import SheetTileRenderer, MAX_ZOOM_LIMIT
+    renderer = SheetTileRenderer(str(tmp_path))
+    geometry = _two_squares()
+
+    info = renderer.describe("sheet", geometry)
+    assert info["origin"][0] < 0 and info["size"] > 3000
+    # About 4 px/mm: 3060 mm * 4 / 256 px needs 2^6 tiles per side
+    assert info["max_zoom"] == 6 and info["tiles_per_side"] == [1, 2, 4, 8, 16, 32, 64]
+    assert renderer.max_zoom(10.0) == 0 and renderer.max_zoom(1e7) == MAX_ZOOM_LIMIT
+
+    loads = []
+    def load():
+        loads.append(1)
+        return geometry
+
+    for z, x, y in [(7, 0, 0), (-1, 0, 0), (6, 64, 0), (1, 0, -1)]:
+        with pytest.raises(ValueError):
+            renderer.get_tile("sheet", load, z, x, y)
+    with pytest.raises(ValueError):
+        renderer.get_tile("sheet", load, 0, 0, 0, "png")
+
+    # Rows count from the top: the square at the origin is bottom left
+    assert b"<path" in renderer.get_tile("sheet", load, 1, 0, 1)
+    assert b"<path" in renderer.get_tile("sheet", load, 1, 1, 0)
+    assert b"<path" not in renderer.get_tile("sheet", load, 1, 0, 0)
+    assert b'"paths":[]' in renderer.get_tile("sheet", load, 1, 1, 1, "json")
+
+    # Later requests are served from disk without the geometry
+    tile = renderer.get_tile("sheet", load, 1, 0, 1)
+    assert os.path.exists(renderer.tile_path("sheet", 1, 0, 1, "svg"))
+    assert renderer.get_tile("sheet", lambda: pytest.fail("geometry loaded"), 1, 0, 1) == tile
+
+    renderer.invalidate("sheet")
+    assert not os.path.exists(tmp_path / "sheet")
+    calls = len(loads)
+    assert renderer.get_tile("sheet", load, 1, 0, 1) == tile
+    assert len(loads) == calls + 1
+
+def test_sheet_tile_endpoint_serves_etags(tmp_path, monkeypatch):
+    from types import SimpleNamespace
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from src.api.routers import gnc
+    from src.api.dependencies import get_production_service
+    from src.application.services import gnc_service
+    from src.infrastructure.graphics.sheet_renderer import SheetTileRenderer
+
+    path = tmp_path / "S1.gnc"
+    path.write_text(SQUARE.format(x0=0, y0=0, x1=2000, y1=2000, r=1000))
+    monkeypatch.setattr(gnc_service, "tile_renderer", SheetTileRenderer(str(tmp_path / "tiles")))
+    jobs = {1: SimpleNamespace(gnc_file_path=str(path))}
+    app = FastAPI()
+    app.include_router(gnc.router, prefix="/api/gnc")
+    app.dependency_overrides[get_production_service] = lambda: SimpleNamespace(get_job=jobs.get)
+    client = TestClient(app)
+
+    info = client.get("/api/gnc/tasks/1/sheet").json()
+    assert info["max_zoom"] > 0 and info["tile_url"] == "/api/gnc/tasks/1/tiles/{z}/{x}/{y}.{fmt}"
+
+    response = client.get("/api/gnc/tasks/1/tiles/0/0/0.svg")
+    assert response.status_code == 200 and response.headers["content-type"] == "image/svg+xml"
+    etag = response.headers["etag"]
+    cached = client.get("/api/gnc/tasks/1/tiles/0/0/0.svg", headers={"If-None-Match": etag})
+    assert cached.status_code == 304 and not cached.content
+    assert client.get("/api/gnc/tasks/1/tiles/1/0/0.svg", headers={"If-None-Match": etag}).status_code == 200
+
+    assert client.get("/api/gnc/tasks/1/tiles/0/1/0.svg").status_code == 404
+    assert client.get(f"/api/gnc/tasks/1/tiles/{info['max_zoom'] + 1}/0/0.svg").status_code == 404
+    assert client.get("/api/gnc/tasks/1/tiles/0/0/0.png").status_code == 400
+    assert client.get("/api/gnc/tasks/2/tiles/0/0/0.svg").status_code == 404
+
+    # An edit changes the content hash, and with it every tag
+    path.write_text(SQUARE.format(x0=0, y0=0, x1=2500.5, y1=2500.5, r=1250.25))
+    assert client.get("/api/gnc/tasks/1/tiles/0/0/0.svg", headers={"If-None-Match": etag}).status_code == 200
+
+def test_batch_renderer_skips_cached_and_collects_failures(tmp_path):
+    from src.infrastructure.graphics.thumbnail_batch import ThumbnailBatchRenderer
+    cache = ThumbnailCache(str(tmp_path))
+    square = _square(0, 0)
+    jobs = [(geometry_hash(square), square), (geometry_hash(square), square), ("b" * 40, None)]
+
+    report = ThumbnailBatchRenderer(cache, workers=1).render(jobs)
+    # The duplicate hash is rendered once; the broken geometry is reported, not raised
+    assert (report.rendered, report.skipped) == (1, 0)
+    assert [key for key, _ in report.failed] == ["b" * 40]
+    assert cache.exists(geometry_hash(square)) and report.bytes_written > 0
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    again = ThumbnailBatchRenderer(cache, workers=1).render(jobs[:1])
+    assert (again.rendered, again.skipped) == (0, 1)
+
+def test_backfill_stores_hashes_and_thumbnails(tmp_path):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.infrastructure.database.models import Base, PartDB
+    from src.application.services.thumbnail_service import ThumbnailBackfillService
+
+    def program(name, size):
+        path = tmp_path / f"{name}.gnc"
+        path.write_text(SQUARE.format(x0=0, y0=0, x1=size, y1=size, r=size / 2))
+        return str(path)
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'parts.db'}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    db.add_all([
+        PartDB(name="P1", registration_number="P1", gnc_file_path=program("P1", 50)),
+        PartDB(name="P2", registration_number="P2", gnc_file_path=program("P2", 80)),
+        PartDB(name="P3", registration_number="P3", gnc_file_path=str(tmp_path / "gone.gnc")),
+    ])
+    db.commit()
+    db.close()
+
+    cache = ThumbnailCache(str(tmp_path / "thumbs"))
+    service = ThumbnailBackfillService(session_factory, cache, workers=1)
+    report = service.run()
+    assert (report.rendered, report.skipped) == (2, 0)
+    assert report.failed == [(str(tmp_path / "gone.gnc"), "File not found")]
+
+    db = session_factory()
+    try:
+        hashes = dict(db.query(PartDB.name, PartDB.geometry_hash).all())
+        assert hashes["P1"] == geometry_hash(_square(0, 0))
+        assert hashes["P2"] == geometry_hash(_square(0, 0, size=80.0))
+        assert hashes["P3"] is None
+        assert all(cache.exists(hashes[name]) for name in ("P1", "P2"))
+
+        # A new part with the geometry of P1 only needs its hash
+        db.add(PartDB(name="P4", registration_number="P4", gnc_file_path=program("P4", 50)))
+        db.commit()
+    finally:
+        db.close()
+
+    report = service.run()
+    assert (report.rendered, report.skipped, len(report.failed)) == (0, 1, 1)
+    db = session_factory()
+    try:
+        assert db.query(PartDB.geometry_hash).filter(PartDB.name == "P4").scalar() == hashes["P1"]
+    finally:
+        db.close()
+
+def test_parts_atlas_follows_cursor_pages(tmp_path):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from src.infrastructure.database.models import Base, PartDB
+    from src.api.routers import inventory
+    from src.api.dependencies import get_db, get_atlas_service
+    from src.application.services.thumbnail_service import ThumbnailService, ThumbnailAtlasService
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'parts.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = session_factory()
+    db.add_all([PartDB(name=f"P{i}", registration_number=f"P{i}") for i in range(5)])
+    db.commit()
+    db.close()
+
+    app = FastAPI()
+    app.include_router(inventory.router)
+    app.dependency_overrides[get_db] = lambda: session_factory()
+    app.dependency_overrides[get_atlas_service] = lambda: ThumbnailAtlasService(
+        ThumbnailService(ThumbnailCache(str(tmp_path / "thumbs"))), ThumbnailCache(str(tmp_path / "atlases"))
+    )
+    client = TestClient(app)
+
+    first = client.get("/parts/atlas?limit=2")
+    cursor = first.headers["x-next-cursor"]
+    assert [s["id"] for s in first.json()["sprites"]] == [1, 2]
+    second = client.get(f"/parts/atlas?limit=2&cursor={cursor}")
+    assert [s["id"] for s in second.json()["sprites"]] == [3, 4]
+    assert [p["id"] for p in client.get(f"/parts/?limit=2&cursor={cursor}").json()] == [3, 4]
+    assert client.get("/parts/atlas?cursor=not-a-cursor").status_code == 400
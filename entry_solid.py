@@ -1,6 +1,7 @@
 import os
 import sys
 import uvicorn
+import multiprocessing
 import webbrowser
 from threading import Timer
 
@@ -18,6 +19,9 @@ def open_browser():
     webbrowser.open("http://localhost:8000")
 
 if __name__ == "__main__":
+    # Sync parses files in worker processes; frozen builds must not re-run main in them
+    multiprocessing.freeze_support()
+
     # If running from source (dev mode), add backend to path
     if not getattr(sys, 'frozen', False):
         sys.path.insert(0, os.path.join(os.getcwd(), "backend"))
@@ -23,6 +23,33 @@ export class DocumentService {
         return await response.json();
     }
 
+    // List columns and counts only: no content, tasks or journal entries
+    async fetchDocumentSummaries(params = {}) {
+        const queryParams = new URLSearchParams(params);
+        const response = await fetch(`${this.baseUrl}/summary?${queryParams.toString()}`, {
+            headers: getHeaders()
+        });
+        if (!response.ok) throw new Error('Failed to fetch documents');
+        return await response.json();
+    }
+
+    // Every summary, one keyset page at a time until X-Next-Cursor is absent
+    async fetchAllDocumentSummaries(pageSize = 500) {
+        const summaries = [];
+        let cursor = null;
+        do {
+            const queryParams = new URLSearchParams({ limit: pageSize });
+            if (cursor) queryParams.set('cursor', cursor);
+            const response = await fetch(`${this.baseUrl}/summary?${queryParams.toString()}`, {
+                headers: getHeaders()
+            });
+            if (!response.ok) throw new Error('Failed to fetch documents');
+            summaries.push(...await response.json());
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
+        return summaries;
+    }
+
     async updateStatus(id, status) {
         const res = await fetch(`${this.baseUrl}/${id}/status`, {
             method: 'PUT',
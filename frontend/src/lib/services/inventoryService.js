@@ -51,7 +51,7 @@ export class InventoryService {
     }
 
     // Parts
-    async fetchParts(skip = 0, limit = 100, filters = {}) {
+    _partParams(skip, limit, filters) {
         const params = new URLSearchParams({
             skip: String(skip),
             limit: String(limit)
@@ -63,7 +63,11 @@ export class InventoryService {
         if (filters.max_width) params.append('max_width', filters.max_width);
         if (filters.min_height) params.append('min_height', filters.min_height);
         if (filters.max_height) params.append('max_height', filters.max_height);
+        return params;
+    }
 
+    async fetchParts(skip = 0, limit = 100, filters = {}) {
+        const params = this._partParams(skip, limit, filters);
         const response = await fetch(`${this.baseUrl}/parts/?${params.toString()}`, {
             headers: getHeaders(),
         });
@@ -71,6 +75,17 @@ export class InventoryService {
         return await response.json();
     }
 
+    // One sprite atlas for a page of parts, with an offset/symbol map per part
+    async fetchPartsAtlas(skip = 0, limit = 100, filters = {}, format = 'svg') {
+        const params = this._partParams(skip, limit, filters);
+        params.append('format', format);
+        const response = await fetch(`${this.baseUrl}/parts/atlas?${params.toString()}`, {
+            headers: getHeaders(),
+        });
+        if (!response.ok) throw new Error('Failed to fetch parts atlas');
+        return await response.json();
+    }
+
     async createPart(part) {
         const response = await fetch(`${this.baseUrl}/parts/`, {
             method: 'POST',
@@ -152,4 +167,14 @@ export class InventoryService {
         if (!response.ok) throw new Error("Failed to trigger rescan");
         return await response.json();
     }
+
+    /**
+     * Subscribes to live sync status (jobs and scan counters) over server-sent events.
+     * Returns the EventSource; the caller closes it.
+     */
+    watchSync(onStatus) {
+        const source = new EventSource(`${this.baseUrl}/sync/events`);
+        source.onmessage = (event) => onStatus(JSON.parse(event.data));
+        return source;
+    }
 }